@@ -4,10 +4,12 @@ from .embed import router as embed_router
 from .crawl import router as crawl_router
 from .sites import router as sites_router
 from .sources import router as sources_router
+from .ingest import router as ingest_router
 
 def register_routes(app: FastAPI):
     app.include_router(search_router, prefix="/v1")
     app.include_router(embed_router, prefix="/v1")
     app.include_router(crawl_router, prefix="/v1")
     app.include_router(sites_router, prefix="/v1")
-    app.include_router(sources_router, prefix="/v1")
\ No newline at end of file
+    app.include_router(sources_router, prefix="/v1")
+    app.include_router(ingest_router, prefix="/v1")
\ No newline at end of file
@@ -3,16 +3,95 @@
 # This is part of the crawler.
 # -------------------------------
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, status
 from app.core.container import get_container
+from app.core.settings import settings
+from app.api.schemas.crawl_jobs import CrawlJob as CrawlJobSchema
 
 router = APIRouter(
     prefix="/crawl",
     tags=["Crawl"],
 )
 
-@router.post("/{site_id}")
-async def crawl_site(site_id: str, container = Depends(get_container)):
-    orchestrator = container.crawl_orchestrator
-    await orchestrator.crawl_site(site_id)
-    return {"status": "completed", "site_id": site_id}
\ No newline at end of file
+@router.post("/{site_id}", status_code=status.HTTP_202_ACCEPTED)
+async def crawl_site(
+        site_id: int,
+        incremental: bool = False,
+        container = Depends(get_container),
+):
+    """
+    Start crawling a site. Returns immediately; progress is available
+    under `/crawl/jobs/{job_id}`. In workers mode, the crawl is only
+    queued for the crawl workers and has no job.
+    """
+    if settings.crawl_mode == "workers":
+        # Crawl workers seed the frontier, then pick the site up from it.
+        if not await container.site_repository.start_crawl(site_id):
+            raise HTTPException(status_code=404, detail="Site not found")
+        await container.crawl_orchestrator.request_seed(site_id, recrawl=incremental)
+        return {"status": "queued", "site_id": site_id}
+
+    job = await container.crawl_job_runner.start(site_id, incremental=incremental)
+    if not job:
+        raise HTTPException(status_code=404, detail="Site not found")
+    return {"status": job.status, "site_id": site_id, "job_id": job.id}
+
+
+@router.get("/jobs/{job_id}", response_model=CrawlJobSchema)
+async def get_crawl_job(
+        job_id: int,
+        container = Depends(get_container),
+) -> CrawlJobSchema:
+    """
+    Fetch a crawl job with its progress.
+    """
+    job = await container.crawl_job_runner.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Crawl job not found")
+    return job
+
+
+@router.post("/jobs/{job_id}/pause", response_model=CrawlJobSchema)
+async def pause_crawl_job(
+        job_id: int,
+        container = Depends(get_container),
+) -> CrawlJobSchema:
+    """
+    Pause a running crawl job. URLs being fetched are finished first.
+    """
+    return await _transition(container.crawl_job_runner.pause, job_id, container)
+
+
+@router.post("/jobs/{job_id}/resume", response_model=CrawlJobSchema)
+async def resume_crawl_job(
+        job_id: int,
+        container = Depends(get_container),
+) -> CrawlJobSchema:
+    """
+    Resume a paused crawl job.
+    """
+    return await _transition(container.crawl_job_runner.resume, job_id, container)
+
+
+@router.post("/jobs/{job_id}/cancel", response_model=CrawlJobSchema)
+async def cancel_crawl_job(
+        job_id: int,
+        container = Depends(get_container),
+) -> CrawlJobSchema:
+    """
+    Cancel a crawl job. Its remaining URLs stay in the frontier.
+    """
+    return await _transition(container.crawl_job_runner.cancel, job_id, container)
+
+
+async def _transition(action, job_id: int, container) -> CrawlJobSchema:
+    job = await action(job_id)
+    if job:
+        return job
+
+    if not await container.crawl_job_runner.get(job_id):
+        raise HTTPException(status_code=404, detail="Crawl job not found")
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Crawl job cannot be changed in its current status",
+    )
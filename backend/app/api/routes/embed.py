@@ -7,4 +7,14 @@ router = APIRouter(tags=["Embed"])
 async def embed(q: str, container = Depends(get_container)):
     embedding_provider = container.embedding_provider
     embeds = await embedding_provider.embed(q)
-    return {"query": q, "results": embeds}
\ No newline at end of file
+    return {"query": q, "results": embeds}
+
+@router.get("/embed/cache")
+async def embed_cache(container = Depends(get_container)):
+    """
+    Hit, miss and eviction counters of the embedding cache.
+    """
+    cache = container.embedding_cache
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, "model": cache.model, **cache.stats()}
@@ -0,0 +1,12 @@
+from fastapi import APIRouter, Depends
+from app.core.container import get_container
+
+router = APIRouter(tags=["Ingest"])
+
+@router.get("/ingest/extraction")
+async def extraction_stats(container = Depends(get_container)):
+    """
+    Calls, bytes and throughput (bytes/sec) of each extractor, for the
+    extraction done by this process.
+    """
+    return {"extractors": container.extraction_service.stats()}
@@ -2,14 +2,26 @@
 # Routes to manage sources.
 # This is part of the ingestion pipeline.
 # -------------------------------
+import asyncio
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, UploadFile, status
 
 from app.core.container import get_container
+from app.core.settings import settings
 from app.api.schemas.sources import (
     SourceSchema,
     SourceCreateSchema,
     SourceUpdateSchema,
+    UploadSessionCreateSchema,
+    UploadSessionSchema,
+)
+from app.infrastructure.uploads.archive_expander import ArchiveError
+from app.infrastructure.uploads.upload_session_store import (
+    UploadOffsetMismatch,
+    UploadSessionBusy,
+    UploadSessionCompleting,
+    UploadSessionNotFound,
+    UploadTooLarge,
 )
 
 
@@ -171,17 +183,262 @@ async def upload_artifact(
         if not source:
             raise HTTPException(status_code=404, detail="Source not found")
 
-        artifact = await artifact_service.store_upload(
-            source_id=source.id,
-            file=file,
-            conn=conn,
+        fmt = await _archive_format(artifact_service, file.file, file.filename, file.content_type)
+        if fmt:
+            artifacts, duplicates = await _store_archive(
+                artifact_service, source.id, file.file, fmt, file.filename, conn
+            )
+        else:
+            artifact, created = await artifact_service.store_upload(
+                source_id=source.id,
+                file=file,
+                conn=conn,
+            )
+
+    if fmt:
+        await coordinator.on_artifacts_created(artifacts)
+        return _expanded(artifacts, duplicates)
+
+    if not created:
+        # Same content as an existing artifact: nothing to store or ingest.
+        return {
+            "artifact_id": artifact.id,
+            "status": "duplicate",
+        }
+
+    # Schedule ingestion once the artifact is committed
+    await coordinator.on_artifact_created(artifact)
+
+    return {
+        "artifact_id": artifact.id,
+        "status": "uploaded",
+    }
+
+
+# -------------------------------
+# Resumable uploads (tus-style):
+# create a session, PATCH byte ranges at the current offset, ask for
+# the offset after an interruption, then complete into an artifact.
+# -------------------------------
+
+@router.post(
+    "/{source_id}/uploads",
+    response_model=UploadSessionSchema,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_upload_session(
+    source_id: int,
+    payload: UploadSessionCreateSchema,
+    request: Request,
+    response: Response,
+    container=Depends(get_container),
+) -> UploadSessionSchema:
+    """
+    Open a resumable upload of `size` bytes.
+    """
+    if payload.size > settings.upload_max_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Uploads are limited to {settings.upload_max_bytes} bytes",
+        )
+
+    async with container.db.transaction() as conn:
+        source = await container.source_repository.get(source_id, conn=conn)
+    if not source:
+        raise HTTPException(status_code=404, detail="Source not found")
+
+    session = await container.upload_sessions.create(
+        source_id=source_id,
+        filename=payload.filename,
+        content_type=payload.content_type,
+        size=payload.size,
+    )
+    response.headers["Location"] = f"{request.url.path.rstrip('/')}/{session.id}"
+    response.headers["Upload-Offset"] = "0"
+    return session
+
+
+@router.head("/{source_id}/uploads/{upload_id}")
+async def get_upload_offset(
+    source_id: int,
+    upload_id: str,
+    container=Depends(get_container),
+) -> Response:
+    """
+    The current offset of a resumable upload, in the `Upload-Offset` header.
+    """
+    session = await _upload_session(source_id, upload_id, container)
+    return Response(headers=_upload_headers(session))
+
+
+@router.get("/{source_id}/uploads/{upload_id}", response_model=UploadSessionSchema)
+async def get_upload_session(
+    source_id: int,
+    upload_id: str,
+    response: Response,
+    container=Depends(get_container),
+) -> UploadSessionSchema:
+    session = await _upload_session(source_id, upload_id, container)
+    response.headers.update(_upload_headers(session))
+    return session
+
+
+@router.patch("/{source_id}/uploads/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def append_upload(
+    source_id: int,
+    upload_id: str,
+    request: Request,
+    upload_offset: int = Header(alias="Upload-Offset", ge=0),
+    container=Depends(get_container),
+) -> Response:
+    """
+    Append the request body at `Upload-Offset`, which must be the current
+    offset. Bytes received before a connection drops are kept.
+    """
+    await _upload_session(source_id, upload_id, container)
+    try:
+        session = await container.upload_sessions.append(
+            upload_id, upload_offset, request.stream()
+        )
+    except UploadSessionNotFound:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    except UploadOffsetMismatch as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+            headers={"Upload-Offset": str(e.offset)},
+        )
+    except UploadSessionBusy:
+        raise HTTPException(
+            status_code=status.HTTP_423_LOCKED,
+            detail="Upload is being written by another request",
+        )
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+
+    return Response(status_code=status.HTTP_204_NO_CONTENT, headers=_upload_headers(session))
+
+
+@router.post("/{source_id}/uploads/{upload_id}/complete", status_code=status.HTTP_202_ACCEPTED)
+async def complete_upload(
+    source_id: int,
+    upload_id: str,
+    container=Depends(get_container),
+):
+    """
+    Turn a fully received upload into an artifact and schedule its ingestion.
+    """
+    session = await _upload_session(source_id, upload_id, container)
+    if not session.complete:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Upload has {session.offset} of {session.size} bytes",
+            headers=_upload_headers(session),
+        )
+
+    try:
+        path = await container.upload_sessions.start_completion(upload_id)
+    except UploadSessionNotFound:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    except UploadSessionCompleting:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Upload is being completed by another request",
         )
 
-        # Schedule ingestion asynchronously
-        await coordinator.on_artifact_created(artifact)
+    artifact_service = container.artifact_service
+    try:
+        async with container.db.transaction() as conn:
+            src = await asyncio.to_thread(open, path, "rb")
+            try:
+                fmt = await _archive_format(artifact_service, src, session.filename, session.content_type)
+                if fmt:
+                    artifacts, duplicates = await _store_archive(
+                        artifact_service, source_id, src, fmt, session.filename, conn
+                    )
+                else:
+                    artifact, created = await artifact_service.store_file(
+                        source_id=source_id,
+                        path=path,
+                        filename=session.filename,
+                        content_type=session.content_type,
+                        conn=conn,
+                    )
+            finally:
+                await asyncio.to_thread(src.close)
+    except BaseException:
+        # Nothing was recorded: the client can complete again.
+        await container.upload_sessions.cancel_completion(upload_id)
+        raise
+    await container.upload_sessions.delete(upload_id)
+
+    if fmt:
+        await container.ingestion_coordinator.on_artifacts_created(artifacts)
+        return _expanded(artifacts, duplicates)
+
+    if not created:
+        return {
+            "artifact_id": artifact.id,
+            "status": "duplicate",
+        }
+
+    await container.ingestion_coordinator.on_artifact_created(artifact)
 
     return {
         "artifact_id": artifact.id,
         "status": "uploaded",
     }
 
+
+@router.delete("/{source_id}/uploads/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def abort_upload(
+    source_id: int,
+    upload_id: str,
+    container=Depends(get_container),
+) -> Response:
+    await _upload_session(source_id, upload_id, container)
+    await container.upload_sessions.delete(upload_id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+async def _archive_format(artifact_service, src, filename, content_type) -> str | None:
+    if not settings.upload_expand_archives:
+        return None
+    return await artifact_service.detect_archive(src, filename, content_type)
+
+
+async def _store_archive(artifact_service, source_id: int, src, fmt: str, filename, conn):
+    try:
+        return await artifact_service.store_archive(
+            source_id=source_id,
+            src=src,
+            fmt=fmt,
+            archive_name=filename,
+            conn=conn,
+        )
+    except ArchiveError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+def _expanded(artifacts, duplicates: int) -> dict:
+    # One artifact per archive member; the archive itself is not kept.
+    return {
+        "artifact_ids": [artifact.id for artifact in artifacts],
+        "duplicates": duplicates,
+        "status": "expanded",
+    }
+
+
+async def _upload_session(source_id: int, upload_id: str, container):
+    session = await container.upload_sessions.get(upload_id)
+    if not session or session.source_id != source_id:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return session
+
+
+def _upload_headers(session) -> dict[str, str]:
+    return {
+        "Upload-Offset": str(session.offset),
+        "Upload-Length": str(session.size),
+        "Cache-Control": "no-store",
+    }
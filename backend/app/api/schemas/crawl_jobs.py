@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from datetime import datetime
+
+class CrawlJob(BaseModel):
+    """A crawl running in the background, with its live progress"""
+    id: int
+    site_id: int
+    status: str
+    incremental: bool = False
+    pages_fetched: int = 0
+    pages_failed: int = 0
+    pages_unchanged: int = 0
+    pages_per_sec: float = 0.0
+    queue_depth: int = 0
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    updated_at: datetime | None = None
+    error: str | None = None
+    source_id: int | None = None
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, HttpUrl, Field
+from pydantic import BaseModel, ConfigDict, HttpUrl, Field
 from datetime import datetime
 from typing import Any, Literal, Union
 
@@ -46,8 +46,7 @@ class SourceSchema(BaseModel):
     config: SourceConfig
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class SourceCreateSchema(BaseModel):
     """The new source schema"""
@@ -58,3 +57,26 @@ class SourceUpdateSchema(BaseModel):
     """The source being updated"""
     name: str | None = None
     config: dict[str, Any] | None = None
+
+
+# --------------------------
+# Resumable uploads
+# --------------------------
+
+class UploadSessionCreateSchema(BaseModel):
+    """A resumable upload to open for a source"""
+    filename: str
+    size: int = Field(ge=0)
+    content_type: str = "application/octet-stream"
+
+class UploadSessionSchema(BaseModel):
+    """A resumable upload and how many of its bytes were received"""
+    id: str
+    source_id: int
+    filename: str
+    content_type: str
+    size: int
+    offset: int
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
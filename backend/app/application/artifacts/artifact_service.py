@@ -1,12 +1,125 @@
+import asyncio
+import errno
+import hashlib
+import io
+import mimetypes
 import os
-import uuid
+import shutil
 from pathlib import Path
+from typing import BinaryIO, Callable
 
 from fastapi import UploadFile
 import psycopg
 
+from app.core.logging import logger
 from app.domain.models.artifact import Artifact
 from app.domain.repositories.artifact_repository import ArtifactRepository
+from app.infrastructure.extraction.mime_sniffer import is_generic, sniff_mime
+from app.infrastructure.uploads.archive_expander import (
+    ArchiveExpander,
+    ArchiveMember,
+    archive_format,
+)
+from app.infrastructure.uploads.blob_store import BlobStore
+
+_PIECE_SIZE = 1024 * 1024
+
+
+def _hash_upload(src: BinaryIO) -> tuple[int, str, bytes]:
+    """
+    Size, sha256 and first bytes (for sniffing) of a spooled upload.
+    Blocking.
+    """
+    src.seek(0)
+    digest = hashlib.sha256()
+    size = 0
+    head = b""
+    while piece := src.read(_PIECE_SIZE):
+        if not size:
+            head = piece[:512]
+        size += len(piece)
+        digest.update(piece)
+    return size, digest.hexdigest(), head
+
+
+def _resolve_mime(content_type: str | None, filename: str | None, head: bytes) -> str:
+    """
+    The declared type, unless it is generic: then the type guessed from
+    the file name, or sniffed from the content.
+    """
+    if content_type and not is_generic(content_type):
+        return content_type
+    return (
+        mimetypes.guess_type(filename or "")[0]
+        or sniff_mime(head)
+        or "application/octet-stream"
+    )
+
+
+def _disk_fileno(src: BinaryIO) -> int | None:
+    # A spooled upload still held in memory (below Starlette's 1 MB spool
+    # size) is rolled over to disk by fileno(): one small extra write.
+    try:
+        return src.fileno()
+    except (OSError, io.UnsupportedOperation):
+        return None
+
+
+def _kernel_copy(src_fd: int, dest_fd: int, size: int) -> None:
+    """
+    Copy `size` bytes between file descriptors without passing them
+    through Python: copy_file_range where supported, sendfile otherwise.
+    """
+    copy_file_range = getattr(os, "copy_file_range", None)
+    offset = 0
+    while offset < size:
+        count = size - offset
+        if copy_file_range is not None:
+            try:
+                copied = copy_file_range(src_fd, dest_fd, count, offset)
+            except OSError:
+                # e.g. across filesystems on older kernels
+                copy_file_range = None
+                continue
+        else:
+            copied = os.sendfile(dest_fd, src_fd, offset, count)
+        if copied == 0:
+            raise OSError("Upload ended before its expected size")
+        offset += copied
+
+
+def _copy_upload(src: BinaryIO, dest: Path, size: int) -> None:
+    """
+    Write a spooled upload to `dest`. Blocking.
+
+    Uploads already spooled to a temp file are copied by the kernel;
+    small ones still in memory are written directly.
+    """
+    src.seek(0)
+    with open(dest, "wb") as out:
+        fd = _disk_fileno(src)
+        if fd is not None:
+            try:
+                _kernel_copy(fd, out.fileno(), size)
+                return
+            except OSError:
+                out.seek(0)
+                out.truncate()
+                src.seek(0)
+        shutil.copyfileobj(src, out, _PIECE_SIZE)
+
+
+def _link_or_copy(src: Path, dest: Path) -> None:
+    """
+    Hard-link `src` to `dest`, or copy it when they are on different
+    filesystems, e.g. a sessions directory on its own mount. Blocking.
+    """
+    try:
+        os.link(src, dest)
+    except OSError as exc:
+        if exc.errno != errno.EXDEV:
+            raise
+        shutil.copyfile(src, dest)
 
 
 class ArtifactService:
@@ -14,8 +127,10 @@ class ArtifactService:
     ArtifactService
 
     Responsibilities:
-    - Persist uploaded binary files to disk
+    - Persist uploaded binary files to the content-addressed blob store
     - Create artifact records in the database
+    - Suppress duplicate uploads of the same content to a source
+    - Expand archives into one artifact per member
 
     Non-responsibilities:
     - Parsing artifacts
@@ -32,9 +147,13 @@ class ArtifactService:
         *,
         artifact_repo: ArtifactRepository,
         upload_root: str,
+        archive_expander: ArchiveExpander | None = None,
+        blob_store: BlobStore | None = None,
     ):
         self.artifact_repo = artifact_repo
         self.upload_root = upload_root
+        self.archive_expander = archive_expander or ArchiveExpander()
+        self.blob_store = blob_store or BlobStore(upload_root)
 
     async def store_upload(
         self,
@@ -42,42 +161,191 @@ class ArtifactService:
         source_id: int,
         file: UploadFile,
         conn: psycopg.AsyncConnection,
-    ) -> Artifact:
+    ) -> tuple[Artifact, bool]:
         """
         Store an uploaded file and create an artifact record.
 
-        This method is transactional:
-        - If DB insert fails → file is deleted
-        - If file write fails → no DB record is created
+        Starlette has already spooled the upload to a temp file, so it is
+        not streamed again: the spooled file is hashed (sha256) and, unless
+        a blob with the same content exists, copied into the blob store by
+        the kernel. Both run in a worker thread, keeping the event loop
+        free. If the source already has an artifact with the same content,
+        that artifact is returned instead.
+
+        Returns the artifact and whether it was created.
+
+        If the DB insert fails, a blob just written is left unreferenced
+        for the sweeper to collect.
+        """
+        size, content_hash, head = await asyncio.to_thread(_hash_upload, file.file)
+        return await self._store(
+            source_id=source_id,
+            mime_type=_resolve_mime(file.content_type, file.filename, head),
+            size=size,
+            content_hash=content_hash,
+            write=lambda dest: _copy_upload(file.file, dest, size),
+            conn=conn,
+        )
+
+    async def store_file(
+        self,
+        *,
+        source_id: int,
+        path: Path,
+        filename: str,
+        content_type: str | None,
+        conn: psycopg.AsyncConnection,
+    ) -> tuple[Artifact, bool]:
+        """
+        Create an artifact from a file already on disk under the upload
+        root, e.g. a finished resumable upload.
+
+        The file is hashed in a worker thread and hard-linked into the
+        blob store, without copying, unless they are on different
+        filesystems. `path` itself is left for the caller to remove once
+        the transaction has committed, so a failed insert loses nothing.
+
+        Returns the artifact and whether it was created.
+        """
+        def hash_file() -> tuple[int, str, bytes]:
+            with open(path, "rb") as f:
+                return _hash_upload(f)
+
+        size, content_hash, head = await asyncio.to_thread(hash_file)
+        return await self._store(
+            source_id=source_id,
+            mime_type=_resolve_mime(content_type, filename, head),
+            size=size,
+            content_hash=content_hash,
+            write=lambda dest: _link_or_copy(path, dest),
+            conn=conn,
+        )
+
+    async def detect_archive(
+        self,
+        src: BinaryIO,
+        filename: str | None,
+        mime_type: str | None,
+    ) -> str | None:
+        """
+        The archive format of an upload, or None if it is a plain file.
+        """
+        def head() -> bytes:
+            src.seek(0)
+            return src.read(512)
+
+        return archive_format(await asyncio.to_thread(head), filename, mime_type)
+
+    async def store_archive(
+        self,
+        *,
+        source_id: int,
+        src: BinaryIO,
+        fmt: str,
+        archive_name: str | None,
+        conn: psycopg.AsyncConnection,
+    ) -> tuple[list[Artifact], int]:
+        """
+        Create one artifact per member of an archive.
+
+        Members are streamed out of `src` into the blob store in a worker
+        thread, then recorded with a single bulk insert. Members whose
+        content the source already has are not recorded again.
+
+        Returns the artifacts created and the number of duplicates.
+        Raises `ArchiveError` for corrupt or oversized archives.
+        """
+        def expand() -> list[tuple[ArchiveMember, Path]]:
+            members = self.archive_expander.expand(src, fmt, self.blob_store.staging_dir())
+            return [
+                (member, self.blob_store.adopt(member.content_hash, member.path)[0])
+                for member in members
+            ]
+
+        stored = await asyncio.to_thread(expand)
+        artifacts = await self.artifact_repo.create_many(
+            [
+                {
+                    "source_id": source_id,
+                    "type": "upload",
+                    "mime_type": member.mime_type,
+                    "path": str(path),
+                    "size_bytes": member.size,
+                    "content_hash": member.content_hash,
+                    "metadata": {"archive": archive_name, "member": member.name},
+                }
+                for member, path in stored
+            ],
+            conn=conn,
+        )
+
+        duplicates = len(stored) - len(artifacts)
+        logger.info(
+            "Expanded archive",
+            extra={
+                "source_id": source_id,
+                "archive": archive_name,
+                "artifacts": len(artifacts),
+                "duplicates": duplicates,
+            },
+        )
+        return artifacts, duplicates
+
+    async def _store(
+        self,
+        *,
+        source_id: int,
+        mime_type: str,
+        size: int,
+        content_hash: str,
+        write: Callable[[Path], None],
+        conn: psycopg.AsyncConnection,
+    ) -> tuple[Artifact, bool]:
+        """
+        Put the content in the blob store, with the blocking `write` if it
+        is not there yet, and record it, unless the source already has an
+        artifact with `content_hash`.
         """
-        os.makedirs(self.upload_root, exist_ok=True)
-        source_dir = Path(self.upload_root) / f"source_{source_id}"
-        source_dir.mkdir(parents=True, exist_ok=True)
-
-        suffix = Path(file.filename or "").suffix
-        artifact_id = f"{uuid.uuid4()}{suffix}"
-        file_path = source_dir / artifact_id
-
-        try:
-            size = 0
-            with open(file_path, "wb") as f:
-                while chunk := await file.read(1024 * 1024):
-                    size += len(chunk)
-                    f.write(chunk)
-
-            return await self.artifact_repo.create(
-                source_id=source_id,
-                type="upload",
-                mime_type=file.content_type or "application/octet-stream",
-                path=str(file_path),
-                size_bytes=size,
-                conn=conn,
+        existing = await self.artifact_repo.get_by_content_hash(
+            source_id, content_hash, conn=conn
+        )
+        if existing:
+            logger.info(
+                "Duplicate upload",
+                extra={"artifact_id": existing.id, "source_id": source_id},
             )
+            return existing, False
 
-        except Exception:
-            if file_path.exists():
-                file_path.unlink()
-            raise
+        path, written = await asyncio.to_thread(self.blob_store.put, content_hash, write)
+        # Unlike `create`, tells an insert from a conflict.
+        created = await self.artifact_repo.create_many(
+            [
+                {
+                    "source_id": source_id,
+                    "type": "upload",
+                    "mime_type": mime_type,
+                    "path": str(path),
+                    "size_bytes": size,
+                    "content_hash": content_hash,
+                }
+            ],
+            conn=conn,
+        )
+        if created:
+            return created[0], True
+
+        # A concurrent upload of the same content was committed first.
+        artifact = await self.artifact_repo.get_by_content_hash(
+            source_id, content_hash, conn=conn
+        )
+        if artifact is None:
+            # ... and deleted again since.
+            raise RuntimeError(f"Artifact {content_hash} was deleted during the upload")
+        logger.info(
+            "Duplicate upload",
+            extra={"artifact_id": artifact.id, "source_id": source_id, "blob_written": written},
+        )
+        return artifact, False
 
     async def remove_upload(
             self,
@@ -86,13 +354,9 @@ class ArtifactService:
             conn: psycopg.AsyncConnection
     ) -> None:
         """
-        Remove artifact file and DB record.
+        Remove the artifact's DB record. Its blob may back other
+        artifacts; once none references it, the sweeper removes it.
 
         Must be called inside a transaction.
         """
-        path = Path(artifact.path)
-        if path.exists():
-            path.unlink()
         await self.artifact_repo.delete(artifact.id, conn=conn)
-
-
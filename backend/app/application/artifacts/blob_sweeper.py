@@ -0,0 +1,100 @@
+import asyncio
+import contextlib
+import itertools
+import time
+
+from app.core.logging import logger
+from app.domain.repositories.artifact_repository import ArtifactRepository
+from app.infrastructure.uploads.blob_store import BlobStore
+
+
+class BlobSweeper:
+    """
+    Garbage-collects blobs no artifact references any more, e.g. after
+    their artifacts or source were deleted.
+
+    Every `interval` seconds the blob store is listed in batches of
+    `batch_size`; each batch costs one query for the hashes still
+    referenced and one pass removing the others. Blobs stored within the
+    last `grace` seconds are kept, so uploads whose artifact is not
+    committed yet never lose their blob.
+
+    Any number of sweepers may share a store: removal is idempotent and
+    serialized with uploads by the store's lock.
+    """
+
+    def __init__(
+            self,
+            *,
+            blob_store: BlobStore,
+            artifact_repo: ArtifactRepository,
+            interval: float = 3600.0,
+            grace: float = 3600.0,
+            batch_size: int = 1000,
+    ):
+        self.blob_store = blob_store
+        self.artifact_repo = artifact_repo
+        self.interval = interval
+        self.grace = grace
+        self.batch_size = batch_size
+        self._stop: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """
+        Sweep periodically in the background of the current event loop.
+        """
+        if self._task is None:
+            self._stop = asyncio.Event()
+            self._task = asyncio.create_task(self.run(self._stop), name="blob-sweeper")
+
+    async def stop(self) -> None:
+        if self._task is None or self._stop is None:
+            return
+        self._stop.set()
+        await self._task
+        self._task = None
+
+    async def run(self, stop: asyncio.Event) -> None:
+        while not stop.is_set():
+            try:
+                await self.sweep()
+            except Exception:
+                logger.exception("Blob sweep failed")
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(stop.wait(), self.interval)
+
+    async def sweep(self) -> int:
+        """
+        Remove unreferenced blobs older than the grace period; returns
+        how many were removed.
+        """
+        started = time.monotonic()
+        cutoff = time.time() - self.grace
+        blobs = self.blob_store.iter_blobs()
+        scanned = removed = 0
+        while listed := await asyncio.to_thread(
+                lambda: list(itertools.islice(blobs, self.batch_size))
+        ):
+            scanned += len(listed)
+            old = [content_hash for content_hash, mtime in listed if mtime < cutoff]
+            if not old:
+                continue
+            referenced = await self.artifact_repo.referenced_hashes(old)
+            unreferenced = [h for h in old if h not in referenced]
+            if unreferenced:
+                removed += await asyncio.to_thread(
+                    self.blob_store.remove, unreferenced, older_than=cutoff
+                )
+
+        staging = await asyncio.to_thread(self.blob_store.remove_stale_staging, older_than=cutoff)
+        logger.info(
+            "Swept blobs",
+            extra={
+                "scanned": scanned,
+                "removed": removed,
+                "staging_removed": staging,
+                "duration": round(time.monotonic() - started, 3),
+            },
+        )
+        return removed
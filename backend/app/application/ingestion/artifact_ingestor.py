@@ -0,0 +1,60 @@
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from app.application.ingestion.extraction_service import (
+    ExtractionService,
+    UnsupportedArtifactError,
+)
+from app.application.ingestion.pipeline import IngestionPipeline
+from app.domain.models.artifact import Artifact
+from app.domain.models.document import Document
+
+
+class ArtifactIngestor:
+    """
+    Turns one artifact into embedded chunks: extract its text (see
+    `ExtractionService`), then stream it through the ingestion pipeline
+    (chunk, embed, upsert).
+
+    Raises `UnsupportedArtifactError` for artifacts that cannot be
+    ingested; any other error is worth a retry.
+    """
+
+    def __init__(
+            self,
+            *,
+            pipeline: IngestionPipeline,
+            extraction: ExtractionService | None = None,
+    ):
+        self.pipeline = pipeline
+        self.extraction = extraction or ExtractionService(max_workers=0)
+
+    async def ingest(self, artifact: Artifact) -> dict[str, Any]:
+        """
+        Ingest `artifact`. Returns metadata to record on the artifact.
+        """
+        path = Path(artifact.path)
+        if not path.exists():
+            raise UnsupportedArtifactError(f"Artifact file missing: {artifact.path}")
+
+        text = await self.extraction.extract_file(artifact.mime_type, path)
+
+        now = datetime.now(timezone.utc)
+        document = Document(
+            id=f"artifact:{artifact.id}",
+            site_id=str(artifact.source_id),
+            url=artifact.path,
+            title=path.name,
+            raw_html="",
+            text=text,
+            created_at=now,
+            updated_at=now,
+        )
+        stats = await self.pipeline.run([document])
+        chunk = stats.stages["chunk"]
+        return {
+            "chunks": chunk.items_out + chunk.items_skipped,
+            "embedded": stats.stages["embed"].items_out,
+            "characters": len(text),
+        }
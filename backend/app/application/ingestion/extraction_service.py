@@ -0,0 +1,153 @@
+import asyncio
+import functools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Callable
+
+from app.core.logging import logger
+from app.domain.ingestion.mime_registry import MimeRegistry
+from app.domain.models.extraction_stats import ExtractorStats
+from app.infrastructure.extraction.extractors import (
+    Extractor,
+    UnreadableContentError,
+    default_extractors,
+    timed,
+    timed_file,
+)
+from app.infrastructure.extraction.mime_sniffer import is_generic, sniff_mime
+
+
+class UnsupportedArtifactError(ValueError):
+    """
+    The artifact can never be ingested, so retrying it is pointless.
+    """
+
+
+def _size_and_head(path: Path) -> tuple[int, bytes]:
+    with open(path, "rb") as f:
+        return os.fstat(f.fileno()).st_size, f.read(512)
+
+
+class ExtractionService:
+    """
+    Extracts text from artifact bytes with the extractor registered for
+    their MIME type (exact, `type/*` or `*`). Generic types such as
+    `application/octet-stream` are first replaced by the type sniffed
+    from the content's magic bytes.
+
+    Extractors are CPU-bound, so they run in a pool of `max_workers`
+    processes, started on first use and never on the event loop. With
+    `max_workers=0` they run in a thread instead, e.g. for tests. Files
+    are read by the process extracting them, and refused above
+    `max_bytes`.
+
+    Throughput (bytes/sec) is tracked per extractor, timed inside the
+    worker process so it reflects parsing speed rather than queueing.
+    """
+
+    def __init__(
+            self,
+            extractors: MimeRegistry[Extractor] | None = None,
+            *,
+            max_workers: int = 2,
+            max_bytes: int | None = None,
+    ):
+        self.extractors = extractors or default_extractors()
+        self.max_workers = max_workers
+        self.max_bytes = max_bytes
+        self._pool: ProcessPoolExecutor | None = None
+        self._stats: dict[str, ExtractorStats] = {}
+
+    def resolve_mime(self, mime_type: str | None, head: bytes) -> str | None:
+        """
+        `mime_type`, or the type sniffed from `head` if it is generic.
+        """
+        if is_generic(mime_type):
+            return sniff_mime(head) or mime_type
+        return mime_type
+
+    async def extract(self, mime_type: str | None, data: bytes) -> str:
+        """
+        Raises `UnsupportedArtifactError` if no extractor handles the
+        content, or it cannot read it. Other errors raised by the
+        extractor propagate.
+        """
+        mime_type, extractor = self._resolve(mime_type, data[:512])
+        return await self._run(
+            mime_type, extractor, len(data), functools.partial(timed, extractor, data)
+        )
+
+    async def extract_file(self, mime_type: str | None, path: Path) -> str:
+        """
+        `extract` for a file, without reading it here. Also raises
+        `UnsupportedArtifactError` if it is larger than `max_bytes`.
+        """
+        size, head = await asyncio.to_thread(_size_and_head, path)
+        if self.max_bytes is not None and size > self.max_bytes:
+            raise UnsupportedArtifactError(
+                f"Artifact of {size} bytes exceeds the extraction limit of {self.max_bytes}"
+            )
+        mime_type, extractor = self._resolve(mime_type, head)
+        return await self._run(
+            mime_type, extractor, size, functools.partial(timed_file, extractor, path)
+        )
+
+    def stats(self) -> dict[str, dict]:
+        return {name: stats.as_dict() for name, stats in self._stats.items()}
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def _resolve(self, mime_type: str | None, head: bytes) -> tuple[str | None, Extractor]:
+        mime_type = self.resolve_mime(mime_type, head)
+        extractor = self.extractors.resolve(mime_type)
+        if extractor is None:
+            raise UnsupportedArtifactError(f"Unsupported mime type '{mime_type}'")
+        return mime_type, extractor
+
+    async def _run(
+            self,
+            mime_type: str | None,
+            extractor: Extractor,
+            size: int,
+            call: Callable[[], tuple[str, float]],
+    ) -> str:
+        try:
+            if self.max_workers > 0:
+                pool = self._executor()
+                try:
+                    text, seconds = await asyncio.get_running_loop().run_in_executor(pool, call)
+                except BrokenProcessPool:
+                    # A worker died (e.g. a parser crashed): start a fresh
+                    # pool next time; this attempt will be retried.
+                    if self._pool is pool:
+                        self._pool = None
+                    raise
+            else:
+                text, seconds = await asyncio.to_thread(call)
+        except UnreadableContentError as e:
+            raise UnsupportedArtifactError(str(e)) from e
+
+        stats = self._stats.setdefault(extractor.__name__, ExtractorStats(name=extractor.__name__))
+        stats.calls += 1
+        stats.bytes += size
+        stats.seconds += seconds
+        logger.info(
+            "Extracted text",
+            extra={
+                "extractor": extractor.__name__,
+                "mime_type": mime_type,
+                "bytes": size,
+                "bytes_per_sec": round(size / seconds) if seconds > 0 else None,
+            },
+        )
+        return text
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool
@@ -4,6 +4,7 @@ from app.domain.models.source import Source
 from app.domain.models.artifact import Artifact
 from app.domain.ingestion.source_handler import SourceHandler
 from app.domain.ingestion.artifact_handler import ArtifactHandler
+from app.domain.ingestion.mime_registry import MimeRegistry
 
 
 class IngestionCoordinator:
@@ -22,7 +23,8 @@ class IngestionCoordinator:
             artifact_handlers: dict[str, ArtifactHandler],
     ) -> None:
         self.source_handlers = source_handlers
-        self.artifact_handlers = artifact_handlers
+        # Keyed by MIME pattern: exact type, `type/*` or `*`.
+        self.artifact_handlers = MimeRegistry(artifact_handlers)
 
     # -----------------------------
     # Handler resolution
@@ -35,10 +37,7 @@ class IngestionCoordinator:
         return handler
 
     def _get_artifact_handler(self, artifact: Artifact) -> ArtifactHandler:
-        handler = (
-            self.artifact_handlers.get(artifact.mime_type)
-            or self.artifact_handlers.get("*")
-        )
+        handler = self.artifact_handlers.resolve(artifact.mime_type)
         if not handler:
             raise ValueError(
                 f"No artifact handler for mime type '{artifact.mime_type}'"
@@ -73,4 +72,15 @@ class IngestionCoordinator:
         handler = self._get_artifact_handler(artifact)
         await handler.enqueue(artifact)
 
+    async def on_artifacts_created(self, artifacts: list[Artifact]) -> None:
+        """
+        Schedule many artifacts, e.g. the members of an archive, with one
+        call per handler.
+        """
+        by_handler: dict[int, tuple[ArtifactHandler, list[Artifact]]] = {}
+        for artifact in artifacts:
+            handler = self._get_artifact_handler(artifact)
+            by_handler.setdefault(id(handler), (handler, []))[1].append(artifact)
 
+        for handler, batch in by_handler.values():
+            await handler.enqueue_many(batch)
@@ -0,0 +1,318 @@
+import asyncio
+import contextlib
+import time
+from typing import AsyncIterable, Iterable
+
+from app.core.logging import logger
+from app.domain.models.chunk import Chunk
+from app.domain.models.document import Document
+from app.domain.models.pipeline_stats import PipelineStats, StageStats
+from app.domain.services.chunker import Chunker
+from app.domain.services.embedding_provider import EmbeddingProvider
+from app.domain.services.vector_store import VectorStore
+
+# Marks the end of a stage's input.
+_DONE = object()
+
+
+class _Stage:
+    """
+    A bounded input queue with the stats of the stage consuming it.
+    """
+
+    def __init__(self, name: str, capacity: int, workers: int = 1):
+        self.queue: asyncio.Queue = asyncio.Queue(capacity)
+        self.stats = StageStats(name=name, capacity=capacity, workers=workers)
+
+    async def put(self, item, upstream: StageStats | None) -> None:
+        """
+        Called by the upstream stage; time spent waiting on a full queue
+        is backpressure on `upstream`.
+        """
+        if self.queue.full():
+            started = time.monotonic()
+            await self.queue.put(item)
+            if upstream is not None:
+                upstream.blocked_seconds += time.monotonic() - started
+        else:
+            self.queue.put_nowait(item)
+        self._observe()
+
+    async def get(self):
+        item = await self.queue.get()
+        self._observe()
+        return item
+
+    def get_nowait(self):
+        item = self.queue.get_nowait()
+        self._observe()
+        return item
+
+    def _observe(self) -> None:
+        self.stats.queue_size = self.queue.qsize()
+        self.stats.queue_peak = max(self.stats.queue_peak, self.stats.queue_size)
+
+
+class IngestionPipeline:
+    """
+    Streams documents through chunk -> embed -> upsert stages.
+
+    Stages run concurrently and are connected by bounded queues, so a slow
+    stage holds back the ones before it and memory stays flat however
+    many documents come in:
+    - chunk: splits up to `chunk_batch_size` queued documents at once,
+      in a thread. With `incremental`, chunks whose content hash is
+      already stored for the document are not embedded again, and chunks
+      the document no longer has are deleted.
+    - embed: `embed_workers` tasks, each sending micro-batches of up to
+      `embed_batch_size` chunks to `embed_batch`. A batch is sent when
+      full, or once no chunk arrived for `batch_linger` seconds.
+    - upsert: writes embedded chunks in batches of `upsert_batch_size`
+
+    Every stage reports throughput, utilization, time blocked on the next
+    stage and queue occupancy. The busiest stage is the bottleneck.
+    """
+
+    def __init__(
+            self,
+            *,
+            chunker: Chunker,
+            embedding_provider: EmbeddingProvider,
+            vector_store: VectorStore,
+            chunk_batch_size: int = 8,
+            incremental: bool = True,
+            embed_batch_size: int = 32,
+            embed_workers: int = 1,
+            upsert_batch_size: int = 256,
+            queue_size: int = 16,
+            batch_linger: float = 0.05,
+            report_interval: float = 10.0,
+    ):
+        self.chunker = chunker
+        self.embedding_provider = embedding_provider
+        self.vector_store = vector_store
+        self.chunk_batch_size = chunk_batch_size
+        self.incremental = incremental
+        self.embed_batch_size = embed_batch_size
+        self.embed_workers = embed_workers
+        self.upsert_batch_size = upsert_batch_size
+        self.queue_size = queue_size
+        self.batch_linger = batch_linger
+        self.report_interval = report_interval
+
+    async def run(
+            self,
+            documents: AsyncIterable[Document] | Iterable[Document],
+    ) -> PipelineStats:
+        chunk = _Stage("chunk", self.queue_size)
+        embed = _Stage("embed", self.queue_size * self.embed_batch_size, self.embed_workers)
+        upsert = _Stage("upsert", self.queue_size)
+        stats = PipelineStats(
+            stages={stage.stats.name: stage.stats for stage in (chunk, embed, upsert)}
+        )
+
+        tasks = [
+            asyncio.create_task(self._feed(documents, chunk)),
+            asyncio.create_task(self._chunk(chunk, embed, upsert)),
+            *(
+                asyncio.create_task(self._embed(embed, upsert))
+                for _ in range(self.embed_workers)
+            ),
+            asyncio.create_task(self._upsert(upsert)),
+        ]
+        reporter = asyncio.create_task(self._report(stats))
+        try:
+            await self._wait(tasks)
+        finally:
+            reporter.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await reporter
+
+        logger.info("Ingestion pipeline finished", extra=stats.as_dict())
+        return stats
+
+    @staticmethod
+    async def _wait(tasks: list[asyncio.Task]) -> None:
+        """
+        Wait for every stage; the first failure cancels the others, which
+        would otherwise block forever on their queues.
+        """
+        try:
+            done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        for task in done:
+            error = None if task.cancelled() else task.exception()
+            if error is not None:
+                raise error
+
+    async def _feed(self, documents, out: _Stage) -> None:
+        if isinstance(documents, AsyncIterable):
+            async for document in documents:
+                await out.put(document, None)
+        else:
+            for document in documents:
+                await out.put(document, None)
+        await out.put(_DONE, None)
+
+    async def _chunk(self, stage: _Stage, out: _Stage, upsert: _Stage) -> None:
+        stats = stage.stats
+        done = False
+        while not done:
+            documents, done = await self._next_documents(stage)
+            if not documents:
+                continue
+
+            stats.items_in += len(documents)
+            started = time.monotonic()
+            chunked = await asyncio.to_thread(self.chunker.chunk_batch, documents)
+            chunks = [chunk for document_chunks in chunked for chunk in document_chunks]
+            reused: list[Chunk] = []
+            if self.incremental:
+                chunks, reused, unchanged = await self._diff(documents, chunks)
+                stats.items_skipped += unchanged
+            stats.busy_seconds += time.monotonic() - started
+
+            if reused:
+                # Already embedded under another position: straight to upsert.
+                await upsert.put(reused, stats)
+                stats.items_out += len(reused)
+            for chunk in chunks:
+                await out.put(chunk, stats)
+                stats.items_out += 1
+
+        # One end marker per embed worker.
+        for _ in range(self.embed_workers):
+            await out.put(_DONE, stats)
+
+    async def _next_documents(self, stage: _Stage) -> tuple[list[Document], bool]:
+        """
+        The next document plus any others already queued, up to
+        `chunk_batch_size`, and whether the input has ended.
+        """
+        documents: list[Document] = []
+        item = await stage.get()
+        while item is not _DONE:
+            documents.append(item)
+            if len(documents) >= self.chunk_batch_size:
+                return documents, False
+            try:
+                item = stage.get_nowait()
+            except asyncio.QueueEmpty:
+                return documents, False
+        return documents, True
+
+    async def _diff(
+            self,
+            documents: list[Document],
+            chunks: list[Chunk],
+    ) -> tuple[list[Chunk], list[Chunk], int]:
+        """
+        Compare fresh chunks with those stored for the same documents.
+
+        Returns the chunks to embed, the chunks whose text is already
+        embedded elsewhere (their embedding is reused) and the number left
+        as they are. Stored chunks the documents no longer have are deleted.
+        """
+        stored = await self.vector_store.get_by_documents([d.id for d in documents])
+        by_id = {chunk.id: chunk for chunk in stored}
+        embeddings = {
+            chunk.content_hash: chunk.embedding
+            for chunk in stored
+            if chunk.content_hash is not None and chunk.embedding
+        }
+
+        fresh: list[Chunk] = []
+        reused: list[Chunk] = []
+        unchanged = 0
+        for chunk in chunks:
+            previous = by_id.get(chunk.id)
+            if chunk.content_hash is None:
+                fresh.append(chunk)
+            elif (
+                    previous is not None
+                    and previous.content_hash == chunk.content_hash
+                    and previous.embedding
+            ):
+                unchanged += 1
+            elif chunk.content_hash in embeddings:
+                chunk.embedding = embeddings[chunk.content_hash]
+                reused.append(chunk)
+            else:
+                fresh.append(chunk)
+
+        ids = {chunk.id for chunk in chunks}
+        stale = [chunk.id for chunk in stored if chunk.id not in ids]
+        if stale:
+            await self.vector_store.delete(stale)
+        return fresh, reused, unchanged
+
+    async def _embed(self, stage: _Stage, out: _Stage) -> None:
+        stats = stage.stats
+        done = False
+        while not done:
+            batch, done = await self._next_batch(stage)
+            if not batch:
+                continue
+
+            stats.items_in += len(batch)
+            started = time.monotonic()
+            embeddings = await self.embedding_provider.embed_batch([c.text for c in batch])
+            stats.busy_seconds += time.monotonic() - started
+            if len(embeddings) != len(batch):
+                raise RuntimeError(
+                    f"Embedding provider returned {len(embeddings)} vectors for {len(batch)} chunks"
+                )
+
+            for chunk, embedding in zip(batch, embeddings):
+                chunk.embedding = embedding
+            await out.put(batch, stats)
+            stats.items_out += len(batch)
+
+        await out.put(_DONE, stats)
+
+    async def _next_batch(self, stage: _Stage) -> tuple[list[Chunk], bool]:
+        """
+        Up to `embed_batch_size` chunks, and whether the input has ended.
+        """
+        batch: list[Chunk] = []
+        item = await stage.get()
+        while item is not _DONE:
+            batch.append(item)
+            if len(batch) >= self.embed_batch_size:
+                return batch, False
+            try:
+                item = stage.get_nowait()
+            except asyncio.QueueEmpty:
+                try:
+                    item = await asyncio.wait_for(stage.get(), self.batch_linger)
+                except asyncio.TimeoutError:
+                    return batch, False
+        return batch, True
+
+    async def _upsert(self, stage: _Stage) -> None:
+        stats = stage.stats
+        pending: list[Chunk] = []
+        ended = 0
+        while ended < self.embed_workers:
+            item = await stage.get()
+            if item is _DONE:
+                ended += 1
+            else:
+                pending.extend(item)
+                stats.items_in += len(item)
+
+            if pending and (len(pending) >= self.upsert_batch_size or ended == self.embed_workers):
+                started = time.monotonic()
+                await self.vector_store.upsert(pending)
+                stats.busy_seconds += time.monotonic() - started
+                stats.items_out += len(pending)
+                pending = []
+
+    async def _report(self, stats: PipelineStats) -> None:
+        while True:
+            await asyncio.sleep(self.report_interval)
+            logger.info("Ingestion pipeline progress", extra=stats.as_dict())
@@ -0,0 +1,48 @@
+import asyncio
+from datetime import datetime, timezone
+
+from app.domain.models.crawl_stats import CrawlStats
+
+
+class CrawlControl:
+    """
+    Handle for steering a running crawl from outside.
+
+    Workers call `checkpoint` before taking each URL: it blocks while the
+    crawl is paused and reports whether the crawl was cancelled. `stats`
+    is the live counter object of the crawl, `started_at` its wall-clock
+    start. A resumed crawl passes both in from its checkpoint.
+    """
+
+    def __init__(
+            self,
+            stats: CrawlStats | None = None,
+            started_at: datetime | None = None,
+    ) -> None:
+        self.stats = stats or CrawlStats()
+        self.started_at = started_at or datetime.now(timezone.utc)
+        self.cancelled = False
+        self._running = asyncio.Event()
+        self._running.set()
+
+    @property
+    def paused(self) -> bool:
+        return not self._running.is_set()
+
+    def pause(self) -> None:
+        self._running.clear()
+
+    def resume(self) -> None:
+        self._running.set()
+
+    def cancel(self) -> None:
+        self.cancelled = True
+        # Wake paused workers so they can exit.
+        self._running.set()
+
+    async def checkpoint(self) -> bool:
+        """
+        Wait while paused. Returns False once the crawl is cancelled.
+        """
+        await self._running.wait()
+        return not self.cancelled
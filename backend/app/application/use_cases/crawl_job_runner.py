@@ -0,0 +1,239 @@
+import asyncio
+import contextlib
+
+from app.application.use_cases.crawl_control import CrawlControl
+from app.application.use_cases.crawl_orchestrator import CrawlOrchestrator
+from app.core.database import Database
+from app.core.logging import logger
+from app.domain.models.crawl_job import CrawlJob
+from app.domain.models.crawl_stats import CrawlStats
+from app.domain.repositories.crawl_job_repository import CrawlJobRepository
+from app.domain.repositories.site_repository import SiteRepository
+from app.infrastructure.crawling.url_queue import UrlQueueRepository
+
+ACTIVE_STATUSES = ["running", "paused"]
+
+
+class CrawlJobRunner:
+    """
+    Runs crawls as background jobs tracked in `crawl_jobs`.
+
+    The job row is the source of truth for its status: pause, resume and
+    cancel only change the row (and the local control, if this process
+    runs the job). The reporter of the process running the job writes
+    progress every `progress_interval` seconds and applies status changes
+    made by any other API process.
+
+    The progress row doubles as the job's checkpoint. A job stopped by a
+    shutdown is marked interrupted; one whose process died stops
+    reporting and is considered abandoned after `stale_after` seconds.
+    Either kind can be resumed, by `resume` or on startup by
+    `resume_interrupted`. The new process releases the URLs leased by
+    the old one, restores the counters and drains the frontier without
+    seeding it again, so finished pages are not fetched twice.
+    """
+
+    def __init__(
+            self,
+            *,
+            db: Database,
+            orchestrator: CrawlOrchestrator,
+            job_repository: CrawlJobRepository,
+            site_repository: SiteRepository,
+            progress_interval: float = 2.0,
+            stale_after: float = 60.0,
+    ):
+        self.db = db
+        self.orchestrator = orchestrator
+        self.job_repo = job_repository
+        self.site_repo = site_repository
+        self.progress_interval = progress_interval
+        self.stale_after = stale_after
+        self._controls: dict[int, CrawlControl] = {}
+        self._tasks: dict[int, asyncio.Task] = {}
+
+    async def start(self, site_id: int, *, incremental: bool = False) -> CrawlJob | None:
+        """
+        Create a job for the site and start crawling it in the background.
+        Returns None if the site does not exist.
+        """
+        site = await self.site_repo.get(site_id)
+        if site is None:
+            return None
+
+        job = await self.job_repo.create(
+            site_id=site.id,
+            source_id=site.source_id,
+            incremental=incremental,
+            worker_id=self.orchestrator.worker_id,
+        )
+        self._launch(job, CrawlControl())
+        return job
+
+    def _launch(self, job: CrawlJob, control: CrawlControl, *, resume: bool = False) -> None:
+        self._controls[job.id] = control
+        self._tasks[job.id] = asyncio.create_task(
+            self._run(job, control, resume=resume), name=f"crawl-job-{job.id}"
+        )
+
+    async def get(self, job_id: int) -> CrawlJob | None:
+        return await self.job_repo.get(job_id)
+
+    async def pause(self, job_id: int) -> CrawlJob | None:
+        job = await self.job_repo.transition(job_id, ["running"], "paused")
+        if job and job_id in self._controls:
+            self._controls[job_id].pause()
+        return job
+
+    async def resume(self, job_id: int) -> CrawlJob | None:
+        """
+        Resume a paused job, or restart an interrupted or abandoned one.
+        """
+        job = await self.job_repo.transition(job_id, ["paused"], "running")
+        if job and job_id in self._controls:
+            self._controls[job_id].resume()
+        if job:
+            return job
+
+        job = await self._restart(job_id)
+        if job and job.status == "paused":
+            return await self.resume(job_id)
+        return job
+
+    async def resume_interrupted(self) -> list[CrawlJob]:
+        """
+        Restart every interrupted or abandoned job. Paused jobs are
+        restarted paused.
+        """
+        resumed = []
+        for job in await self.job_repo.list_resumable(self.stale_after):
+            restarted = await self._restart(job.id)
+            if restarted:
+                resumed.append(restarted)
+        return resumed
+
+    async def _restart(self, job_id: int) -> CrawlJob | None:
+        previous = await self.job_repo.get(job_id)
+        if previous is None or job_id in self._tasks:
+            return None
+
+        job = await self.job_repo.claim(job_id, self.orchestrator.worker_id, self.stale_after)
+        if job is None:
+            return None
+
+        if previous.worker_id and previous.worker_id != self.orchestrator.worker_id:
+            # The old process is gone; its leases would otherwise block
+            # those URLs until they expire.
+            released = await UrlQueueRepository(self.db).release(previous.worker_id)
+            logger.info(
+                "Released leases of interrupted crawl",
+                extra={"job_id": job_id, "worker_id": previous.worker_id, "released": released},
+            )
+
+        stats = CrawlStats(
+            pages_fetched=job.pages_fetched,
+            pages_failed=job.pages_failed,
+            pages_unchanged=job.pages_unchanged,
+            resumed_from=job.pages_fetched,
+        )
+        control = CrawlControl(stats=stats, started_at=job.started_at)
+        if job.status == "paused":
+            control.pause()
+        self._launch(job, control, resume=True)
+        logger.info("Resumed crawl job", extra={"job_id": job_id, "site_id": job.site_id})
+        return job
+
+    async def cancel(self, job_id: int) -> CrawlJob | None:
+        job = await self.job_repo.transition(
+            job_id, ["pending", "interrupted", *ACTIVE_STATUSES], "cancelled"
+        )
+        if job and job_id in self._controls:
+            self._controls[job_id].cancel()
+        return job
+
+    async def shutdown(self) -> None:
+        """
+        Stop every job run by this process. Their leases are handed back
+        and the jobs are marked interrupted, ready to be resumed.
+        """
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run(self, job: CrawlJob, control: CrawlControl, *, resume: bool = False) -> None:
+        reporter = asyncio.create_task(self._report(job, control))
+        try:
+            await self.orchestrator.crawl_site(
+                job.site_id, incremental=job.incremental, control=control, resume=resume
+            )
+        except asyncio.CancelledError:
+            await self._finish(job, control, "interrupted", error="Interrupted by shutdown")
+            raise
+        except Exception as e:
+            logger.exception("Crawl job failed", extra={"job_id": job.id})
+            await self._finish(job, control, "failed", error=str(e))
+        else:
+            # A cancelled job already has its final status.
+            await self._finish(job, control, "completed")
+        finally:
+            reporter.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await reporter
+            self._controls.pop(job.id, None)
+            self._tasks.pop(job.id, None)
+
+    async def _finish(
+            self,
+            job: CrawlJob,
+            control: CrawlControl,
+            status: str,
+            *,
+            error: str | None = None,
+    ) -> None:
+        await self._write_progress(job, control)
+        await self.job_repo.transition(job.id, ACTIVE_STATUSES, status, error=error)
+        logger.info(
+            "Crawl job finished",
+            extra={
+                "job_id": job.id,
+                "status": "cancelled" if control.cancelled else status,
+                "pages_fetched": control.stats.pages_fetched,
+            },
+        )
+
+    async def _report(self, job: CrawlJob, control: CrawlControl) -> None:
+        status = job.status
+        while True:
+            await asyncio.sleep(self.progress_interval)
+            try:
+                current = await self._write_progress(job, control)
+            except Exception:
+                logger.exception("Failed to record crawl job progress", extra={"job_id": job.id})
+                continue
+            # Only act on changes: a read that raced a local pause or
+            # resume must not undo it.
+            if current is None or current.status == status:
+                continue
+            status = current.status
+
+            if current.status == "cancelled":
+                control.cancel()
+            elif current.status == "paused":
+                control.pause()
+            elif current.status == "running":
+                control.resume()
+
+    async def _write_progress(self, job: CrawlJob, control: CrawlControl) -> CrawlJob | None:
+        stats = control.stats
+        queue_depth = await UrlQueueRepository(self.db).count_pending(job.site_id)
+        return await self.job_repo.update(
+            job.id,
+            {
+                "pages_fetched": stats.pages_fetched,
+                "pages_failed": stats.pages_failed,
+                "pages_unchanged": stats.pages_unchanged,
+                "pages_per_sec": round(stats.pages_per_sec, 2),
+                "queue_depth": queue_depth,
+            },
+        )
@@ -1,51 +1,608 @@
+import asyncio
+import contextlib
+import os
+import socket
+import time
+import uuid
+from urllib.parse import urlparse
+
+from app.core.logging import logger
+from app.application.use_cases.crawl_control import CrawlControl
+from app.domain.models.crawl_state import CrawlState
+from app.domain.models.crawl_stats import CrawlStats
+from app.domain.models.site import Site
 from app.domain.services.crawler import Crawler
 from app.infrastructure.crawling.http_fetcher import HttpFetcher
 from app.infrastructure.crawling.html_parser import HtmlParser
-from app.infrastructure.crawling.url_queue import UrlQueueRepository
+from app.infrastructure.crawling.url_queue import Completion, UrlQueueRepository
 from app.infrastructure.crawling.page_repository import PageRepository
+from app.infrastructure.crawling.politeness import (
+    PolitenessScheduler,
+    RobotsCache,
+    TokenBucket,
+)
+from app.infrastructure.crawling.seen_set import SeenUrlSet
+from app.infrastructure.crawling.simhash import SimHashIndex
+from app.infrastructure.crawling.sitemap import SitemapReader
+from app.infrastructure.crawling.url_canonicalizer import canonicalize_url
+
+# Sitemap URLs are queued in batches of this size.
+SITEMAP_SEED_BATCH = 1000
+# Sitemap URLs go ahead of URLs discovered through links.
+SITEMAP_PRIORITY = 1
+
+
+class _CrawlRun:
+    """
+    Mutable state shared by the workers of a single `crawl_site` call.
+    """
+
+    def __init__(
+            self,
+            site: Site,
+            site_id: int,
+            scheduler: PolitenessScheduler,
+            control: CrawlControl,
+            max_pages: int | None = None,
+    ):
+        self.site = site
+        self.site_id = site_id
+        # Links to other domains are not followed.
+        self.allowed_domains = site.allowed_domains or [
+            urlparse(site.start_url or site.url).netloc
+        ]
+        # Leased URLs not yet handed to a worker, queued per host.
+        self.scheduler = scheduler
+        self.control = control
+        self.stats = control.stats
+        # Upper bound on URLs leased by this run; None drains the site.
+        self.remaining = max_pages
+        # URLs already sent to the frontier, so repeats skip the DB.
+        self.seen = SeenUrlSet()
+        self.active = 0
+        # Bumped every time a worker finishes a URL, so idle workers can
+        # tell whether new links may have been queued since they looked.
+        self.generation = 0
+        self.cond = asyncio.Condition()
+        self.claim_lock = asyncio.Lock()
+        # Set while a leased batch waits for its robots.txt, outside
+        # `claim_lock`, so no other worker leases another meanwhile.
+        self.submitting = False
+        # Outcomes buffered until the next bulk write.
+        self.completed: list[Completion] = []
+        self.failed: list[tuple[str, str]] = []
+        self.flushed_at = time.monotonic()
+
 
 class CrawlOrchestrator(Crawler):
-    def __init__(self, db, site_repository):
+    """
+    Crawls a site with a pool of asyncio workers.
+
+    Workers share URLs leased in batches from the `crawl_state` frontier,
+    and outcomes are written back in batches, so a page costs a fraction
+    of a DB round-trip for queue bookkeeping. Batches are also written at
+    least every `checkpoint_interval` seconds, which bounds the work a
+    crash can lose. Concurrency is bounded by:
+    - `max_in_flight`: fetches in flight across all crawls
+    - `max_per_host`: fetches in flight against a single host
+    - `host_rate` / `host_burst`: a token bucket per host, slowed down
+      further by robots.txt `Crawl-delay`
+
+    URLs disallowed by robots.txt are marked as errors without a fetch.
+
+    Besides its start_url, a site is seeded with the URLs of its sitemaps.
+    On a recrawl, sitemap URLs whose `<lastmod>` predates the previous
+    crawl are not queued again.
+
+    Pages whose text is within `near_duplicate_distance` bits (SimHash) of
+    an already stored page of the site are flagged as its near-duplicate.
+    Each process keeps one fingerprint index per site being crawled,
+    loaded from `pages` on first use and dropped by `forget_site`.
+    """
+
+    def __init__(
+            self,
+            db,
+            site_repository,
+            *,
+            workers: int = 8,
+            max_in_flight: int = 32,
+            max_per_host: int = 4,
+            claim_batch_size: int = 32,
+            lease_seconds: int = 300,
+            checkpoint_interval: float = 5.0,
+            host_rate: float = 2.0,
+            host_burst: int = 4,
+            user_agent: str = "AuroraRAG",
+            respect_robots: bool = True,
+            robots_ttl: float = 3600.0,
+            use_sitemaps: bool = True,
+            sitemap_max_bytes: int = 50 * 1024 * 1024,
+            max_sitemaps: int = 100,
+            near_duplicate_distance: int | None = 3,
+            fetcher: HttpFetcher | None = None,
+            parser: HtmlParser | None = None,
+    ):
         self.db = db
         self.site_repo = site_repository
-        self.fetcher = HttpFetcher()
-        self.parser = HtmlParser()
+        self.fetcher = fetcher or HttpFetcher(user_agent=user_agent)
+        self.parser = parser or HtmlParser()
+        self.robots = (
+            RobotsCache(self.fetcher.client, user_agent=user_agent, ttl=robots_ttl)
+            if respect_robots
+            else None
+        )
+        self.sitemaps = (
+            SitemapReader(
+                self.fetcher.client,
+                robots=self.robots,
+                max_bytes=sitemap_max_bytes,
+                max_sitemaps=max_sitemaps,
+            )
+            if use_sitemaps
+            else None
+        )
+        # None disables near-duplicate detection.
+        self.near_duplicate_distance = near_duplicate_distance
+        self._simhash_indexes: dict[int, SimHashIndex] = {}
+        self._simhash_lock = asyncio.Lock()
+        self.host_rate = host_rate
+        self.host_burst = host_burst
+        # Shared by every run so a host's rate limit holds across crawls.
+        self._host_buckets: dict[str, TokenBucket] = {}
+        self.workers = workers
+        self.max_per_host = max_per_host
+        self.claim_batch_size = claim_batch_size
+        self.lease_seconds = lease_seconds
+        self.checkpoint_interval = checkpoint_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+
+    async def crawl_site(
+            self,
+            site_id: int,
+            *,
+            incremental: bool = False,
+            control: CrawlControl | None = None,
+            resume: bool = False,
+    ) -> None:
+        """
+        With `resume`, the frontier is not seeded again: the crawl carries
+        on with the URLs left pending by an interrupted run.
+        """
+        control = control or CrawlControl()
+        try:
+            if not resume:
+                await self.seed_site(site_id, recrawl=incremental)
+            await self.drain_site(site_id, control=control)
+        finally:
+            self.forget_site(site_id)
+        if not control.cancelled:
+            await self.site_repo.update(site_id, {"last_crawled_at": control.started_at})
+            await self.sweep_page_blobs()
+
+    async def sweep_page_blobs(self) -> int:
+        """
+        Delete the page bodies that pages changed during a crawl left
+        unreferenced. A failure is logged; the next crawl retries.
+        """
+        try:
+            deleted = await PageRepository(self.db).delete_orphan_blobs()
+        except Exception:
+            logger.exception("Page blob sweep failed")
+            return 0
+        if deleted:
+            logger.info("Deleted orphaned page blobs", extra={"deleted": deleted})
+        return deleted
+
+    def forget_site(self, site_id: int) -> None:
+        """
+        Drop what this process keeps about a site between calls to
+        `drain_site`, once its crawl is over.
+        """
+        self._simhash_indexes.pop(site_id, None)
+
+    async def seed_site(self, site_id: int, *, recrawl: bool = False) -> Site | None:
+        """
+        Seed the frontier with the site's start_url and sitemaps.
+
+        With `recrawl`, previously crawled URLs are queued again. They are
+        fetched conditionally, and pages that did not change are neither
+        rewritten nor parsed again. When the site has a sitemap, only the
+        URLs it reports as changed since the last crawl are queued again.
+        """
+        site = await self.site_repo.get(site_id)
+        if site is None:
+            return None
+
+        queue = UrlQueueRepository(self.db)
+        start_url = site.start_url or site.url
+        start_url = canonicalize_url(start_url) or start_url
+
+        # Queued before the sitemap walk, which can take long: a crawl
+        # interrupted during it resumes without seeding again, and must
+        # still have its start URL.
+        if recrawl:
+            await queue.requeue_urls(site_id, [start_url])
+        else:
+            await queue.add_url(site_id, start_url)
+
+        seeded = await self._seed_sitemaps(site, start_url, queue, recrawl=recrawl)
+        if recrawl and not seeded:
+            await queue.requeue_site(site_id)
+        return site
+
+    async def request_seed(self, site_id: int, *, recrawl: bool = False) -> None:
+        """
+        Leave `seed_site` to the crawl workers: the first free one seeds the
+        frontier, then they all drain it.
+        """
+        await UrlQueueRepository(self.db).request_seed(site_id, recrawl=recrawl)
+
+    async def _seed_sitemaps(
+            self,
+            site: Site,
+            start_url: str,
+            queue: UrlQueueRepository,
+            *,
+            recrawl: bool,
+    ) -> int:
+        """
+        Queue the URLs listed in the site's sitemaps. Returns how many
+        sitemap URLs were found, 0 when the site has no usable sitemap.
+        """
+        if self.sitemaps is None:
+            return 0
+
+        allowed_domains = site.allowed_domains or [urlparse(start_url).netloc]
+        since = site.last_crawled_at if recrawl else None
+        changed: list[str] = []
+        unchanged: list[str] = []
+        found = 0
+
+        async def flush() -> None:
+            if recrawl:
+                await queue.requeue_urls(site.id, changed, priority=SITEMAP_PRIORITY)
+            else:
+                await queue.add_urls(site.id, changed, priority=SITEMAP_PRIORITY)
+            # Unchanged pages are only queued if the frontier never saw them.
+            await queue.add_urls(site.id, unchanged, priority=SITEMAP_PRIORITY)
+            changed.clear()
+            unchanged.clear()
+
+        sitemap_urls = await self.sitemaps.discover(start_url)
+        async for entry in self.sitemaps.entries(sitemap_urls):
+            url = canonicalize_url(entry.url)
+            if url is None or not urlparse(url).netloc.endswith(tuple(allowed_domains)):
+                continue
+
+            found += 1
+            if since and entry.lastmod and entry.lastmod <= since:
+                unchanged.append(url)
+            else:
+                changed.append(url)
+            if len(changed) + len(unchanged) >= SITEMAP_SEED_BATCH:
+                await flush()
+        await flush()
+
+        if found:
+            logger.info(
+                "Seeded frontier from sitemaps",
+                extra={"site_id": site.id, "urls": found, "sitemaps": sitemap_urls},
+            )
+        return found
+
+    async def drain_site(
+            self,
+            site_id: int,
+            *,
+            max_pages: int | None = None,
+            control: CrawlControl | None = None,
+    ) -> CrawlStats:
+        """
+        Crawl claimable URLs of a site until none are left, or until
+        `max_pages` URLs have been leased by this call.
+
+        `control` lets the caller pause, resume or cancel the crawl and
+        watch its live stats.
+
+        Other processes may work on the same site concurrently; the
+        frontier leases keep them from fetching the same URL.
+        """
+        site = await self.site_repo.get(site_id)
+        if site is None:
+            return CrawlStats()
 
-    async def crawl_site(self, site_id: str) -> None:
-        site = await self.site_repo.get_site(site_id)
         queue = UrlQueueRepository(self.db)
         pages = PageRepository(self.db)
 
-        # Seed the queue with the start_url
-        await queue.add_url(site_id, site.start_url)
+        scheduler = PolitenessScheduler(
+            robots=self.robots,
+            buckets=self._host_buckets,
+            rate=self.host_rate,
+            burst=self.host_burst,
+            max_per_host=self.max_per_host,
+        )
+        run = _CrawlRun(site, site_id, scheduler, control or CrawlControl(), max_pages)
+        heartbeat = asyncio.create_task(self._heartbeat(queue))
+        try:
+            await asyncio.gather(
+                *(self._worker(run, queue, pages) for _ in range(self.workers))
+            )
+        finally:
+            heartbeat.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await heartbeat
+            await self._flush(run, queue)
+            # URLs leased but never started (cancelled or failed run).
+            await queue.release_batch([state.id for state in scheduler.drain()])
+
+        logger.info(
+            "Crawl finished",
+            extra={
+                "site_id": site_id,
+                "pages_fetched": run.stats.pages_fetched,
+                "pages_failed": run.stats.pages_failed,
+                "pages_unchanged": run.stats.pages_unchanged,
+                "pages_duplicate": run.stats.pages_duplicate,
+                "pages_per_sec": round(run.stats.pages_per_sec, 2),
+                "seen_urls": len(run.seen),
+                "seen_set_bytes": run.seen.memory_bytes,
+            },
+        )
+        return run.stats
+
+    async def _heartbeat(self, queue: UrlQueueRepository) -> None:
+        """
+        Keep the leases of this process alive, including those of URLs
+        waiting for their host or for a paused crawl to resume.
+        """
+        interval = max(self.lease_seconds / 3, 1)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await queue.heartbeat(self.worker_id, self.lease_seconds)
+            except Exception:
+                logger.exception("Crawl lease heartbeat failed", extra={"worker_id": self.worker_id})
 
+    async def _worker(
+            self,
+            run: _CrawlRun,
+            queue: UrlQueueRepository,
+            pages: PageRepository,
+    ) -> None:
         while True:
-            state = await queue.get_next_pending(site_id)
-            if not state:
-                break
+            if run.control.paused:
+                await self._flush(run, queue)
+            if not await run.control.checkpoint():
+                return
 
-            status, html = await self.fetcher.fetch(state.url)
+            generation = run.generation
+            state = await self._next_state(run, queue)
 
-            if status != 200 or html is None:
-                await queue.mark_error(state.id, f"HTTP status: {status}")
+            if state is None:
+                await self._flush(run, queue)
+                async with run.cond:
+                    if run.generation != generation:
+                        continue
+                    if run.active == 0:
+                        # Nothing pending and nobody left who could add more.
+                        return
+                    await run.cond.wait()
                 continue
 
-            await pages.upsert_page(site_id, state.url, html)
-            await queue.mark_success(state.id)
+            run.active += 1
+            try:
+                await self._process(run, state, queue, pages)
+            except Exception as err:
+                run.stats.pages_failed += 1
+                logger.exception("Crawl worker failed", extra={"url": state.url})
+                run.failed.append((state.id, str(err)))
+            finally:
+                async with run.cond:
+                    run.active -= 1
+                    run.generation += 1
+                    run.cond.notify_all()
+
+            if (
+                len(run.completed) + len(run.failed) >= self.claim_batch_size
+                or time.monotonic() - run.flushed_at >= self.checkpoint_interval
+            ):
+                await self._flush(run, queue)
+
+    async def _next_state(
+            self,
+            run: _CrawlRun,
+            queue: UrlQueueRepository,
+    ) -> CrawlState | None:
+        """
+        Next URL whose host is ready, leasing a new batch once the local
+        buffer runs dry. Returns None when neither holds any URL.
+        """
+        scheduler = run.scheduler
+        while True:
+            claimed: list[CrawlState] = []
+            async with run.claim_lock:
+                if not scheduler.pending and not run.submitting and run.remaining != 0:
+                    claimed = await self._claim(run, queue)
+                    run.submitting = bool(claimed)
+
+                state = scheduler.pop_ready()
+                if state is not None or not (scheduler.pending or run.submitting):
+                    return state
+                delay = scheduler.next_ready_in()
+
+            if claimed:
+                try:
+                    await self._submit(run, claimed)
+                finally:
+                    run.submitting = False
+                    scheduler.notify()
+                continue
+            await scheduler.wait(delay)
+
+    async def _claim(self, run: _CrawlRun, queue: UrlQueueRepository) -> list[CrawlState]:
+        n = self.claim_batch_size
+        if run.remaining is not None:
+            n = min(n, run.remaining)
+
+        claimed = await queue.claim_batch(
+            run.site_id,
+            n,
+            worker_id=self.worker_id,
+            lease_seconds=self.lease_seconds,
+        )
+        if run.remaining is not None:
+            run.remaining -= len(claimed)
+        return claimed
 
-            # Extract links
-            new_links = self.parser.extract_links(
-                html,
-                base_url=state.url,
-                allowed_domains=site.allowed_domains
+    async def _submit(self, run: _CrawlRun, claimed: list[CrawlState]) -> None:
+        """
+        Hand leased URLs to the scheduler, once robots.txt of their hosts
+        is cached.
+        """
+        if self.robots is not None:
+            await self.robots.prefetch([state.url for state in claimed])
+
+        for state in claimed:
+            if not await run.scheduler.submit(state):
+                run.stats.pages_failed += 1
+                run.failed.append((state.id, "Disallowed by robots.txt"))
+
+    async def _flush(self, run: _CrawlRun, queue: UrlQueueRepository) -> None:
+        completed, run.completed = run.completed, []
+        failed, run.failed = run.failed, []
+        run.flushed_at = time.monotonic()
+        # A failure overrides a completion of the same URL.
+        failed_ids = {state_id for state_id, _ in failed}
+        await queue.fail_batch(failed, worker_id=self.worker_id)
+        await queue.complete_batch(
+            [c for c in completed if c.state_id not in failed_ids],
+            worker_id=self.worker_id,
+        )
+
+    async def _process(
+            self,
+            run: _CrawlRun,
+            state: CrawlState,
+            queue: UrlQueueRepository,
+            pages: PageRepository,
+    ) -> None:
+        try:
+            async with self._in_flight:
+                result = await self.fetcher.fetch(
+                    state.url,
+                    etag=state.etag,
+                    last_modified=state.last_modified,
+                )
+        finally:
+            run.scheduler.release(state.url)
+
+        if result.not_modified:
+            run.stats.pages_unchanged += 1
+            run.completed.append(
+                Completion(state.id, result.etag, result.last_modified)
+            )
+            return
+
+        html = result.text
+        if result.status != 200 or html is None:
+            run.stats.pages_failed += 1
+            run.failed.append(
+                (state.id, result.error or f"HTTP status: {result.status}")
+            )
+            return
+
+        checksum = pages.compute_checksum(html)
+        completion = Completion(state.id, result.etag, result.last_modified, checksum)
+        if checksum == state.checksum:
+            # Same content as last crawl: nothing to store or parse.
+            run.stats.pages_unchanged += 1
+            run.completed.append(completion)
+            return
+
+        # Links, title, text and its fingerprint in a single parse.
+        # Relative links resolve against where the page was served from,
+        # not the frontier key.
+        analysis = await self.parser.analyze_async(
+            html,
+            base_url=result.url or state.url,
+            allowed_domains=run.allowed_domains,
+        )
+
+        duplicate_of = await self._near_duplicate(run, pages, state.url, analysis.simhash)
+        await pages.upsert_page(
+            run.site_id,
+            state.url,
+            html,
+            checksum,
+            simhash=analysis.simhash,
+            duplicate_of=duplicate_of,
+        )
+        run.stats.pages_fetched += 1
+        if duplicate_of:
+            run.stats.pages_duplicate += 1
+
+        max_depth = run.site.max_depth
+        # Beyond the site's crawl depth, the page is stored but not its links.
+        if max_depth is None or state.depth < max_depth:
+            unseen = [link for link in analysis.links if run.seen.add(link)]
+            run.stats.links_discovered += await queue.add_urls(
+                run.site_id,
+                unseen,
+                depth=state.depth + 1,
+                parent_url=state.url,
             )
 
-            for link in new_links:
-                await queue.add_url(site_id, link)
+        # Only now: a completion records the checksum, and a page recorded
+        # with the checksum of a page that was never stored would be
+        # skipped as unchanged by every later recrawl.
+        run.completed.append(completion)
+
+    async def _near_duplicate(
+            self,
+            run: _CrawlRun,
+            pages: PageRepository,
+            url: str,
+            fingerprint: int | None,
+    ) -> str | None:
+        """
+        URL of a stored page whose text is a near-duplicate of this one.
+        Pages that are not duplicates join the index.
+        """
+        distance = self.near_duplicate_distance
+        if distance is None or fingerprint is None:
+            return None
+
+        index = await self._simhash_index(run.site.id, pages, distance)
+        duplicate_of = index.find(fingerprint, exclude=url)
+        if duplicate_of is None:
+            index.add(url, fingerprint)
+        else:
+            # It may have been an original on a previous crawl.
+            index.remove(url)
+        return duplicate_of
+
+    async def _simhash_index(
+            self,
+            site_id: int,
+            pages: PageRepository,
+            distance: int,
+    ) -> SimHashIndex:
+        index = self._simhash_indexes.get(site_id)
+        if index is not None:
+            return index
 
+        async with self._simhash_lock:
+            if site_id not in self._simhash_indexes:
+                index = SimHashIndex(distance)
+                for url, fingerprint in await pages.get_simhashes(site_id):
+                    index.add(url, fingerprint)
+                self._simhash_indexes[site_id] = index
+            return self._simhash_indexes[site_id]
 
     async def submit_site(self, url: str):
         site = await self.site_repo.get_by_url(url)
         if not site:
             site = await self.site_repo.create(url)
-        return site
\ No newline at end of file
+        return site
@@ -0,0 +1,150 @@
+import asyncio
+import contextlib
+
+from app.core.logging import logger
+from app.application.use_cases.crawl_orchestrator import CrawlOrchestrator
+from app.infrastructure.crawling.url_queue import UrlQueueRepository
+
+
+class CrawlWorker:
+    """
+    Long-running crawl worker.
+
+    Any number of workers, in any number of processes or hosts, can run
+    against the same Postgres frontier:
+    - crawls queued by the API are seeded by the first free worker
+    - URLs are owned through leases taken by `claim_batch`
+    - heartbeats keep this worker's leases alive while it runs
+    - leases of dead workers expire and are reclaimed
+    - sites are served round-robin, at most `site_quantum` URLs at a time,
+      so one large site cannot starve the others
+    - the worker that finds a site's frontier drained records the crawl
+      as finished, in `last_crawled_at`
+    """
+
+    def __init__(
+            self,
+            *,
+            db,
+            crawler: CrawlOrchestrator,
+            site_quantum: int = 200,
+            poll_interval: float = 5.0,
+    ):
+        self.db = db
+        self.crawler = crawler
+        self.queue = UrlQueueRepository(db)
+        self.site_quantum = site_quantum
+        self.poll_interval = poll_interval
+        self._last_site_id: int | None = None
+
+    @property
+    def worker_id(self) -> str:
+        return self.crawler.worker_id
+
+    async def run(self, stop: asyncio.Event) -> None:
+        logger.info("Crawl worker started", extra={"worker_id": self.worker_id})
+        heartbeat = asyncio.create_task(self._heartbeat(stop))
+        try:
+            while not stop.is_set():
+                if await self._seed_next():
+                    continue
+
+                site_id = await self._next_site()
+                if site_id is None:
+                    with contextlib.suppress(asyncio.TimeoutError):
+                        await asyncio.wait_for(stop.wait(), self.poll_interval)
+                    continue
+
+                try:
+                    await self._serve(site_id)
+                except Exception:
+                    logger.exception("Crawling site failed", extra={"site_id": site_id})
+                    await self._release(site_id)
+                    # Most likely the database: let it recover.
+                    with contextlib.suppress(asyncio.TimeoutError):
+                        await asyncio.wait_for(stop.wait(), self.poll_interval)
+        finally:
+            heartbeat.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await heartbeat
+            released = await self.queue.release(self.worker_id)
+            logger.info(
+                "Crawl worker stopped",
+                extra={"worker_id": self.worker_id, "released": released},
+            )
+
+    async def _seed_next(self) -> bool:
+        """
+        Seed the frontier of the oldest queued crawl, if any. A failed
+        seeding is retried once its lease expires.
+        """
+        seed = await self.queue.claim_seed(self.worker_id, self.crawler.lease_seconds)
+        if seed is None:
+            return False
+
+        site_id, recrawl = seed
+        try:
+            await self.crawler.seed_site(site_id, recrawl=recrawl)
+        except Exception:
+            logger.exception("Seeding crawl failed", extra={"site_id": site_id})
+            return True
+        await self.queue.finish_seed(site_id, self.worker_id)
+        logger.info("Seeded crawl", extra={"site_id": site_id, "recrawl": recrawl})
+        return True
+
+    async def _serve(self, site_id: int) -> None:
+        """
+        Crawl up to `site_quantum` URLs of the site, and record its crawl
+        as finished once its frontier is drained.
+        """
+        await self.crawler.drain_site(site_id, max_pages=self.site_quantum)
+        if not await self.queue.count_pending(site_id):
+            self.crawler.forget_site(site_id)
+            # The next recrawl filters sitemaps on this crawl's start.
+            if await self.crawler.site_repo.finish_crawl(site_id):
+                await self.crawler.sweep_page_blobs()
+
+    async def _release(self, site_id: int) -> None:
+        """
+        Hand the site's URLs to other workers now rather than when their
+        leases expire.
+        """
+        try:
+            await self.queue.release_site(site_id, self.worker_id)
+        except Exception:
+            logger.exception("Releasing site leases failed", extra={"site_id": site_id})
+
+    async def _next_site(self) -> int | None:
+        """
+        Pick the site after the one served last, wrapping around.
+        """
+        site_ids = await self.queue.sites_with_work()
+        if not site_ids:
+            return None
+
+        if self._last_site_id is not None:
+            later = [s for s in site_ids if s > self._last_site_id]
+            site_id = later[0] if later else site_ids[0]
+        else:
+            site_id = site_ids[0]
+
+        self._last_site_id = site_id
+        return site_id
+
+    async def _heartbeat(self, stop: asyncio.Event) -> None:
+        interval = max(self.crawler.lease_seconds / 3, 1)
+        while not stop.is_set():
+            try:
+                # URL leases are kept alive by `drain_site` itself.
+                await self.queue.heartbeat_seeds(self.worker_id, self.crawler.lease_seconds)
+                reclaimed = await self.queue.reclaim_expired()
+                if reclaimed:
+                    logger.info(
+                        "Reclaimed expired crawl leases",
+                        extra={"worker_id": self.worker_id, "reclaimed": reclaimed},
+                    )
+            except Exception:
+                logger.exception("Crawl worker heartbeat failed")
+
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(stop.wait(), interval)
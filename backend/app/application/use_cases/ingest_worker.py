@@ -0,0 +1,167 @@
+import asyncio
+import contextlib
+import os
+import random
+import socket
+import uuid
+
+from app.core.logging import logger
+from app.application.ingestion.artifact_ingestor import ArtifactIngestor
+from app.application.ingestion.extraction_service import UnsupportedArtifactError
+from app.domain.models.artifact import Artifact
+from app.infrastructure.ingestion.artifact_queue import ArtifactQueueRepository
+
+
+class IngestWorker:
+    """
+    Pool of async workers draining the artifact ingestion queue.
+
+    `workers` bounds how many artifacts this process ingests at once.
+    Any number of pools, in the API process or in standalone
+    `python -m app.workers.ingest` processes, can share the queue:
+    - artifacts are owned through leases taken with `SKIP LOCKED`
+    - a heartbeat keeps this pool's leases alive while it runs
+    - leases of dead workers expire and are reclaimed
+    - failed attempts are retried with exponential backoff and jitter,
+      up to `max_attempts`; unsupported artifacts fail at once
+    """
+
+    def __init__(
+            self,
+            *,
+            queue: ArtifactQueueRepository,
+            ingestor: ArtifactIngestor,
+            workers: int = 4,
+            max_attempts: int = 5,
+            retry_base: float = 2.0,
+            retry_max: float = 300.0,
+            lease_seconds: int = 300,
+            poll_interval: float = 2.0,
+    ):
+        self.queue = queue
+        self.ingestor = ingestor
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._wakeup = asyncio.Event()
+        self._stop: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+
+    def notify(self) -> None:
+        """
+        Wake idle workers, e.g. right after an artifact was queued.
+        """
+        self._wakeup.set()
+
+    def start(self) -> None:
+        """
+        Run the pool in the background of the current event loop.
+        """
+        if self._task is None:
+            self._stop = asyncio.Event()
+            self._task = asyncio.create_task(self.run(self._stop), name="ingest-worker")
+
+    async def stop(self) -> None:
+        if self._task is None or self._stop is None:
+            return
+        self._stop.set()
+        self.notify()
+        await self._task
+        self._task = None
+
+    async def run(self, stop: asyncio.Event) -> None:
+        logger.info(
+            "Ingest worker started",
+            extra={"worker_id": self.worker_id, "workers": self.workers},
+        )
+        heartbeat = asyncio.create_task(self._heartbeat(stop))
+        try:
+            await asyncio.gather(*(self._work(stop) for _ in range(self.workers)))
+        finally:
+            heartbeat.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await heartbeat
+            released = await self.queue.release(self.worker_id)
+            logger.info(
+                "Ingest worker stopped",
+                extra={"worker_id": self.worker_id, "released": released},
+            )
+
+    async def _work(self, stop: asyncio.Event) -> None:
+        while not stop.is_set():
+            # Cleared before claiming, so an artifact queued meanwhile
+            # is either claimed now or wakes this worker.
+            self._wakeup.clear()
+            try:
+                claimed = await self.queue.claim_batch(
+                    1, worker_id=self.worker_id, lease_seconds=self.lease_seconds
+                )
+            except Exception:
+                logger.exception("Failed to claim artifacts")
+                claimed = []
+
+            if not claimed:
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                continue
+
+            await self._process(claimed[0])
+
+    async def _process(self, artifact: Artifact) -> None:
+        try:
+            metadata = await self.ingestor.ingest(artifact)
+        except UnsupportedArtifactError as e:
+            logger.warning(
+                "Artifact cannot be ingested",
+                extra={"artifact_id": artifact.id, "error": str(e)},
+            )
+            await self.queue.fail(artifact.id, str(e), worker_id=self.worker_id)
+            return
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            if artifact.attempts >= self.max_attempts:
+                logger.exception(
+                    "Artifact ingestion failed",
+                    extra={"artifact_id": artifact.id, "attempts": artifact.attempts},
+                )
+                await self.queue.fail(artifact.id, error, worker_id=self.worker_id)
+            else:
+                delay = self._backoff(artifact.attempts)
+                logger.warning(
+                    "Artifact ingestion failed, will retry",
+                    extra={"artifact_id": artifact.id, "attempts": artifact.attempts, "delay": delay},
+                )
+                await self.queue.retry(artifact.id, error, delay, worker_id=self.worker_id)
+            return
+
+        if not await self.queue.complete(artifact.id, metadata, worker_id=self.worker_id):
+            # Reclaimed after our lease expired; the new owner records it.
+            logger.warning(
+                "Artifact lease lost before ingestion finished",
+                extra={"artifact_id": artifact.id, "worker_id": self.worker_id},
+            )
+            return
+        logger.info(
+            "Ingested artifact",
+            extra={"artifact_id": artifact.id, **metadata},
+        )
+
+    def _backoff(self, attempts: int) -> float:
+        delay = min(self.retry_max, self.retry_base * 2 ** (attempts - 1))
+        # Jitter, so artifacts failing together do not retry together.
+        return random.uniform(delay / 2, delay)
+
+    async def _heartbeat(self, stop: asyncio.Event) -> None:
+        interval = max(self.lease_seconds / 3, 1)
+        while not stop.is_set():
+            try:
+                await self.queue.heartbeat(self.worker_id, self.lease_seconds)
+            except Exception:
+                logger.exception("Ingest worker heartbeat failed")
+
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(stop.wait(), interval)
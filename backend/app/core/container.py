@@ -2,14 +2,22 @@
 # DI container
 # --------------------------------
 
+from concurrent.futures import ProcessPoolExecutor
 from functools import lru_cache
 
 from app.core.settings import settings
 from app.infrastructure.vector.dummy_retriever import DummyRetriever
 from app.domain.services.retriever import Retriever
 from app.infrastructure.vector.dummy_embedding_provider import DummyEmbeddingProvider
+from app.infrastructure.vector.in_memory_vector_store import InMemoryVectorStore
+from app.domain.services.vector_store import VectorStore
+from app.infrastructure.vector.cached_embedding_provider import CachedEmbeddingProvider
+from app.infrastructure.vector.sqlite_embedding_cache import SqliteEmbeddingCache
 from app.domain.services.embedding_provider import EmbeddingProvider
 from app.application.use_cases.crawl_orchestrator import CrawlOrchestrator
+from app.application.use_cases.crawl_job_runner import CrawlJobRunner
+from app.infrastructure.crawling.http_fetcher import HttpFetcher
+from app.infrastructure.crawling.html_parser import HtmlParser
 from app.domain.services.crawler import Crawler
 from app.core.database import Database
 
@@ -18,6 +26,8 @@ from app.domain.repositories.site_repository import SiteRepository
 from app.infrastructure.repositories.postgres_site_repository import PostgresSiteRepository
 from app.domain.repositories.source_repository import SourceRepository
 from app.infrastructure.repositories.postgres_source_repository import PostgresSourceRepository
+from app.domain.repositories.crawl_job_repository import CrawlJobRepository
+from app.infrastructure.repositories.postgres_crawl_job_repository import PostgresCrawlJobRepository
 
 # Source Handlers
 from app.application.ingestion.ingestion_coordinator import IngestionCoordinator
@@ -26,9 +36,21 @@ from app.infrastructure.ingestion.handlers.web_source_handler import WebSourceHa
 
 # Artifact Handlers
 from app.application.artifacts.artifact_service import ArtifactService
+from app.infrastructure.uploads.upload_session_store import UploadSessionStore
+from app.infrastructure.uploads.archive_expander import ArchiveExpander
+from app.infrastructure.uploads.blob_store import BlobStore
+from app.application.artifacts.blob_sweeper import BlobSweeper
 from app.domain.ingestion.artifact_handler import ArtifactHandler
-from app.infrastructure.ingestion.handlers.noop_artifact_handler import NoOpArtifactHandler
+from app.infrastructure.ingestion.handlers.queued_artifact_handler import QueuedArtifactHandler
+from app.infrastructure.ingestion.artifact_queue import ArtifactQueueRepository
 from app.infrastructure.repositories.postgres_artifact_repository import PostgresArtifactRepository
+from app.application.ingestion.artifact_ingestor import ArtifactIngestor
+from app.application.ingestion.extraction_service import ExtractionService
+from app.infrastructure.ingestion.handlers.noop_artifact_handler import NoOpArtifactHandler
+from app.application.ingestion.pipeline import IngestionPipeline
+from app.infrastructure.chunking.character_chunker import CharacterChunker
+from app.infrastructure.chunking.token_chunker import TokenChunker
+from app.application.use_cases.ingest_worker import IngestWorker
 
 
 class Container:
@@ -40,27 +62,154 @@ class Container:
         self._site_repository = PostgresSiteRepository(self._db)
         self._source_repository = PostgresSourceRepository(self._db)
         self._artifact_repository = PostgresArtifactRepository(self._db)
+        self._crawl_job_repository = PostgresCrawlJobRepository(self._db)
         # source handlers
         self._web_source_handler = WebSourceHandler(
             site_repo = self._site_repository
         )
         # artifact handler
+        self._blob_store = BlobStore(settings.upload_dir)
+        self._blob_sweeper = BlobSweeper(
+            blob_store=self._blob_store,
+            artifact_repo=self._artifact_repository,
+            interval=settings.upload_gc_interval,
+            grace=settings.upload_gc_grace,
+            batch_size=settings.upload_gc_batch_size,
+        )
         self._artifact_service = ArtifactService(
             artifact_repo=self._artifact_repository,
             upload_root=settings.upload_dir,
+            blob_store=self._blob_store,
+            archive_expander=ArchiveExpander(
+                max_members=settings.upload_archive_max_members,
+                max_bytes=settings.upload_archive_max_bytes,
+            ),
+        )
+        self._upload_sessions = UploadSessionStore(
+            settings.upload_dir,
+            ttl=settings.upload_session_ttl,
         )
-        self._noop_artifact_handler = NoOpArtifactHandler()
         # crawlers
-        self._crawl_orchestrator = CrawlOrchestrator(db=self._db, site_repository=self._site_repository)
+        self._http_fetcher = HttpFetcher(
+            timeout=settings.crawl_timeout,
+            user_agent=settings.crawl_user_agent,
+            max_body_bytes=settings.crawl_max_body_bytes,
+            content_types=tuple(settings.crawl_content_types),
+            max_connections=settings.crawl_max_connections,
+            max_keepalive_connections=settings.crawl_max_keepalive_connections,
+            keepalive_expiry=settings.crawl_keepalive_expiry,
+            http2=settings.crawl_http2,
+        )
+        self._html_parser = HtmlParser(
+            executor=ProcessPoolExecutor(settings.crawl_parser_processes)
+            if settings.crawl_parser_processes > 0
+            else None
+        )
+        self._crawl_orchestrator = CrawlOrchestrator(
+            db=self._db,
+            site_repository=self._site_repository,
+            workers=settings.crawl_workers,
+            max_in_flight=settings.crawl_max_in_flight,
+            max_per_host=settings.crawl_max_per_host,
+            claim_batch_size=settings.crawl_claim_batch_size,
+            lease_seconds=settings.crawl_lease_seconds,
+            checkpoint_interval=settings.crawl_checkpoint_interval,
+            host_rate=settings.crawl_host_rate,
+            host_burst=settings.crawl_host_burst,
+            user_agent=settings.crawl_user_agent,
+            respect_robots=settings.crawl_respect_robots,
+            robots_ttl=settings.crawl_robots_ttl,
+            use_sitemaps=settings.crawl_use_sitemaps,
+            sitemap_max_bytes=settings.crawl_sitemap_max_bytes,
+            max_sitemaps=settings.crawl_max_sitemaps,
+            near_duplicate_distance=settings.crawl_near_duplicate_distance
+            if settings.crawl_near_duplicate_distance >= 0
+            else None,
+            fetcher=self._http_fetcher,
+            parser=self._html_parser,
+        )
+        self._crawl_job_runner = CrawlJobRunner(
+            db=self._db,
+            orchestrator=self._crawl_orchestrator,
+            job_repository=self._crawl_job_repository,
+            site_repository=self._site_repository,
+            progress_interval=settings.crawl_job_progress_interval,
+            stale_after=settings.crawl_job_stale_after,
+        )
         # embedder
         self._embedding_provider = DummyEmbeddingProvider()
+        self._embedding_cache: CachedEmbeddingProvider | None = None
+        if settings.embedding_cache_enabled:
+            self._embedding_cache = CachedEmbeddingProvider(
+                self._embedding_provider,
+                model=settings.embedding_model,
+                max_bytes=settings.embedding_cache_max_bytes,
+                store=SqliteEmbeddingCache(
+                    settings.embedding_cache_path,
+                    max_rows=settings.embedding_cache_max_rows,
+                )
+                if settings.embedding_cache_path
+                else None,
+            )
+            self._embedding_provider = self._embedding_cache
+        # vector store
+        self._vector_store = InMemoryVectorStore()
+        # artifact ingestion
+        self._ingestion_pipeline = IngestionPipeline(
+            chunker=TokenChunker(
+                max_tokens=settings.ingest_chunk_tokens,
+                overlap=settings.ingest_chunk_overlap_tokens,
+            )
+            if settings.ingest_chunker == "token"
+            else CharacterChunker(
+                size=settings.ingest_chunk_size,
+                overlap=settings.ingest_chunk_overlap,
+            ),
+            chunk_batch_size=settings.ingest_chunk_batch_size,
+            embedding_provider=self._embedding_provider,
+            vector_store=self._vector_store,
+            embed_batch_size=settings.ingest_embed_batch_size,
+            embed_workers=settings.ingest_embed_workers,
+            upsert_batch_size=settings.ingest_upsert_batch_size,
+            queue_size=settings.ingest_queue_size,
+        )
+        self._extraction_service = ExtractionService(
+            max_workers=settings.ingest_extract_workers,
+            max_bytes=settings.ingest_extract_max_bytes,
+        )
+        self._artifact_queue = ArtifactQueueRepository(self._db)
+        self._ingest_worker = IngestWorker(
+            queue=self._artifact_queue,
+            ingestor=ArtifactIngestor(
+                pipeline=self._ingestion_pipeline,
+                extraction=self._extraction_service,
+            ),
+            workers=settings.ingest_workers,
+            max_attempts=settings.ingest_max_attempts,
+            retry_base=settings.ingest_retry_base,
+            retry_max=settings.ingest_retry_max,
+            lease_seconds=settings.ingest_lease_seconds,
+            poll_interval=settings.ingest_poll_interval,
+        )
+        self._queued_artifact_handler = QueuedArtifactHandler(
+            self._artifact_queue,
+            # Only a pool in this process can be woken directly.
+            on_enqueued=self._ingest_worker.notify
+            if settings.ingest_mode == "inline"
+            else None,
+        )
         # Ingestion Coordinator
         self._ingestion_coordinator = IngestionCoordinator(
             source_handlers={
                 "web": self._web_source_handler,
             },
             artifact_handlers={
-                "*": self._noop_artifact_handler
+                **{
+                    pattern: self._queued_artifact_handler
+                    for pattern in self._extraction_service.extractors.patterns()
+                },
+                # No text can be extracted from anything else.
+                "*": NoOpArtifactHandler(),
             }
         )
         # retriever
@@ -79,10 +228,38 @@ class Container:
     def embedding_provider(self) -> EmbeddingProvider:
         return self._embedding_provider
 
+    @property
+    def embedding_cache(self) -> CachedEmbeddingProvider | None:
+        return self._embedding_cache
+
+    @property
+    def vector_store(self) -> VectorStore:
+        return self._vector_store
+
+    @property
+    def ingestion_pipeline(self) -> IngestionPipeline:
+        return self._ingestion_pipeline
+
+    @property
+    def http_fetcher(self) -> HttpFetcher:
+        return self._http_fetcher
+
+    @property
+    def html_parser(self) -> HtmlParser:
+        return self._html_parser
+
     @property
     def crawl_orchestrator(self) -> Crawler:
         return self._crawl_orchestrator
 
+    @property
+    def crawl_job_runner(self) -> CrawlJobRunner:
+        return self._crawl_job_runner
+
+    @property
+    def crawl_job_repository(self) -> CrawlJobRepository:
+        return self._crawl_job_repository
+
     @property
     def site_repository(self) -> SiteRepository:
         return self._site_repository
@@ -99,6 +276,22 @@ class Container:
     def artifact_service(self) -> ArtifactService:
         return self._artifact_service
 
+    @property
+    def blob_sweeper(self) -> BlobSweeper:
+        return self._blob_sweeper
+
+    @property
+    def upload_sessions(self) -> UploadSessionStore:
+        return self._upload_sessions
+
+    @property
+    def extraction_service(self) -> ExtractionService:
+        return self._extraction_service
+
+    @property
+    def ingest_worker(self) -> IngestWorker:
+        return self._ingest_worker
+
 @lru_cache
 def get_container():
     return Container(settings)
\ No newline at end of file
@@ -18,9 +18,102 @@ class Settings(BaseSettings):
 
     # Artifact handling
     upload_dir: str = "data/uploads"
+    # Largest resumable upload accepted, in bytes.
+    upload_max_bytes: int = 20 * 1024 ** 3
+    # Resumable uploads without activity for this long are discarded.
+    upload_session_ttl: float = 86400.0
+    # Zip and tar uploads become one artifact per member.
+    upload_expand_archives: bool = True
+    upload_archive_max_members: int = 50_000
+    # Uncompressed bytes one archive may expand to.
+    upload_archive_max_bytes: int = 10 * 1024 ** 3
+    # Seconds between sweeps removing blobs no artifact references;
+    # 0 disables sweeping in this process.
+    upload_gc_interval: float = 3600.0
+    # Blobs stored more recently than this are never swept.
+    upload_gc_grace: float = 3600.0
+    upload_gc_batch_size: int = 1000
+
+    # Crawler
+    crawl_workers: int = 8
+    crawl_max_in_flight: int = 32
+    crawl_max_per_host: int = 4
+    crawl_claim_batch_size: int = 32
+    crawl_lease_seconds: int = 300
+    crawl_host_rate: float = 2.0
+    crawl_host_burst: int = 4
+    crawl_user_agent: str = "AuroraRAG/0.1"
+    crawl_respect_robots: bool = True
+    crawl_robots_ttl: float = 3600.0
+    crawl_timeout: float = 10.0
+    crawl_max_body_bytes: int = 10 * 1024 * 1024
+    crawl_content_types: list[str] = ["text/html", "application/xhtml+xml"]
+    crawl_max_connections: int = 100
+    crawl_max_keepalive_connections: int = 20
+    crawl_keepalive_expiry: float = 30.0
+    crawl_http2: bool = False
+    crawl_use_sitemaps: bool = True
+    crawl_sitemap_max_bytes: int = 50 * 1024 * 1024
+    crawl_max_sitemaps: int = 100
+    # Max SimHash distance (bits) for near-duplicate pages; -1 disables.
+    crawl_near_duplicate_distance: int = 3
+    # Processes used for HTML parsing; 0 parses on the event loop.
+    crawl_parser_processes: int = 0
+    # "inline" runs the crawl as a background job of the API process,
+    # "workers" only seeds the frontier and leaves the crawl to
+    # `python -m app.workers.crawl`.
+    crawl_mode: str = "inline"
+    crawl_site_quantum: int = 200
+    crawl_poll_interval: float = 5.0
+    # Seconds between progress updates of a crawl job.
+    crawl_job_progress_interval: float = 2.0
+    # Running jobs without progress for this long are considered abandoned.
+    crawl_job_stale_after: float = 60.0
+    crawl_resume_jobs_on_startup: bool = True
+    # Max seconds between writes of crawl outcomes to the frontier.
+    crawl_checkpoint_interval: float = 5.0
+
+    # Artifact ingestion
+    # "inline" runs the ingest workers inside the API process, "workers"
+    # leaves the queue to `python -m app.workers.ingest`.
+    ingest_mode: str = "inline"
+    ingest_workers: int = 4
+    ingest_max_attempts: int = 5
+    ingest_retry_base: float = 2.0
+    ingest_retry_max: float = 300.0
+    ingest_lease_seconds: int = 300
+    ingest_poll_interval: float = 2.0
+    # "token" splits on headings and paragraphs by token count,
+    # "character" into fixed-size character windows.
+    ingest_chunker: str = "token"
+    ingest_chunk_tokens: int = 256
+    ingest_chunk_overlap_tokens: int = 32
+    ingest_chunk_size: int = 1000
+    ingest_chunk_overlap: int = 100
+    # Documents chunked per call.
+    ingest_chunk_batch_size: int = 8
+    # Processes extracting text from artifacts; 0 extracts in a thread.
+    ingest_extract_workers: int = 2
+    # Larger artifacts are not extracted: the whole file is read into
+    # an extractor process.
+    ingest_extract_max_bytes: int = 256 * 1024 ** 2
+    ingest_embed_batch_size: int = 32
+    ingest_embed_workers: int = 1
+    ingest_upsert_batch_size: int = 256
+    # Capacity of each pipeline stage queue, in documents or batches.
+    ingest_queue_size: int = 16
 
     # Embedding provider
     embedding_provider: str = "ollama"
+    # Cached embeddings are keyed by model; change it with the model.
+    embedding_model: str = "dummy"
+    embedding_cache_enabled: bool = True
+    # Memory for cached embeddings in this process.
+    embedding_cache_max_bytes: int = 64 * 1024 ** 2
+    # SQLite file persisting cached embeddings; empty keeps them in memory only.
+    embedding_cache_path: str = "data/embedding_cache.sqlite3"
+    # Embeddings kept in that file; the least recently used go beyond it.
+    embedding_cache_max_rows: int = 200_000
 
     # LLM provider
     llm_provider: str = "ollama"
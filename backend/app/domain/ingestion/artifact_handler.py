@@ -15,3 +15,9 @@ class ArtifactHandler(ABC):
     async def enqueue(self, artifact: Artifact) -> None:
         ...
 
+    async def enqueue_many(self, artifacts: list[Artifact]) -> None:
+        """
+        Schedule many artifacts at once. Handlers that can batch override this.
+        """
+        for artifact in artifacts:
+            await self.enqueue(artifact)
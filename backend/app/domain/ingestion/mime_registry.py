@@ -0,0 +1,40 @@
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+def normalize_mime(mime_type: str | None) -> str:
+    """
+    `Text/HTML; charset=utf-8` -> `text/html`.
+    """
+    return (mime_type or "").split(";")[0].strip().lower()
+
+
+class MimeRegistry(Generic[T]):
+    """
+    Values registered by MIME pattern: an exact type (`text/html`), a
+    wildcard subtype (`text/*`) or `*`. Lookups return the most specific
+    match; parameters and case are ignored.
+    """
+
+    def __init__(self, entries: dict[str, T] | None = None):
+        self._entries: dict[str, T] = {}
+        for pattern, value in (entries or {}).items():
+            self.register(pattern, value)
+
+    def register(self, pattern: str, value: T) -> None:
+        self._entries[normalize_mime(pattern)] = value
+
+    def resolve(self, mime_type: str | None) -> T | None:
+        mime_type = normalize_mime(mime_type)
+        major = mime_type.split("/")[0]
+        for key in (mime_type, f"{major}/*", "*"):
+            if key in self._entries:
+                return self._entries[key]
+        return None
+
+    def patterns(self) -> list[str]:
+        return list(self._entries)
+
+    def __contains__(self, mime_type: str | None) -> bool:
+        return self.resolve(mime_type) is not None
@@ -1,5 +1,6 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
+from typing import Any
 
 @dataclass
 class Artifact:
@@ -10,3 +11,13 @@ class Artifact:
     path: str
     size_bytes: int
     created_at: datetime
+    status: str = "created"  # created | queued | processing | ready | failed
+    metadata: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+    content_hash: str | None = None
+    # Ingestion queue bookkeeping
+    attempts: int = 0
+    available_at: datetime | None = None
+    leased_by: str | None = None
+    lease_expires_at: datetime | None = None
+    updated_at: datetime | None = None
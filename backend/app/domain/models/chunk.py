@@ -10,4 +10,6 @@ class Chunk:
     embedding: list[float] | None
     chunk_index: int
     created_at: datetime
-    updated_at: datetime
\ No newline at end of file
+    updated_at: datetime
+    # sha256 of `text`; unchanged chunks keep their embedding on re-ingestion.
+    content_hash: str | None = None
@@ -0,0 +1,22 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+@dataclass
+class CrawlJob:
+    id: int
+    site_id: int
+    status: str  # pending, running, paused, interrupted, completed, failed, cancelled
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    error: str | None = None
+    source_id: int | None = None
+    incremental: bool = False
+    pages_fetched: int = 0
+    pages_failed: int = 0
+    pages_unchanged: int = 0
+    pages_per_sec: float = 0.0
+    queue_depth: int = 0
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+    # Crawl process running the job; its leases are released on resume.
+    worker_id: str | None = None
@@ -4,9 +4,17 @@ from datetime import datetime
 @dataclass
 class CrawlState:
     id: str
-    site_id: str
+    site_id: int
     url: str
-    status: str  # pending, success, error
+    status: str  # pending, in_progress, success, error
     discovered_at: datetime
     fetched_at: datetime | None
-    last_error: str | None
\ No newline at end of file
+    last_error: str | None
+    leased_by: str | None = None
+    lease_expires_at: datetime | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+    checksum: str | None = None
+    depth: int = 0
+    parent_url: str | None = None
+    priority: int = 0  # higher is crawled first
\ No newline at end of file
@@ -0,0 +1,24 @@
+import time
+from dataclasses import dataclass, field
+
+@dataclass
+class CrawlStats:
+    pages_fetched: int = 0
+    pages_failed: int = 0
+    pages_unchanged: int = 0
+    # Fetched pages flagged as near-duplicates of another page.
+    pages_duplicate: int = 0
+    links_discovered: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+    # Pages fetched before the crawl was resumed; not part of the rate.
+    resumed_from: int = 0
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def pages_per_sec(self) -> float:
+        elapsed = self.elapsed
+        fetched = self.pages_fetched - self.resumed_from
+        return fetched / elapsed if elapsed > 0 else 0.0
@@ -0,0 +1,30 @@
+from dataclasses import dataclass
+
+@dataclass
+class EmbeddingCacheStats:
+    # Served from the in-memory LRU.
+    hits: int = 0
+    # Served from the persistent tier, then kept in memory.
+    disk_hits: int = 0
+    # Embedded by the provider.
+    misses: int = 0
+    # Evicted from the in-memory LRU.
+    evictions: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.disk_hits + self.misses
+        return (self.hits + self.disk_hits) / lookups if lookups else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": self.entries,
+            "bytes": self.bytes,
+            "hit_rate": round(self.hit_rate, 4),
+        }
@@ -0,0 +1,21 @@
+from dataclasses import dataclass
+
+@dataclass
+class ExtractorStats:
+    name: str
+    calls: int = 0
+    bytes: int = 0
+    # Seconds spent extracting, measured where the extractor ran.
+    seconds: float = 0.0
+
+    @property
+    def bytes_per_sec(self) -> float:
+        return self.bytes / self.seconds if self.seconds > 0 else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "bytes": self.bytes,
+            "seconds": round(self.seconds, 3),
+            "bytes_per_sec": round(self.bytes_per_sec),
+        }
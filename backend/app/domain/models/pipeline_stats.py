@@ -0,0 +1,71 @@
+import time
+from dataclasses import dataclass, field
+
+@dataclass
+class StageStats:
+    name: str
+    # Capacity of the stage's input queue.
+    capacity: int
+    workers: int = 1
+    items_in: int = 0
+    items_out: int = 0
+    # Items the stage found nothing to do for, e.g. unchanged chunks.
+    items_skipped: int = 0
+    # Seconds spent doing the stage's work.
+    busy_seconds: float = 0.0
+    # Seconds spent waiting on a full downstream queue (backpressure).
+    blocked_seconds: float = 0.0
+    queue_size: int = 0
+    queue_peak: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def throughput(self) -> float:
+        """
+        Items emitted per second.
+        """
+        elapsed = self.elapsed
+        return self.items_out / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def utilization(self) -> float:
+        """
+        Share of the run spent working; the busiest stage is the bottleneck.
+        """
+        elapsed = self.elapsed
+        if elapsed <= 0:
+            return 0.0
+        return min(1.0, self.busy_seconds / (elapsed * self.workers))
+
+    def as_dict(self) -> dict:
+        return {
+            "items_in": self.items_in,
+            "items_out": self.items_out,
+            "items_skipped": self.items_skipped,
+            "throughput": round(self.throughput, 2),
+            "utilization": round(self.utilization, 3),
+            "blocked_seconds": round(self.blocked_seconds, 3),
+            "queue": f"{self.queue_size}/{self.capacity}",
+            "queue_peak": self.queue_peak,
+        }
+
+
+@dataclass
+class PipelineStats:
+    stages: dict[str, StageStats] = field(default_factory=dict)
+
+    @property
+    def bottleneck(self) -> str | None:
+        if not self.stages:
+            return None
+        return max(self.stages.values(), key=lambda s: s.utilization).name
+
+    def as_dict(self) -> dict:
+        return {
+            "bottleneck": self.bottleneck,
+            "stages": {name: stage.as_dict() for name, stage in self.stages.items()},
+        }
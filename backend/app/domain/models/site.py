@@ -13,6 +13,8 @@ class Site:
     max_depth: Optional[int] = None
     last_crawled_at: Optional[datetime] = None
     source_id: Optional[int] = None
+    # Start of the crawl in progress in workers mode.
+    crawl_started_at: Optional[datetime] = None
 
 @dataclass
 class SiteUpdate:
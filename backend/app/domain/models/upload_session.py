@@ -0,0 +1,22 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+@dataclass
+class UploadSession:
+    """
+    A resumable upload in progress. Its bytes are appended to a file on
+    disk until `offset` reaches `size`.
+    """
+    id: str
+    source_id: int
+    filename: str
+    content_type: str
+    # Total size announced when the upload was created.
+    size: int
+    # Bytes received so far.
+    offset: int
+    created_at: datetime
+
+    @property
+    def complete(self) -> bool:
+        return self.offset >= self.size
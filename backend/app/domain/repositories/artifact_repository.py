@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Any, Optional
 import psycopg
 
 from app.domain.models.artifact import Artifact
@@ -16,8 +16,45 @@ class ArtifactRepository(ABC):
         mime_type: str,
         path: str,
         size_bytes: int,
+        content_hash: str | None = None,
         conn: psycopg.AsyncConnection,
     ) -> Artifact:
+        """
+        Insert an artifact. If the source already has an artifact with
+        `content_hash`, nothing is inserted and that artifact is returned.
+        """
+        ...
+
+    @abstractmethod
+    async def create_many(
+            self,
+            artifacts: list[dict[str, Any]],
+            *,
+            conn: psycopg.AsyncConnection,
+    ) -> list[Artifact]:
+        """
+        Bulk `create`: each dict holds the arguments of one `create` call,
+        plus optional `metadata`. Artifacts whose content their source
+        already has are skipped; only inserted artifacts are returned.
+        """
+        ...
+
+    @abstractmethod
+    async def get_by_content_hash(
+            self,
+            source_id: int,
+            content_hash: str,
+            *,
+            conn: psycopg.AsyncConnection | None = None
+    ) -> Optional[Artifact]:
+        ...
+
+    @abstractmethod
+    async def referenced_hashes(self, content_hashes: list[str]) -> set[str]:
+        """
+        The subset of `content_hashes` that some artifact, of any source,
+        still has.
+        """
         ...
 
     @abstractmethod
@@ -0,0 +1,63 @@
+from abc import ABC, abstractmethod
+from typing import Optional, Any
+
+from app.domain.models.crawl_job import CrawlJob
+
+
+class CrawlJobRepository(ABC):
+
+    @abstractmethod
+    async def create(
+            self,
+            *,
+            site_id: int,
+            source_id: int | None,
+            incremental: bool = False,
+            worker_id: str | None = None,
+    ) -> CrawlJob:
+        ...
+
+    @abstractmethod
+    async def get(self, job_id: int) -> Optional[CrawlJob]:
+        ...
+
+    @abstractmethod
+    async def update(self, job_id: int, updates: dict[str, Any]) -> Optional[CrawlJob]:
+        ...
+
+    @abstractmethod
+    async def transition(
+            self,
+            job_id: int,
+            from_statuses: list[str],
+            to_status: str,
+            *,
+            error: str | None = None,
+    ) -> Optional[CrawlJob]:
+        """
+        Move a job to `to_status` if it is currently in one of
+        `from_statuses`. Returns None if the job does not exist or is
+        in another status.
+        """
+        ...
+
+    @abstractmethod
+    async def list_resumable(self, stale_after: float) -> list[CrawlJob]:
+        """
+        Interrupted jobs, and active jobs whose progress has not been
+        updated for `stale_after` seconds (their process died).
+        """
+        ...
+
+    @abstractmethod
+    async def claim(
+            self,
+            job_id: int,
+            worker_id: str,
+            stale_after: float,
+    ) -> Optional[CrawlJob]:
+        """
+        Take over a resumable job for `worker_id`. Returns None if the job
+        is not resumable, e.g. another process claimed it first.
+        """
+        ...
@@ -16,7 +16,7 @@ class SiteRepository(ABC):
             start_url: str = "",
             allowed_domains: List[str] | None = None,
             max_depth: int = 2,
-            conn: psycopg.AsyncConnection
+            conn: psycopg.AsyncConnection | None = None
     ) -> Site:
         ...
 
@@ -24,7 +24,7 @@ class SiteRepository(ABC):
     async def get_all(
             self,
             *,
-            conn: psycopg.AsyncConnection
+            conn: psycopg.AsyncConnection | None = None
     ) -> List[Site]:
         ...
 
@@ -33,7 +33,7 @@ class SiteRepository(ABC):
             self,
             site_id: int,
             *,
-            conn: psycopg.AsyncConnection
+            conn: psycopg.AsyncConnection | None = None
     ) -> Optional[Site]:
         ...
 
@@ -42,7 +42,7 @@ class SiteRepository(ABC):
             self,
             url: str,
             *,
-            conn: psycopg.AsyncConnection
+            conn: psycopg.AsyncConnection | None = None
     ) -> Optional[Site]:
         ...
 
@@ -51,7 +51,7 @@ class SiteRepository(ABC):
             self,
             source_id: int,
             *,
-            conn: psycopg.AsyncConnection
+            conn: psycopg.AsyncConnection | None = None
     ) -> Optional[Site]:
         ...
 
@@ -61,15 +61,39 @@ class SiteRepository(ABC):
             site_id: int,
             updates: dict[str, Any],
             *,
-            conn: psycopg.AsyncConnection
+            conn: psycopg.AsyncConnection | None = None
     ) -> Optional[Site]:
         ...
 
+    @abstractmethod
+    async def start_crawl(
+            self,
+            site_id: int,
+            *,
+            conn: psycopg.AsyncConnection | None = None
+    ) -> Optional[Site]:
+        """
+        Record the start of a crawl, unless one is already in progress.
+        """
+        ...
+
+    @abstractmethod
+    async def finish_crawl(
+            self,
+            site_id: int,
+            *,
+            conn: psycopg.AsyncConnection | None = None
+    ) -> Optional[Site]:
+        """
+        Make the start of the crawl in progress the site's `last_crawled_at`.
+        """
+        ...
+
     @abstractmethod
     async def delete(
             self,
             site_id: int,
             *,
-            conn: psycopg.AsyncConnection
+            conn: psycopg.AsyncConnection | None = None
     ) -> Optional[Site]:
         ...
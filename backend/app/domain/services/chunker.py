@@ -0,0 +1,28 @@
+import hashlib
+from abc import ABC, abstractmethod
+from typing import Iterable, Sequence
+
+from app.domain.models.chunk import Chunk
+from app.domain.models.document import Document
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class Chunker(ABC):
+
+    @abstractmethod
+    def chunk(self, document: Document) -> Iterable[Chunk]:
+        """
+        Split a document into chunks, in order. Synchronous, so it can
+        run in a thread.
+        """
+        ...
+
+    def chunk_batch(self, documents: Sequence[Document]) -> list[list[Chunk]]:
+        """
+        Chunk several documents in one call, one list per document.
+        Chunkers that can share work across documents override this.
+        """
+        return [list(self.chunk(document)) for document in documents]
@@ -3,8 +3,12 @@ from abc import ABC, abstractmethod
 class Crawler(ABC):
 
     @abstractmethod
-    async def crawl_site(self, site_id: str) -> None:
-        """Crawl all pages for a given site."""
+    async def crawl_site(self, site_id: int, *, incremental: bool = False) -> None:
+        """
+        Crawl all pages for a given site.
+        With `incremental`, previously crawled pages are revisited and
+        only changed pages are rewritten.
+        """
         ...
 
     @abstractmethod
@@ -14,4 +14,15 @@ class VectorStore(ABC):
 
     @abstractmethod
     async def delete_by_site(self, site_id: str) -> None:
-        ...
\ No newline at end of file
+        ...
+
+    @abstractmethod
+    async def get_by_documents(self, document_ids: list[str]) -> list[Chunk]:
+        """
+        Every stored chunk of the given documents, with its embedding.
+        """
+        ...
+
+    @abstractmethod
+    async def delete(self, chunk_ids: Iterable[str]) -> None:
+        ...
@@ -0,0 +1,40 @@
+from datetime import datetime, timezone
+from typing import Iterator
+
+from app.domain.models.chunk import Chunk
+from app.domain.models.document import Document
+from app.domain.services.chunker import Chunker, content_hash
+
+
+class CharacterChunker(Chunker):
+    """
+    Fixed-size character windows, each overlapping the previous one by
+    `overlap` characters.
+    """
+
+    def __init__(self, size: int = 1000, overlap: int = 100):
+        if not 0 <= overlap < size:
+            raise ValueError("overlap must be between 0 and size")
+        self.size = size
+        self.overlap = overlap
+
+    def chunk(self, document: Document) -> Iterator[Chunk]:
+        now = datetime.now(timezone.utc)
+        text = document.text
+        index = 0
+        for start in range(0, len(text), self.size - self.overlap):
+            piece = text[start:start + self.size].strip()
+            if not piece:
+                continue
+            yield Chunk(
+                id=f"{document.id}:{index}",
+                document_id=document.id,
+                site_id=document.site_id,
+                text=piece,
+                embedding=None,
+                chunk_index=index,
+                created_at=now,
+                updated_at=now,
+                content_hash=content_hash(piece),
+            )
+            index += 1
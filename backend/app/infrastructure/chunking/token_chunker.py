@@ -0,0 +1,206 @@
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Iterator, Sequence
+
+from app.core.logging import logger
+from app.domain.models.chunk import Chunk
+from app.domain.models.document import Document
+from app.domain.services.chunker import Chunker, content_hash
+
+try:
+    import tiktoken
+except ImportError:  # optional dependency
+    tiktoken = None  # type: ignore[assignment]
+
+# Markdown ATX headings ("## Title").
+_HEADING_RE = re.compile(r"^\s{0,3}#{1,6}\s+\S")
+_PARAGRAPH_BREAK_RE = re.compile(r"\n\s*\n")
+# Fallback tokenizer: words and punctuation marks.
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+
+@dataclass
+class _Piece:
+    text: str
+    # Start offset of each token in `text`.
+    offsets: list[int]
+    # A window of a paragraph after the first; it already overlaps the previous one.
+    continued: bool = False
+
+    @property
+    def tokens(self) -> int:
+        return len(self.offsets)
+
+    def tail(self, n: int) -> "_Piece":
+        """
+        The last `n` tokens.
+        """
+        if n >= self.tokens:
+            return self
+        start = self.offsets[-n]
+        return _Piece(self.text[start:], [o - start for o in self.offsets[-n:]])
+
+
+@dataclass
+class _Section:
+    heading: str | None
+    paragraphs: list[str]
+
+
+class TokenChunker(Chunker):
+    """
+    Chunks of at most `max_tokens` tokens that follow the document's
+    structure:
+    - a heading always starts a new chunk and is repeated at the top of
+      every chunk of its section
+    - whole paragraphs are packed into a chunk while they fit; only a
+      paragraph longer than a chunk is cut, into windows of `max_tokens`
+    - consecutive chunks of a section share `overlap` tokens
+
+    Chunks stay aligned on headings and paragraphs, so editing one
+    section leaves the chunks (and content hashes) of the others as they
+    were.
+
+    Tokens are counted with tiktoken's `encoding` when the optional
+    `tiktoken` package is installed and the encoding can be loaded, as
+    words and punctuation marks otherwise. `chunk_batch` tokenizes all
+    documents in one call.
+    """
+
+    def __init__(self, max_tokens: int = 256, overlap: int = 32, encoding: str = "cl100k_base"):
+        if not 0 <= overlap < max_tokens:
+            raise ValueError("overlap must be between 0 and max_tokens")
+        self.max_tokens = max_tokens
+        self.overlap = overlap
+        self._encoding = self._load_encoding(encoding)
+
+    @staticmethod
+    def _load_encoding(name: str):
+        if tiktoken is None:
+            return None
+        try:
+            return tiktoken.get_encoding(name)
+        except Exception:
+            # Encodings are downloaded on first use, which fails offline.
+            logger.warning("tiktoken encoding unavailable, counting words", extra={"encoding": name})
+            return None
+
+    def chunk(self, document: Document) -> Iterator[Chunk]:
+        return iter(self.chunk_batch([document])[0])
+
+    def chunk_batch(self, documents: Sequence[Document]) -> list[list[Chunk]]:
+        sections = [self._sections(document.text) for document in documents]
+
+        texts = [
+            text
+            for document_sections in sections
+            for section in document_sections
+            for text in ([section.heading] if section.heading else []) + section.paragraphs
+        ]
+        pieces = iter([_Piece(text, offsets) for text, offsets in zip(texts, self._tokenize(texts))])
+
+        now = datetime.now(timezone.utc)
+        result = []
+        for document, document_sections in zip(documents, sections):
+            chunks: list[Chunk] = []
+            for section in document_sections:
+                heading = next(pieces) if section.heading else None
+                paragraphs = [next(pieces) for _ in section.paragraphs]
+                for text in self._pack(heading, paragraphs):
+                    chunks.append(
+                        Chunk(
+                            id=f"{document.id}:{len(chunks)}",
+                            document_id=document.id,
+                            site_id=document.site_id,
+                            text=text,
+                            embedding=None,
+                            chunk_index=len(chunks),
+                            created_at=now,
+                            updated_at=now,
+                            content_hash=content_hash(text),
+                        )
+                    )
+            result.append(chunks)
+        return result
+
+    def _pack(self, heading: _Piece | None, paragraphs: list[_Piece]) -> Iterator[str]:
+        """
+        Pack a section's paragraphs into chunk texts.
+        """
+        # A heading too long to leave room for text is chunked as text.
+        if heading is not None and heading.tokens > self.max_tokens // 4:
+            paragraphs, heading = [heading, *paragraphs], None
+        prefix = f"{heading.text}\n\n" if heading is not None else ""
+        budget = self.max_tokens - (heading.tokens if heading is not None else 0)
+        overlap = min(self.overlap, budget - 1)
+
+        current: list[_Piece] = []
+        tokens = 0
+        for piece in (p for paragraph in paragraphs for p in self._split(paragraph, budget, overlap)):
+            if current and tokens + piece.tokens > budget:
+                yield prefix + "\n\n".join(p.text for p in current)
+                tail = current[-1].tail(overlap) if overlap else None
+                if tail is not None and not piece.continued and tail.tokens + piece.tokens <= budget:
+                    current, tokens = [tail], tail.tokens
+                else:
+                    current, tokens = [], 0
+            current.append(piece)
+            tokens += piece.tokens
+
+        if current:
+            yield prefix + "\n\n".join(p.text for p in current)
+        elif heading is not None and not paragraphs:
+            yield heading.text
+
+    @staticmethod
+    def _split(paragraph: _Piece, budget: int, overlap: int) -> Iterator[_Piece]:
+        """
+        Cut a paragraph longer than `budget` tokens into overlapping windows.
+        """
+        if paragraph.tokens <= budget:
+            yield paragraph
+            return
+
+        offsets = paragraph.offsets
+        for start in range(0, len(offsets), budget - overlap):
+            end = start + budget
+            begin = offsets[start]
+            text = paragraph.text[begin:offsets[end]] if end < len(offsets) else paragraph.text[begin:]
+            yield _Piece(text.rstrip(), [o - begin for o in offsets[start:end]], continued=start > 0)
+            if end >= len(offsets):
+                return
+
+    @staticmethod
+    def _sections(text: str) -> list[_Section]:
+        sections: list[_Section] = []
+        heading = None
+        body: list[str] = []
+
+        def close() -> None:
+            paragraphs = [p.strip() for p in _PARAGRAPH_BREAK_RE.split("\n".join(body))]
+            paragraphs = [p for p in paragraphs if p]
+            if heading is not None or paragraphs:
+                sections.append(_Section(heading, paragraphs))
+
+        for line in text.splitlines():
+            if _HEADING_RE.match(line):
+                close()
+                heading, body = line.strip(), []
+            else:
+                body.append(line)
+        close()
+        return sections
+
+    def _tokenize(self, texts: list[str]) -> list[list[int]]:
+        """
+        Token start offsets of every text.
+        """
+        if self._encoding is None:
+            return [[m.start() for m in _TOKEN_RE.finditer(text)] for text in texts]
+
+        result = []
+        for tokens in self._encoding.encode_batch(texts, disallowed_special=()):
+            _, offsets = self._encoding.decode_with_offsets(tokens)
+            result.append(offsets)
+        return result
@@ -0,0 +1,32 @@
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None  # type: ignore[assignment]
+
+ZSTD = "zstd"
+ZLIB = "zlib"
+
+
+def compress(data: bytes, *, level: int = 6) -> tuple[str, bytes]:
+    """
+    Compress `data` with the best available codec.
+
+    zstd is used when the optional `zstandard` package is installed,
+    zlib otherwise. Returns the codec name with the payload so readers
+    can decompress blobs written by either.
+    """
+    if zstandard is not None:
+        return ZSTD, zstandard.ZstdCompressor(level=level).compress(data)
+    return ZLIB, zlib.compress(data, level)
+
+
+def decompress(codec: str, data: bytes) -> bytes:
+    if codec == ZSTD:
+        if zstandard is None:
+            raise RuntimeError("zstd blob found but 'zstandard' is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == ZLIB:
+        return zlib.decompress(data)
+    raise ValueError(f"Unknown blob codec '{codec}'")
@@ -1,21 +1,139 @@
+import asyncio
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
 from selectolax.parser import HTMLParser
 from urllib.parse import urljoin, urlparse
 
+from app.infrastructure.crawling.simhash import simhash
+from app.infrastructure.crawling.url_canonicalizer import canonicalize_url
+
+# Elements that never carry a page's main text.
+BOILERPLATE_TAGS = ["script", "style", "noscript", "template", "svg", "nav", "header", "footer", "aside"]
+MAIN_CONTENT_SELECTORS = ("main", "article", "[role=main]")
+
+@dataclass
+class PageAnalysis:
+    links: list[str] = field(default_factory=list)
+    title: str = ""
+    text: str = ""
+    metadata: dict[str, str] = field(default_factory=dict)
+    # SimHash of `text`; None when the text is too short to compare.
+    simhash: int | None = None
+
+
+def _links(tree: HTMLParser, base_url: str, allowed_domains: list[str]) -> list[str]:
+    links = []
+
+    for node in tree.css("a"):
+        href = node.attrs.get("href")
+        if not href:
+            continue
+
+        absolute = canonicalize_url(urljoin(base_url, href))
+        if absolute is None:
+            continue
+
+        domain = urlparse(absolute).netloc
+
+        if any(domain.endswith(d) for d in allowed_domains):
+            links.append(absolute)
+
+    return links
+
+
+def _metadata(tree: HTMLParser) -> dict[str, str]:
+    metadata: dict[str, str] = {}
+
+    html = tree.css_first("html")
+    lang = html.attrs.get("lang") if html is not None else None
+    if lang:
+        metadata["lang"] = lang
+
+    for node in tree.css("meta"):
+        key = node.attrs.get("name") or node.attrs.get("property")
+        content = node.attrs.get("content")
+        if key and content:
+            metadata[key.lower()] = content
+
+    canonical = tree.css_first("link[rel=canonical]")
+    href = canonical.attrs.get("href") if canonical is not None else None
+    if href:
+        metadata["canonical"] = href
+
+    return metadata
+
+
+def analyze_html(html: str, base_url: str, allowed_domains: list[str]) -> PageAnalysis:
+    """
+    Extract links, title, main text, metadata and the text's SimHash
+    from one parse.
+
+    A module-level function so it can be shipped to a process pool.
+    """
+    tree = HTMLParser(html)
+
+    links = _links(tree, base_url, allowed_domains)
+    title_node = tree.css_first("title")
+    title = title_node.text(strip=True) if title_node is not None else ""
+    metadata = _metadata(tree)
+
+    # Links are collected first: navigation is boilerplate for the text
+    # but still part of the link graph.
+    tree.strip_tags(BOILERPLATE_TAGS)
+    root = None
+    for selector in MAIN_CONTENT_SELECTORS:
+        root = tree.css_first(selector)
+        if root is not None:
+            break
+    root = root or tree.body
+    text = root.text(separator="\n", strip=True) if root is not None else ""
+
+    return PageAnalysis(
+        links=links,
+        title=title,
+        text=text,
+        metadata=metadata,
+        simhash=simhash(text),
+    )
+
+
 class HtmlParser:
+    """
+    HTML parsing for the crawler.
+
+    With an `executor` (normally a `ProcessPoolExecutor`), `analyze_async`
+    parses off the event loop so CPU-heavy pages do not stall fetching.
+    """
+
+    def __init__(self, executor: Executor | None = None):
+        self.executor = executor
+
     @staticmethod
     def extract_links(html: str, base_url: str, allowed_domains: list[str]) -> list[str]:
-        tree = HTMLParser(html)
-        links = []
+        return _links(HTMLParser(html), base_url, allowed_domains)
 
-        for node in tree.css("a"):
-            href = node.attrs.get("href")
-            if not href:
-                continue
+    @staticmethod
+    def analyze(html: str, base_url: str, allowed_domains: list[str]) -> PageAnalysis:
+        return analyze_html(html, base_url, allowed_domains)
 
-            absolute = urljoin(base_url, href)
-            domain = urlparse(absolute).netloc
+    async def analyze_async(
+            self,
+            html: str,
+            base_url: str,
+            allowed_domains: list[str],
+    ) -> PageAnalysis:
+        if self.executor is None:
+            return analyze_html(html, base_url, allowed_domains)
 
-            if any(domain.endswith(d) for d in allowed_domains):
-                links.append(absolute)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, analyze_html, html, base_url, allowed_domains
+        )
 
-        return links
\ No newline at end of file
+    def close(self) -> None:
+        """
+        Shut the executor down; pages are parsed inline afterwards.
+        """
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
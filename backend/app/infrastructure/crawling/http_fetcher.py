@@ -1,13 +1,152 @@
+import codecs
+import importlib.util
 import httpx
+from dataclasses import dataclass
 from typing import Optional
 
+from app.core.logging import logger
+
+DEFAULT_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+
+@dataclass
+class FetchResult:
+    status: int
+    text: str | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+    content_type: str | None = None
+    # Set when the body was not read, e.g. wrong content type or too large.
+    error: str | None = None
+    # URL the response came from, after redirects.
+    url: str | None = None
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
+
 class HttpFetcher:
-    def __init__(self, timeout: float = 10.0):
-        self.client = httpx.AsyncClient(timeout=timeout)
+    """
+    Streaming HTTP fetcher for crawling.
+
+    The body is only read when the response's Content-Type is accepted,
+    and reading stops as soon as it exceeds `max_body_bytes`, so memory per
+    in-flight request is bounded and large binaries cost no bandwidth.
+    Bodies are decoded incrementally while streaming.
+    """
+
+    def __init__(
+            self,
+            timeout: float = 10.0,
+            user_agent: str = "AuroraRAG",
+            *,
+            max_body_bytes: int = 10 * 1024 * 1024,
+            content_types: tuple[str, ...] = DEFAULT_CONTENT_TYPES,
+            max_connections: int = 100,
+            max_keepalive_connections: int = 20,
+            keepalive_expiry: float = 30.0,
+            http2: bool = False,
+    ):
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 requested but the 'h2' package is not installed")
+            http2 = False
+
+        self.max_body_bytes = max_body_bytes
+        self.content_types = tuple(content_types)
+        self.client = httpx.AsyncClient(
+            timeout=timeout,
+            headers={"User-Agent": user_agent},
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            http2=http2,
+        )
+
+    async def fetch(
+            self,
+            url: str,
+            *,
+            etag: Optional[str] = None,
+            last_modified: Optional[str] = None,
+            content_types: tuple[str, ...] | None = None,
+    ) -> FetchResult:
+        """
+        Fetch `url`. When validators from a previous fetch are given the
+        request is conditional, and an unchanged page comes back as a
+        body-less 304.
+
+        `content_types` overrides the accepted media types for this call.
+        """
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        try:
+            async with self.client.stream(
+                "GET", url, headers=headers, follow_redirects=True
+            ) as response:
+                return await self._read(response, content_types or self.content_types)
+        except httpx.HTTPError as e:
+            error = str(e) or type(e).__name__
+            logger.warning("Fetch failed", extra={"url": url, "error": error})
+            return FetchResult(status=0, error=error)
+
+    async def aclose(self) -> None:
+        """
+        Close the pooled connections. The fetcher is unusable afterwards.
+        """
+        await self.client.aclose()
+
+    async def _read(
+            self,
+            response: httpx.Response,
+            content_types: tuple[str, ...],
+    ) -> FetchResult:
+        content_type = response.headers.get("Content-Type", "")
+        result = FetchResult(
+            status=response.status_code,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            content_type=content_type.split(";")[0].strip().lower() or None,
+            url=str(response.url),
+        )
+
+        if response.status_code == 304:
+            return result
+
+        if result.content_type and not result.content_type.startswith(content_types):
+            result.error = f"Unsupported content type: {result.content_type}"
+            return result
+
+        declared = response.headers.get("Content-Length")
+        if declared and declared.isdigit() and int(declared) > self.max_body_bytes:
+            result.error = f"Body too large: {declared} bytes"
+            return result
+
+        decoder = codecs.getincrementaldecoder(
+            self._encoding(response)
+        )(errors="replace")
+        parts = []
+        size = 0
+        async for chunk in response.aiter_bytes():
+            size += len(chunk)
+            if size > self.max_body_bytes:
+                result.error = f"Body exceeds {self.max_body_bytes} bytes"
+                return result
+            parts.append(decoder.decode(chunk))
+        parts.append(decoder.decode(b"", final=True))
+
+        result.text = "".join(parts)
+        return result
 
-    async def fetch(self, url: str) -> tuple[int, str | None]:
+    @staticmethod
+    def _encoding(response: httpx.Response) -> str:
+        encoding = response.charset_encoding or "utf-8"
         try:
-            response = await self.client.get(url, follow_redirects=True)
-            return response.status_code, response.text
-        except Exception:
-            return 0, None
\ No newline at end of file
+            codecs.lookup(encoding)
+        except LookupError:
+            encoding = "utf-8"
+        return encoding
@@ -1,24 +1,159 @@
-import uuid
+import asyncio
 import hashlib
 from datetime import datetime
 
+from app.infrastructure.crawling import blob_codec
+from app.infrastructure.crawling.simhash import to_signed, to_unsigned
+
+# Constants
+# Follows a `blob` CTE that yields the checksum of the page's blob, and
+# touched it, so `delete_orphan_blobs` cannot remove it meanwhile. No
+# page is written when the blob is gone.
+UPSERT_PAGE_QUERY = """
+    INSERT INTO pages (site_id, url, fetched_at, checksum, simhash, duplicate_of)
+    SELECT %(site_id)s, %(url)s, %(fetched_at)s, blob.checksum, %(simhash)s::bigint, %(duplicate_of)s
+    FROM blob
+    ON CONFLICT (site_id, url)
+    DO UPDATE SET raw_html=NULL,
+                  fetched_at=EXCLUDED.fetched_at,
+                  checksum=EXCLUDED.checksum,
+                  simhash=EXCLUDED.simhash,
+                  duplicate_of=EXCLUDED.duplicate_of
+    """
+
 class PageRepository:
+    """
+    Crawled pages.
+
+    Page bodies are stored once per distinct content in `page_blobs`,
+    keyed by their SHA-256 checksum and compressed. `pages` rows point
+    at their body through `checksum`, so mirrors, print views and other
+    duplicates share one blob. Blobs left without pages are deleted by
+    `delete_orphan_blobs`.
+
+    Pages whose text is a near-duplicate of another page of the site
+    (by SimHash) point at that page through `duplicate_of`.
+    """
+
     def __init__(self, db):
         self.db = db
+        # Checksums this repository already wrote a blob for.
+        self._stored: set[str] = set()
 
     @staticmethod
     def compute_checksum(html: str) -> str:
         return hashlib.sha256(html.encode()).hexdigest()
 
-    async def upsert_page(self, site_id: str, url: str, raw_html: str) -> None:
-        checksum = self.compute_checksum(raw_html)
+    async def upsert_page(
+            self,
+            site_id: int,
+            url: str,
+            raw_html: str,
+            checksum: str | None = None,
+            *,
+            simhash: int | None = None,
+            duplicate_of: str | None = None,
+    ) -> None:
+        checksum = checksum or self.compute_checksum(raw_html)
+        params = {
+            "site_id": site_id,
+            "url": url,
+            "fetched_at": datetime.utcnow(),
+            "checksum": checksum,
+            "simhash": to_signed(simhash) if simhash is not None else None,
+            "duplicate_of": duplicate_of,
+        }
+
+        if checksum in self._stored:
+            written = await self._execute_rowcount(
+                """
+                WITH blob AS (
+                    UPDATE page_blobs SET referenced_at=NOW()
+                    WHERE checksum=%(checksum)s
+                    RETURNING checksum
+                )
+                """ + UPSERT_PAGE_QUERY,
+                params,
+            )
+            if written:
+                return
+            # The blob was deleted as an orphan since: write it again.
+            self._stored.discard(checksum)
+
+        body = raw_html.encode()
+        codec, data = await asyncio.to_thread(blob_codec.compress, body)
+        await self._execute_rowcount(
+            """
+            WITH blob AS (
+                INSERT INTO page_blobs (checksum, codec, data, size_bytes, stored_bytes)
+                VALUES (%(checksum)s, %(codec)s, %(data)s, %(size_bytes)s, %(stored_bytes)s)
+                ON CONFLICT (checksum) DO UPDATE SET referenced_at=NOW()
+                RETURNING checksum
+            )
+            """ + UPSERT_PAGE_QUERY,
+            {
+                **params,
+                "codec": codec,
+                "data": data,
+                "size_bytes": len(body),
+                "stored_bytes": len(data),
+            },
+        )
+        self._stored.add(checksum)
+
+    async def get_html(self, site_id: int, url: str) -> str | None:
+        """
+        The stored body of a page, or None if the page is unknown.
+
+        Pages written before bodies moved to `page_blobs` still have
+        them inline, in `raw_html` or `html`.
+        """
+        row = await self.db.fetchone(
+            """
+            SELECT b.codec, b.data, COALESCE(p.raw_html, p.html) AS inline_html
+            FROM pages p
+            LEFT JOIN page_blobs b ON b.checksum = p.checksum
+            WHERE p.site_id=%(site_id)s AND p.url=%(url)s
+            """,
+            {"site_id": site_id, "url": url},
+        )
+        if row is None:
+            return None
+        if row["data"] is None:
+            return row["inline_html"]
+        body = await asyncio.to_thread(blob_codec.decompress, row["codec"], bytes(row["data"]))
+        return body.decode()
+
+    async def get_simhashes(self, site_id: int) -> list[tuple[str, int]]:
+        """
+        `(url, simhash)` of the site's pages that are not near-duplicates.
+        """
+        rows = await self.db.fetchall(
+            """
+            SELECT url, simhash FROM pages
+            WHERE site_id=%(site_id)s AND simhash IS NOT NULL AND duplicate_of IS NULL
+            """,
+            {"site_id": site_id},
+        )
+        return [(row["url"], to_unsigned(row["simhash"])) for row in rows]
 
-        await self.db.execute(
+    async def delete_orphan_blobs(self, grace_seconds: float = 3600.0) -> int:
+        """
+        Delete page bodies no page references any more, e.g. once their
+        pages changed. Blobs written or reused within the last
+        `grace_seconds` are kept. Returns the number of deleted blobs.
+        """
+        return await self._execute_rowcount(
             """
-            INSERT INTO pages (id, site_id, url, raw_html, fetched_at, checksum)
-            VALUES ($1, $2, $3, $4, $5, $6)
-            ON CONFLICT (site_id, url)
-            DO UPDATE SET raw_html=$4, fetched_at=$5, checksum=$6
+            DELETE FROM page_blobs AS b
+            WHERE b.referenced_at < NOW() - make_interval(secs => %(grace_seconds)s)
+              AND NOT EXISTS (SELECT 1 FROM pages p WHERE p.checksum = b.checksum)
             """,
-            str(uuid.uuid4()), site_id, url, raw_html, datetime.utcnow(), checksum
-        )
\ No newline at end of file
+            {"grace_seconds": grace_seconds},
+        )
+
+    async def _execute_rowcount(self, query: str, params: dict) -> int:
+        async with self.db.transaction() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(query, params)
+                return cur.rowcount
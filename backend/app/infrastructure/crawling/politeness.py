@@ -0,0 +1,288 @@
+import asyncio
+import contextlib
+import time
+from collections import OrderedDict, defaultdict, deque
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+import httpx
+
+from app.core.logging import logger
+from app.domain.models.crawl_state import CrawlState
+
+# robots.txt bodies for the fallbacks of `RobotsCache`.
+ALLOW_ALL: list[str] = []
+DISALLOW_ALL = ["User-agent: *", "Disallow: /"]
+
+
+class TokenBucket:
+    """
+    Classic token bucket: `rate` tokens per second, holding at most `capacity`.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def delay(self, now: float | None = None) -> float:
+        """
+        Seconds until a token is available.
+        """
+        self._refill(time.monotonic() if now is None else now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def try_acquire(self, now: float | None = None) -> bool:
+        if self.delay(now) > 0:
+            return False
+        self.tokens -= 1
+        return True
+
+    def set_rate(self, rate: float, capacity: float, now: float | None = None) -> None:
+        """
+        Change the rate and capacity, keeping the tokens earned so far.
+        """
+        self._refill(time.monotonic() if now is None else now)
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = min(self.tokens, capacity)
+
+
+class RobotsCache:
+    """
+    Parsed robots.txt per origin, refreshed after `ttl` seconds.
+
+    A missing robots.txt (or any 4xx other than 401/403) allows everything,
+    401/403 disallow everything, as `urllib.robotparser` does. Network
+    errors and 5xx allow everything but are retried sooner.
+
+    At most `max_entries` origins are kept, the least recently used are
+    dropped first.
+    """
+
+    def __init__(
+            self,
+            client: httpx.AsyncClient,
+            *,
+            user_agent: str,
+            ttl: float = 3600.0,
+            error_ttl: float = 300.0,
+            max_entries: int = 10_000,
+    ):
+        self.client = client
+        self.user_agent = user_agent
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, RobotFileParser]] = OrderedDict()
+        # Only origins being fetched have a lock.
+        self._locks: dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+    @staticmethod
+    def _origin(url: str) -> str:
+        parts = urlparse(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    async def get(self, url: str) -> RobotFileParser:
+        origin = self._origin(url)
+        parser = self._cached(origin)
+        if parser is not None:
+            return parser
+
+        async with self._locks[origin]:
+            parser = self._cached(origin)
+            if parser is not None:
+                return parser
+
+            parser, ttl = await self._fetch(origin)
+            self._entries[origin] = (time.monotonic() + ttl, parser)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            # Waiters hold the lock already; later callers hit the entry.
+            self._locks.pop(origin, None)
+            return parser
+
+    async def prefetch(self, urls: list[str]) -> None:
+        """
+        Make sure robots.txt of the origins of `urls` is cached, fetching
+        the missing ones concurrently.
+        """
+        origins = {self._origin(url): url for url in urls}
+        await asyncio.gather(*(
+            self.get(url) for origin, url in origins.items() if self._cached(origin) is None
+        ))
+
+    def _cached(self, origin: str) -> RobotFileParser | None:
+        entry = self._entries.get(origin)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        self._entries.move_to_end(origin)
+        return entry[1]
+
+    async def _fetch(self, origin: str) -> tuple[RobotFileParser, float]:
+        parser = RobotFileParser(f"{origin}/robots.txt")
+        try:
+            response = await self.client.get(
+                f"{origin}/robots.txt",
+                headers={"User-Agent": self.user_agent},
+                follow_redirects=True,
+            )
+        except Exception:
+            logger.warning("robots.txt fetch failed", extra={"origin": origin})
+            parser.parse(ALLOW_ALL)
+            return parser, self.error_ttl
+
+        if response.status_code in (401, 403):
+            parser.parse(DISALLOW_ALL)
+        elif response.status_code >= 500:
+            parser.parse(ALLOW_ALL)
+            return parser, self.error_ttl
+        elif response.status_code >= 400:
+            parser.parse(ALLOW_ALL)
+        else:
+            parser.parse(response.text.splitlines())
+        return parser, self.ttl
+
+    async def allowed(self, url: str) -> bool:
+        return (await self.get(url)).can_fetch(self.user_agent, url)
+
+    async def crawl_delay(self, url: str) -> float | None:
+        delay = (await self.get(url)).crawl_delay(self.user_agent)
+        return float(delay) if delay is not None else None
+
+
+class PolitenessScheduler:
+    """
+    Sits between the frontier and the fetcher.
+
+    Leased URLs are queued per host. `pop_ready` hands out a URL from the
+    next host (round-robin) that has a token in its bucket and a free
+    concurrency slot, so workers move on to ready hosts instead of sleeping
+    on a throttled one.
+
+    Buckets are shared across schedulers through `buckets`, so the rate
+    limit holds for a host even when several crawls touch it.
+    """
+
+    def __init__(
+            self,
+            *,
+            robots: RobotsCache | None,
+            buckets: dict[str, TokenBucket],
+            rate: float,
+            burst: int,
+            max_per_host: int,
+    ):
+        self.robots = robots
+        self.buckets = buckets
+        self.rate = rate
+        self.burst = burst
+        self.max_per_host = max_per_host
+        self._queues: dict[str, deque[CrawlState]] = {}
+        self._hosts: deque[str] = deque()
+        self._in_flight: dict[str, int] = defaultdict(int)
+        self._changed = asyncio.Event()
+
+    @property
+    def pending(self) -> int:
+        return sum(len(q) for q in self._queues.values())
+
+    @staticmethod
+    def _host(url: str) -> str:
+        return urlparse(url).netloc
+
+    async def submit(self, state: CrawlState) -> bool:
+        """
+        Queue a leased URL. Returns False if robots.txt disallows it.
+        """
+        host = self._host(state.url)
+        if self.robots is not None:
+            if not await self.robots.allowed(state.url):
+                return False
+            await self._sync_bucket(self.robots, host, state.url)
+
+        if host not in self._queues:
+            self._queues[host] = deque()
+            self._hosts.append(host)
+        self._queues[host].append(state)
+        return True
+
+    async def _sync_bucket(self, robots: RobotsCache, host: str, url: str) -> None:
+        """
+        Slow the host's bucket down to its robots.txt `Crawl-delay`. Checked
+        on every URL, so a changed delay applies once robots.txt is refetched.
+        """
+        rate, burst = self.rate, self.burst
+        delay = await robots.crawl_delay(url)
+        if delay:
+            rate, burst = min(rate, 1 / delay), 1
+        bucket = self.buckets.setdefault(host, TokenBucket(rate, burst))
+        if (bucket.rate, bucket.capacity) != (rate, burst):
+            bucket.set_rate(rate, burst)
+
+    def _bucket(self, host: str) -> TokenBucket:
+        if host not in self.buckets:
+            self.buckets[host] = TokenBucket(self.rate, self.burst)
+        return self.buckets[host]
+
+    def pop_ready(self) -> CrawlState | None:
+        now = time.monotonic()
+        for _ in range(len(self._hosts)):
+            host = self._hosts[0]
+            self._hosts.rotate(-1)
+            queue = self._queues[host]
+            if (
+                queue
+                and self._in_flight[host] < self.max_per_host
+                and self._bucket(host).try_acquire(now)
+            ):
+                self._in_flight[host] += 1
+                state = queue.popleft()
+                if not queue:
+                    del self._queues[host]
+                    self._hosts.remove(host)
+                return state
+        return None
+
+    def drain(self) -> list[CrawlState]:
+        """
+        Remove and return every queued URL.
+        """
+        states = [state for queue in self._queues.values() for state in queue]
+        self._queues.clear()
+        self._hosts.clear()
+        return states
+
+    def release(self, url: str) -> None:
+        self._in_flight[self._host(url)] -= 1
+        self._changed.set()
+
+    def notify(self) -> None:
+        """
+        Wake waiters, e.g. once new URLs were submitted.
+        """
+        self._changed.set()
+
+    def next_ready_in(self) -> float:
+        """
+        Seconds until some queued host may be ready. Hosts that are only
+        blocked on concurrency wake waiters through `release`.
+        """
+        now = time.monotonic()
+        delays = [
+            self._bucket(host).delay(now)
+            for host, queue in self._queues.items()
+            if queue and self._in_flight[host] < self.max_per_host
+        ]
+        return min(delays) if delays else 1.0
+
+    async def wait(self, timeout: float) -> None:
+        self._changed.clear()
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(self._changed.wait(), timeout)
@@ -0,0 +1,100 @@
+import hashlib
+import math
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+
+    Membership tests never give false negatives; false positives happen
+    at roughly `error_rate` once `capacity` items have been added.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 1e-4):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, item: str):
+        # Kirsch-Mitzenmacher double hashing over one 128-bit digest.
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[p >> 3] & (1 << (p & 7)) for p in self._positions(item))
+
+    def add(self, item: str) -> bool:
+        """
+        Add `item`. Returns True if it was not (probably) present before.
+        """
+        added = False
+        for p in self._positions(item):
+            mask = 1 << (p & 7)
+            if not self._bits[p >> 3] & mask:
+                self._bits[p >> 3] |= mask
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    @property
+    def memory_bytes(self) -> int:
+        return len(self._bits)
+
+
+class SeenUrlSet:
+    """
+    Per-crawl set of URLs already sent to the frontier.
+
+    Backed by a chain of Bloom filters: when the newest filter reaches
+    its capacity a new one, twice as large and with a tighter error rate,
+    is appended. Memory therefore grows with the number of URLs seen while
+    the overall false-positive rate stays below `error_rate`.
+
+    A false positive means a new URL is treated as seen and skipped, so
+    keep `error_rate` small.
+    """
+
+    def __init__(self, initial_capacity: int = 10_000, error_rate: float = 1e-4):
+        self.error_rate = error_rate
+        self._filters = [BloomFilter(initial_capacity, error_rate / 2)]
+
+    def __contains__(self, url: str) -> bool:
+        return any(url in f for f in self._filters)
+
+    def __len__(self) -> int:
+        return sum(f.count for f in self._filters)
+
+    def add(self, url: str) -> bool:
+        """
+        Add `url`. Returns True if the URL had not been seen before.
+        """
+        if url in self:
+            return False
+
+        current = self._filters[-1]
+        if current.count >= current.capacity:
+            # Halving each filter's error rate keeps the sum bounded.
+            current = BloomFilter(
+                current.capacity * 2,
+                self.error_rate / 2 ** (len(self._filters) + 1),
+            )
+            self._filters.append(current)
+
+        current.add(url)
+        return True
+
+    @property
+    def memory_bytes(self) -> int:
+        return sum(f.memory_bytes for f in self._filters)
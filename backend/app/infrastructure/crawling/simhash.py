@@ -0,0 +1,123 @@
+import hashlib
+import re
+from collections import Counter
+
+BITS = 64
+SHINGLE_SIZE = 3
+# Below this many words a fingerprint says little about the page.
+MIN_WORDS = 20
+
+_WORD = re.compile(r"\w+")
+
+
+def simhash(text: str, *, min_words: int = MIN_WORDS) -> int | None:
+    """
+    64-bit SimHash of `text` over word 3-shingles.
+
+    Texts that differ in a few words (dates, ads, counters) get
+    fingerprints a few bits apart. Returns None for texts shorter than
+    `min_words`.
+    """
+    words = _WORD.findall(text.lower())
+    if len(words) < max(min_words, 1):
+        return None
+
+    shingles = Counter(
+        " ".join(words[i:i + SHINGLE_SIZE])
+        for i in range(max(1, len(words) - SHINGLE_SIZE + 1))
+    )
+
+    weights = [0] * BITS
+    for shingle, count in shingles.items():
+        h = int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), "little")
+        for bit in range(BITS):
+            weights[bit] += count if h >> bit & 1 else -count
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def to_signed(fingerprint: int) -> int:
+    """
+    Map an unsigned 64-bit fingerprint onto a Postgres BIGINT.
+    """
+    return fingerprint - (1 << BITS) if fingerprint >= 1 << (BITS - 1) else fingerprint
+
+
+def to_unsigned(value: int) -> int:
+    return value + (1 << BITS) if value < 0 else value
+
+
+class SimHashIndex:
+    """
+    Finds fingerprints within `max_distance` bits of a query.
+
+    Fingerprints are split into `max_distance + 1` bands. Two fingerprints
+    at most `max_distance` bits apart agree on at least one whole band, so
+    only fingerprints sharing a band with the query are compared.
+    """
+
+    def __init__(self, max_distance: int = 3):
+        if not 0 <= max_distance < BITS:
+            raise ValueError(f"max_distance must be between 0 and {BITS - 1}")
+
+        self.max_distance = max_distance
+        bands = max_distance + 1
+        width, extra = divmod(BITS, bands)
+        self._bands: list[tuple[int, int]] = []
+        shift = 0
+        for i in range(bands):
+            size = width + (1 if i < extra else 0)
+            self._bands.append((shift, (1 << size) - 1))
+            shift += size
+        self._tables: list[dict[int, set[str]]] = [{} for _ in self._bands]
+        self._fingerprints: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def _keys(self, fingerprint: int):
+        for table, (shift, mask) in zip(self._tables, self._bands):
+            yield table, fingerprint >> shift & mask
+
+    def add(self, key: str, fingerprint: int) -> None:
+        """
+        Index `fingerprint` under `key`, replacing any previous one.
+        """
+        self.remove(key)
+        self._fingerprints[key] = fingerprint
+        for table, band in self._keys(fingerprint):
+            table.setdefault(band, set()).add(key)
+
+    def remove(self, key: str) -> None:
+        fingerprint = self._fingerprints.pop(key, None)
+        if fingerprint is None:
+            return
+        for table, band in self._keys(fingerprint):
+            keys = table[band]
+            keys.discard(key)
+            if not keys:
+                del table[band]
+
+    def find(self, fingerprint: int, *, exclude: str | None = None) -> str | None:
+        """
+        Key of the closest indexed fingerprint within `max_distance`, if any.
+        """
+        candidates = set()
+        for table, band in self._keys(fingerprint):
+            candidates |= table.get(band, set())
+        candidates.discard(exclude)
+
+        matches = [
+            (hamming_distance(fingerprint, self._fingerprints[key]), key)
+            for key in candidates
+        ]
+        matches = [match for match in matches if match[0] <= self.max_distance]
+        return min(matches)[1] if matches else None
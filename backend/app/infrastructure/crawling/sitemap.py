@@ -0,0 +1,166 @@
+import zlib
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import AsyncIterator, Iterator, cast
+from urllib.parse import urlparse
+from xml.etree.ElementTree import Element, ParseError, XMLPullParser
+
+import httpx
+
+from app.core.logging import logger
+from app.infrastructure.crawling.politeness import RobotsCache
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+@dataclass
+class SitemapEntry:
+    url: str
+    lastmod: datetime | None = None
+
+
+def parse_lastmod(value: str | None) -> datetime | None:
+    """
+    Parse a W3C datetime as used by `<lastmod>`, from `2024-05-01` to
+    `2024-05-01T10:30:00+02:00`. Values without a timezone are taken as UTC.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    # fromisoformat only accepts a "Z" designator from Python 3.11.
+    if value.endswith(("Z", "z")):
+        value = value[:-1] + "+00:00"
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+class SitemapReader:
+    """
+    Streams URLs out of a site's sitemaps.
+
+    Sitemaps are parsed while they download, gzipped sitemaps are inflated
+    on the fly, and sitemap indexes are followed breadth-first. Memory stays
+    flat however large the sitemap: each `<url>` is dropped from the tree
+    once yielded.
+
+    `max_bytes` bounds the inflated size of one sitemap, `max_sitemaps`
+    the number of sitemaps read per site.
+    """
+
+    def __init__(
+            self,
+            client: httpx.AsyncClient,
+            *,
+            robots: RobotsCache | None = None,
+            max_bytes: int = 50 * 1024 * 1024,
+            max_sitemaps: int = 100,
+    ):
+        self.client = client
+        self.robots = robots
+        self.max_bytes = max_bytes
+        self.max_sitemaps = max_sitemaps
+
+    async def discover(self, start_url: str) -> list[str]:
+        """
+        Sitemaps announced in robots.txt, or `/sitemap.xml` if there are none.
+        """
+        if self.robots is not None:
+            sitemaps = (await self.robots.get(start_url)).site_maps()
+            if sitemaps:
+                return list(sitemaps)
+
+        parts = urlparse(start_url)
+        return [f"{parts.scheme}://{parts.netloc}/sitemap.xml"]
+
+    async def entries(self, sitemap_urls: list[str]) -> AsyncIterator[SitemapEntry]:
+        pending = deque(sitemap_urls)
+        visited: set[str] = set()
+
+        while pending and len(visited) < self.max_sitemaps:
+            sitemap_url = pending.popleft()
+            if sitemap_url in visited:
+                continue
+            visited.add(sitemap_url)
+
+            try:
+                async for is_index, entry in self._read(sitemap_url):
+                    if is_index:
+                        pending.append(entry.url)
+                    else:
+                        yield entry
+            except (httpx.HTTPError, ParseError, zlib.error) as e:
+                logger.warning(
+                    "Failed to read sitemap",
+                    extra={"sitemap_url": sitemap_url, "error": str(e)},
+                )
+
+        if pending:
+            logger.warning(
+                "Sitemap limit reached",
+                extra={"max_sitemaps": self.max_sitemaps, "skipped": len(pending)},
+            )
+
+    async def _read(self, sitemap_url: str) -> AsyncIterator[tuple[bool, SitemapEntry]]:
+        """
+        Yield `(is_index, entry)` for every `<url>` and nested `<sitemap>`.
+        """
+        async with self.client.stream("GET", sitemap_url, follow_redirects=True) as response:
+            if response.status_code != 200:
+                return
+
+            parser: XMLPullParser[Element] = XMLPullParser(events=("start", "end"))
+            root: Element | None = None
+            inflater = None
+            size = 0
+            first = True
+            async for chunk in response.aiter_bytes():
+                if first:
+                    first = False
+                    # .xml.gz files are served as-is, not Content-Encoded.
+                    if chunk.startswith(GZIP_MAGIC):
+                        inflater = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+                if inflater is not None:
+                    # Bounded, so a gzip bomb cannot inflate past the cap.
+                    chunk = inflater.decompress(chunk, self.max_bytes - size + 1)
+
+                size += len(chunk)
+                if size > self.max_bytes:
+                    logger.warning(
+                        "Sitemap too large, truncated",
+                        extra={"sitemap_url": sitemap_url, "max_bytes": self.max_bytes},
+                    )
+                    return
+
+                parser.feed(chunk)
+                # Only start and end events were asked for: (event, element) pairs.
+                events = cast(Iterator[tuple[str, Element]], parser.read_events())
+                for event, elem in events:
+                    if event == "start":
+                        root = elem if root is None else root
+                        continue
+
+                    name = _local_name(elem.tag)
+                    if name not in ("url", "sitemap") or elem is root:
+                        continue
+
+                    fields = {
+                        _local_name(child.tag): (child.text or "").strip()
+                        for child in elem
+                    }
+                    if fields.get("loc"):
+                        yield name == "sitemap", SitemapEntry(
+                            url=fields["loc"],
+                            lastmod=parse_lastmod(fields.get("lastmod")),
+                        )
+
+                    # Drop read entries so the tree does not grow with the sitemap.
+                    elem.clear()
+                    if root is not None and len(root) and root[-1] is elem:
+                        root.remove(elem)
@@ -0,0 +1,100 @@
+import posixpath
+import re
+from urllib.parse import unquote_plus, urlsplit, urlunsplit
+
+# Query parameters that only carry analytics state and never change content.
+TRACKING_PARAMS = {
+    "utm_source",
+    "utm_medium",
+    "utm_campaign",
+    "utm_term",
+    "utm_content",
+    "utm_id",
+    "gclid",
+    "dclid",
+    "fbclid",
+    "msclkid",
+    "mc_cid",
+    "mc_eid",
+    "_ga",
+    "_gl",
+    "yclid",
+}
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+_PERCENT_ESCAPE = re.compile(r"%[0-9a-fA-F]{2}")
+_UNRESERVED = set(
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~"
+)
+
+
+def _normalize_escapes(value: str) -> str:
+    """
+    Uppercase percent-escapes and decode the ones that encode unreserved
+    characters, so `%7e`, `%7E` and `~` compare equal.
+    """
+    def replace(match: re.Match) -> str:
+        char = chr(int(match.group(0)[1:], 16))
+        return char if char in _UNRESERVED else match.group(0).upper()
+
+    return _PERCENT_ESCAPE.sub(replace, value)
+
+
+def _param_name(param: str) -> str:
+    return unquote_plus(param.partition("=")[0]).lower()
+
+
+def canonicalize_url(url: str) -> str | None:
+    """
+    Reduce a URL to a canonical form for frontier deduplication.
+
+    - scheme and host are lowercased, default ports dropped
+    - dot segments and duplicate slashes are removed from the path; a
+      trailing slash is kept, as `/a/` and `/a` are different resources
+    - tracking parameters are dropped, remaining parameters sorted
+      without being decoded
+    - the fragment is dropped
+
+    Returns None for URLs that cannot be crawled (non-http schemes,
+    missing host).
+    """
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return None
+
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS:
+        return None
+
+    host = (parts.hostname or "").rstrip(".")
+    if not host:
+        return None
+
+    # hostname drops the brackets of IPv6 literals.
+    netloc = f"[{host}]" if ":" in host else host
+    if port is not None and port != DEFAULT_PORTS[scheme]:
+        netloc = f"{netloc}:{port}"
+
+    path = _normalize_escapes(parts.path)
+    if path:
+        path = posixpath.normpath(path)
+        # normpath keeps a leading "//", which is still a single root.
+        path = "/" + path.lstrip("/") if path != "." else "/"
+    if not path or path == "/":
+        path = "/"
+    elif parts.path.endswith(("/", "/.", "/..")):
+        # normpath drops the trailing slash of a directory.
+        path += "/"
+
+    # Parameters are sorted as written: decoding and re-encoding them
+    # would change what some servers receive, e.g. `%2F` or `+`.
+    query = "&".join(sorted(
+        _normalize_escapes(param)
+        for param in parts.query.split("&")
+        if param and _param_name(param) not in TRACKING_PARAMS
+    ))
+
+    return urlunsplit((scheme, netloc, path, query, ""))
@@ -1,48 +1,427 @@
 import uuid
 from datetime import datetime
+from typing import NamedTuple
 from app.domain.models.crawl_state import CrawlState
 
+class Completion(NamedTuple):
+    """
+    A successfully crawled URL and the validators to send on the next visit.
+    """
+    state_id: str
+    etag: str | None = None
+    last_modified: str | None = None
+    checksum: str | None = None
+
 class UrlQueueRepository:
     def __init__(self, db):
         self.db = db
 
-    async def add_url(self, site_id: str, url: str) -> None:
+    async def add_url(
+            self,
+            site_id: int,
+            url: str,
+            *,
+            depth: int = 0,
+            parent_url: str | None = None,
+            priority: int = 0,
+    ) -> None:
         await self.db.execute(
             """
-            INSERT INTO crawl_state (id, site_id, url, status, discovered_at)
-            VALUES ($1, $2, $3, 'pending', $4)
+            INSERT INTO crawl_state (
+                id, site_id, url, status, discovered_at, depth, parent_url, priority
+            )
+            VALUES (
+                %(id)s, %(site_id)s, %(url)s, 'pending', %(discovered_at)s,
+                %(depth)s, %(parent_url)s, %(priority)s
+            )
             ON CONFLICT (site_id, url) DO NOTHING
             """,
-            str(uuid.uuid4()), site_id, url, datetime.utcnow()
+            {
+                "id": str(uuid.uuid4()),
+                "site_id": site_id,
+                "url": url,
+                "discovered_at": datetime.utcnow(),
+                "depth": depth,
+                "parent_url": parent_url,
+                "priority": priority,
+            },
         )
 
-    async def get_next_pending(self, site_id: str) -> CrawlState | None:
-        row = await self.db.fetchrow(
+    async def add_urls(
+            self,
+            site_id: int,
+            urls: list[str],
+            *,
+            depth: int = 0,
+            parent_url: str | None = None,
+            priority: int = 0,
+    ) -> int:
+        """
+        Queue many URLs in a single statement.
+
+        Duplicates are dropped in memory first; URLs already in the
+        frontier are ignored by the conflict clause, exactly as `add_url`.
+        All URLs share `depth`, `parent_url` and `priority`, which is the
+        case for the links of one page.
+        Returns the number of newly queued URLs.
+        """
+        unique_urls = list(dict.fromkeys(urls))
+        if not unique_urls:
+            return 0
+
+        return await self._execute_rowcount(
+            """
+            INSERT INTO crawl_state (
+                id, site_id, url, status, discovered_at, depth, parent_url, priority
+            )
+            SELECT gen_random_uuid()::text, %(site_id)s, u.url, 'pending', %(discovered_at)s,
+                   %(depth)s, %(parent_url)s, %(priority)s
+            FROM unnest(%(urls)s::text[]) AS u(url)
+            ON CONFLICT (site_id, url) DO NOTHING
+            """,
+            {
+                "site_id": site_id,
+                "urls": unique_urls,
+                "discovered_at": datetime.utcnow(),
+                "depth": depth,
+                "parent_url": parent_url,
+                "priority": priority,
+            },
+        )
+
+    async def claim_batch(
+            self,
+            site_id: int,
+            n: int,
+            *,
+            worker_id: str | None = None,
+            lease_seconds: int = 300,
+    ) -> list[CrawlState]:
+        """
+        Atomically lease up to `n` claimable URLs for `worker_id`.
+
+        Claimable rows are pending rows and in-progress rows whose lease
+        has expired, highest priority first, then shallowest. `SKIP LOCKED`
+        lets any number of workers claim from the same frontier concurrently
+        without blocking or double-leasing.
+        """
+        rows = await self._fetchall_commit(
             """
-            SELECT * FROM crawl_state
-            WHERE site_id=$1 AND status='pending'
-            ORDER BY discovered_at ASC
-            LIMIT 1
-            """, site_id
+            UPDATE crawl_state AS c
+            SET status='in_progress',
+                leased_by=%(worker_id)s,
+                lease_expires_at=NOW() + make_interval(secs => %(lease_seconds)s)
+            FROM (
+                SELECT id FROM crawl_state
+                WHERE site_id=%(site_id)s
+                  AND (
+                    status='pending'
+                    OR (status='in_progress' AND lease_expires_at < NOW())
+                  )
+                ORDER BY priority DESC, depth ASC, discovered_at ASC
+                LIMIT %(n)s
+                FOR UPDATE SKIP LOCKED
+            ) AS claimed
+            WHERE c.id = claimed.id
+            RETURNING c.*
+            """,
+            {
+                "site_id": site_id,
+                "n": n,
+                "worker_id": worker_id,
+                "lease_seconds": lease_seconds,
+            },
         )
 
-        if not row:
-            return None
+        states = [CrawlState(**row) for row in rows]
+        states.sort(key=lambda s: (-s.priority, s.depth, s.discovered_at))
+        return states
 
-        return CrawlState(**row)
+    async def complete_batch(self, completions: list[Completion], *, worker_id: str) -> None:
+        """
+        Mark many URLs as crawled. URLs no longer leased by `worker_id`,
+        e.g. reclaimed after its lease expired, are left to their new owner.
+        """
+        if not completions:
+            return
 
-    async def mark_success(self, state_id: str) -> None:
+        ids, etags, last_modifieds, checksums = (list(col) for col in zip(*completions))
         await self.db.execute(
             """
-            UPDATE crawl_state SET status='success', fetched_at=$2 WHERE id=$1
+            UPDATE crawl_state AS c
+            SET status='success',
+                fetched_at=NOW(),
+                last_error=NULL,
+                leased_by=NULL,
+                lease_expires_at=NULL,
+                etag=COALESCE(f.etag, c.etag),
+                last_modified=COALESCE(f.last_modified, c.last_modified),
+                checksum=COALESCE(f.checksum, c.checksum)
+            FROM unnest(
+                %(ids)s::text[],
+                %(etags)s::text[],
+                %(last_modifieds)s::text[],
+                %(checksums)s::text[]
+            ) AS f(id, etag, last_modified, checksum)
+            WHERE c.id = f.id AND c.status='in_progress' AND c.leased_by=%(worker_id)s
             """,
-            state_id, datetime.utcnow()
+            {
+                "worker_id": worker_id,
+                "ids": ids,
+                "etags": etags,
+                "last_modifieds": last_modifieds,
+                "checksums": checksums,
+            },
         )
 
-    async def mark_error(self, state_id: str, error: str) -> None:
+    async def fail_batch(self, failures: list[tuple[str, str]], *, worker_id: str) -> None:
+        """
+        Mark many URLs as failed. `failures` is a list of (state_id, error).
+        As with `complete_batch`, only URLs leased by `worker_id` change.
+        """
+        if not failures:
+            return
+
+        ids, errors = zip(*failures)
         await self.db.execute(
             """
-            UPDATE crawl_state SET status='error', last_error=$2 WHERE id=$1
+            UPDATE crawl_state AS c
+            SET status='error',
+                last_error=f.error,
+                leased_by=NULL,
+                lease_expires_at=NULL
+            FROM unnest(%(ids)s::text[], %(errors)s::text[]) AS f(id, error)
+            WHERE c.id = f.id AND c.status='in_progress' AND c.leased_by=%(worker_id)s
             """,
-            state_id, error
-        )
\ No newline at end of file
+            {"worker_id": worker_id, "ids": list(ids), "errors": list(errors)},
+        )
+
+    async def requeue_site(self, site_id: int) -> int:
+        """
+        Put every finished URL of a site back into the pending pool for a
+        recrawl. Validators and checksums are kept, so unchanged pages can
+        be skipped cheaply.
+        """
+        return await self._execute_rowcount(
+            """
+            UPDATE crawl_state
+            SET status='pending', leased_by=NULL, lease_expires_at=NULL
+            WHERE site_id=%(site_id)s AND status IN ('success', 'error')
+            """,
+            {"site_id": site_id},
+        )
+
+    async def requeue_urls(
+            self,
+            site_id: int,
+            urls: list[str],
+            *,
+            depth: int = 0,
+            priority: int = 0,
+    ) -> int:
+        """
+        Queue URLs for a recrawl: new URLs are added, finished ones are put
+        back into the pending pool with their validators, like
+        `requeue_site` but limited to `urls`.
+        Returns the number of URLs queued.
+        """
+        unique_urls = list(dict.fromkeys(urls))
+        if not unique_urls:
+            return 0
+
+        return await self._execute_rowcount(
+            """
+            INSERT INTO crawl_state (
+                id, site_id, url, status, discovered_at, depth, priority
+            )
+            SELECT gen_random_uuid()::text, %(site_id)s, u.url, 'pending', %(discovered_at)s,
+                   %(depth)s, %(priority)s
+            FROM unnest(%(urls)s::text[]) AS u(url)
+            ON CONFLICT (site_id, url) DO UPDATE
+            SET status='pending', leased_by=NULL, lease_expires_at=NULL,
+                priority=GREATEST(crawl_state.priority, EXCLUDED.priority)
+            WHERE crawl_state.status IN ('success', 'error')
+            """,
+            {
+                "site_id": site_id,
+                "urls": unique_urls,
+                "discovered_at": datetime.utcnow(),
+                "depth": depth,
+                "priority": priority,
+            },
+        )
+
+    async def heartbeat(self, worker_id: str, lease_seconds: int = 300) -> int:
+        """
+        Extend every lease held by `worker_id`. Returns the number of leases kept alive.
+        """
+        return await self._execute_rowcount(
+            """
+            UPDATE crawl_state
+            SET lease_expires_at=NOW() + make_interval(secs => %(lease_seconds)s)
+            WHERE leased_by=%(worker_id)s AND status='in_progress'
+            """,
+            {"worker_id": worker_id, "lease_seconds": lease_seconds},
+        )
+
+    async def reclaim_expired(self) -> int:
+        """
+        Return URLs whose lease has lapsed (dead or stalled workers) to the
+        pending pool. Returns the number of reclaimed URLs.
+        """
+        return await self._execute_rowcount(
+            """
+            UPDATE crawl_state
+            SET status='pending', leased_by=NULL, lease_expires_at=NULL
+            WHERE status='in_progress' AND lease_expires_at < NOW()
+            """,
+            {},
+        )
+
+    async def release(self, worker_id: str) -> int:
+        """
+        Hand back every lease held by `worker_id`, e.g. on graceful shutdown.
+        """
+        return await self._execute_rowcount(
+            """
+            UPDATE crawl_state
+            SET status='pending', leased_by=NULL, lease_expires_at=NULL
+            WHERE leased_by=%(worker_id)s AND status='in_progress'
+            """,
+            {"worker_id": worker_id},
+        )
+
+    async def release_site(self, site_id: int, worker_id: str) -> int:
+        """
+        Hand back the leases `worker_id` holds on one site's URLs.
+        """
+        return await self._execute_rowcount(
+            """
+            UPDATE crawl_state
+            SET status='pending', leased_by=NULL, lease_expires_at=NULL
+            WHERE site_id=%(site_id)s AND leased_by=%(worker_id)s AND status='in_progress'
+            """,
+            {"site_id": site_id, "worker_id": worker_id},
+        )
+
+    async def release_batch(self, state_ids: list[str]) -> int:
+        """
+        Hand back specific leased URLs without crawling them.
+        """
+        if not state_ids:
+            return 0
+
+        return await self._execute_rowcount(
+            """
+            UPDATE crawl_state
+            SET status='pending', leased_by=NULL, lease_expires_at=NULL
+            WHERE id = ANY(%(ids)s) AND status='in_progress'
+            """,
+            {"ids": state_ids},
+        )
+
+    async def count_pending(self, site_id: int) -> int:
+        row = await self.db.fetchone(
+            """
+            SELECT COUNT(*) AS pending FROM crawl_state
+            WHERE site_id=%(site_id)s AND status IN ('pending', 'in_progress')
+            """,
+            {"site_id": site_id},
+        )
+        return row["pending"] if row else 0
+
+    async def sites_with_work(self) -> list[int]:
+        """
+        Ids of sites that currently have claimable URLs.
+        """
+        rows = await self.db.fetchall(
+            """
+            SELECT DISTINCT site_id FROM crawl_state
+            WHERE status='pending'
+               OR (status='in_progress' AND lease_expires_at < NOW())
+            ORDER BY site_id
+            """
+        )
+        return [row["site_id"] for row in rows]
+
+    async def request_seed(self, site_id: int, *, recrawl: bool = False) -> None:
+        """
+        Queue the seeding of a site's frontier for the crawl workers.
+
+        A request for a site already being seeded takes its lease away,
+        so the site is seeded again once the current seeding is done.
+        """
+        await self.db.execute(
+            """
+            INSERT INTO crawl_seeds (site_id, recrawl)
+            VALUES (%(site_id)s, %(recrawl)s)
+            ON CONFLICT (site_id) DO UPDATE
+            SET recrawl = crawl_seeds.recrawl OR EXCLUDED.recrawl,
+                requested_at = NOW(),
+                leased_by = NULL,
+                lease_expires_at = NULL
+            """,
+            {"site_id": site_id, "recrawl": recrawl},
+        )
+
+    async def claim_seed(self, worker_id: str, lease_seconds: int = 300) -> tuple[int, bool] | None:
+        """
+        Lease the oldest seed request nobody holds. Returns the site id and
+        whether it is a recrawl, or None when there is nothing to seed.
+        """
+        rows = await self._fetchall_commit(
+            """
+            UPDATE crawl_seeds AS s
+            SET leased_by=%(worker_id)s,
+                lease_expires_at=NOW() + make_interval(secs => %(lease_seconds)s)
+            FROM (
+                SELECT site_id FROM crawl_seeds
+                WHERE leased_by IS NULL OR lease_expires_at < NOW()
+                ORDER BY requested_at
+                LIMIT 1
+                FOR UPDATE SKIP LOCKED
+            ) AS claimable
+            WHERE s.site_id = claimable.site_id
+            RETURNING s.site_id, s.recrawl
+            """,
+            {"worker_id": worker_id, "lease_seconds": lease_seconds},
+        )
+        return (rows[0]["site_id"], rows[0]["recrawl"]) if rows else None
+
+    async def finish_seed(self, site_id: int, worker_id: str) -> bool:
+        """
+        Drop a seed request once `worker_id` has seeded the site. A request
+        made again meanwhile is kept.
+        """
+        return bool(await self._execute_rowcount(
+            """
+            DELETE FROM crawl_seeds
+            WHERE site_id=%(site_id)s AND leased_by=%(worker_id)s
+            """,
+            {"site_id": site_id, "worker_id": worker_id},
+        ))
+
+    async def heartbeat_seeds(self, worker_id: str, lease_seconds: int = 300) -> int:
+        """
+        Extend the seed leases held by `worker_id`.
+        """
+        return await self._execute_rowcount(
+            """
+            UPDATE crawl_seeds
+            SET lease_expires_at=NOW() + make_interval(secs => %(lease_seconds)s)
+            WHERE leased_by=%(worker_id)s
+            """,
+            {"worker_id": worker_id, "lease_seconds": lease_seconds},
+        )
+
+    async def _execute_rowcount(self, query: str, params: dict) -> int:
+        async with self.db.transaction() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(query, params)
+                return cur.rowcount
+
+    async def _fetchall_commit(self, query: str, params: dict) -> list:
+        async with self.db.transaction() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(query, params)
+                return await cur.fetchall()
@@ -75,5 +75,135 @@ CREATE TABLE IF NOT EXISTS pages (
     UNIQUE (site_id, url)
 );
 
+ALTER TABLE pages
+    ALTER COLUMN html DROP NOT NULL,
+    ADD COLUMN IF NOT EXISTS raw_html TEXT,
+    ADD COLUMN IF NOT EXISTS fetched_at TIMESTAMP WITH TIME ZONE,
+    ADD COLUMN IF NOT EXISTS checksum TEXT;
 
 
+-- Crawl frontier
+
+CREATE TABLE IF NOT EXISTS crawl_state (
+    id TEXT PRIMARY KEY,
+    site_id INTEGER NOT NULL REFERENCES sites(id) ON DELETE CASCADE,
+    url TEXT NOT NULL,
+    status TEXT NOT NULL,  -- 'pending', 'in_progress', 'success', 'error'
+    discovered_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    fetched_at TIMESTAMP WITH TIME ZONE,
+    last_error TEXT,
+    UNIQUE (site_id, url)
+);
+
+CREATE INDEX IF NOT EXISTS crawl_state_site_status_idx
+    ON crawl_state (site_id, status, discovered_at);
+
+ALTER TABLE crawl_state
+    ADD COLUMN IF NOT EXISTS leased_by TEXT,
+    ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMP WITH TIME ZONE;
+
+CREATE INDEX IF NOT EXISTS crawl_state_claimable_idx
+    ON crawl_state (site_id, discovered_at)
+    WHERE status IN ('pending', 'in_progress');
+
+-- Validators used by incremental recrawls
+ALTER TABLE crawl_state
+    ADD COLUMN IF NOT EXISTS etag TEXT,
+    ADD COLUMN IF NOT EXISTS last_modified TEXT,
+    ADD COLUMN IF NOT EXISTS checksum TEXT;
+
+-- Page bodies, stored once per distinct content and compressed.
+-- pages.checksum references page_blobs.checksum.
+CREATE TABLE IF NOT EXISTS page_blobs (
+    checksum TEXT PRIMARY KEY,          -- SHA-256 of the uncompressed body
+    codec TEXT NOT NULL,                -- 'zstd' or 'zlib'
+    data BYTEA NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    stored_bytes INTEGER NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS pages_checksum_idx ON pages (checksum);
+
+-- Depth-aware priority frontier
+ALTER TABLE crawl_state
+    ADD COLUMN IF NOT EXISTS depth INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS parent_url TEXT,
+    ADD COLUMN IF NOT EXISTS priority INTEGER NOT NULL DEFAULT 0;
+
+DROP INDEX IF EXISTS crawl_state_claimable_idx;
+CREATE INDEX IF NOT EXISTS crawl_state_claimable_idx
+    ON crawl_state (site_id, priority DESC, depth, discovered_at)
+    WHERE status IN ('pending', 'in_progress');
+
+-- Crawl job progress and control
+ALTER TABLE crawl_jobs
+    ADD COLUMN IF NOT EXISTS incremental BOOLEAN NOT NULL DEFAULT FALSE,
+    ADD COLUMN IF NOT EXISTS pages_fetched INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS pages_failed INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS pages_unchanged INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS pages_per_sec REAL NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS queue_depth INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW();
+-- status: 'pending', 'running', 'paused', 'completed', 'failed', 'cancelled'
+
+-- Near-duplicate detection
+ALTER TABLE pages
+    ADD COLUMN IF NOT EXISTS simhash BIGINT,
+    ADD COLUMN IF NOT EXISTS duplicate_of TEXT;
+
+CREATE INDEX IF NOT EXISTS pages_site_unique_idx
+    ON pages (site_id)
+    WHERE duplicate_of IS NULL;
+
+-- Crawl job checkpoints
+ALTER TABLE crawl_jobs
+    ADD COLUMN IF NOT EXISTS worker_id TEXT;
+-- status: 'interrupted' marks jobs stopped by a shutdown, resumable
+CREATE INDEX IF NOT EXISTS crawl_jobs_active_idx
+    ON crawl_jobs (updated_at)
+    WHERE status IN ('running', 'paused', 'interrupted');
+
+-- Artifact ingestion queue
+-- status: 'created', 'queued', 'processing', 'ready', 'failed'
+ALTER TABLE artifacts
+    ADD COLUMN IF NOT EXISTS attempts INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS available_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    ADD COLUMN IF NOT EXISTS leased_by TEXT,
+    ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMP WITH TIME ZONE,
+    ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW();
+
+CREATE INDEX IF NOT EXISTS artifacts_claimable_idx
+    ON artifacts (available_at, id)
+    WHERE status IN ('queued', 'processing');
+
+-- One artifact per distinct content and source; re-uploads reuse it.
+CREATE UNIQUE INDEX IF NOT EXISTS artifacts_source_content_hash_idx
+    ON artifacts (source_id, content_hash)
+    WHERE content_hash IS NOT NULL;
+
+-- Blob garbage collection looks up artifacts by content across sources.
+CREATE INDEX IF NOT EXISTS artifacts_content_hash_idx
+    ON artifacts (content_hash)
+    WHERE content_hash IS NOT NULL;
+
+-- Start of the crawl workers are draining, if any. It becomes the site's
+-- last_crawled_at once its frontier is drained.
+ALTER TABLE sites
+    ADD COLUMN IF NOT EXISTS crawl_started_at TIMESTAMP WITH TIME ZONE;
+
+-- Crawls queued in workers mode, until a crawl worker has seeded the
+-- frontier with their start_url and sitemaps.
+CREATE TABLE IF NOT EXISTS crawl_seeds (
+    site_id INTEGER PRIMARY KEY REFERENCES sites(id) ON DELETE CASCADE,
+    recrawl BOOLEAN NOT NULL DEFAULT FALSE,
+    requested_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    leased_by TEXT,
+    lease_expires_at TIMESTAMP WITH TIME ZONE
+);
+
+-- Last time a page was written with the blob; orphaned blobs are only
+-- deleted once this is older than a grace period.
+ALTER TABLE page_blobs
+    ADD COLUMN IF NOT EXISTS referenced_at TIMESTAMP WITH TIME ZONE DEFAULT NOW();
@@ -0,0 +1,94 @@
+import io
+import re
+import time
+from pathlib import Path
+from typing import Callable
+
+from app.domain.ingestion.mime_registry import MimeRegistry
+from app.infrastructure.crawling.html_parser import analyze_html
+
+try:
+    import pypdf
+except ImportError:  # optional dependency
+    pypdf = None  # type: ignore[assignment]
+
+# Extractors turn the raw bytes of an artifact into text. They are plain
+# module-level functions, so they can be sent to a process pool.
+Extractor = Callable[[bytes], str]
+
+_FRONT_MATTER_RE = re.compile(r"\A---\n.*?\n---\n", re.S)
+
+
+class UnreadableContentError(Exception):
+    """
+    The content is corrupt or in a form its extractor cannot read, so
+    extracting it again is pointless.
+    """
+
+
+def decode_text(data: bytes) -> str:
+    if data.startswith(b"\xef\xbb\xbf"):
+        return data[3:].decode("utf-8", errors="replace")
+    if data.startswith((b"\xff\xfe", b"\xfe\xff")):
+        return data.decode("utf-16", errors="replace")
+    return data.decode("utf-8", errors="replace")
+
+
+def extract_text(data: bytes) -> str:
+    return decode_text(data).replace("\r\n", "\n")
+
+
+def extract_markdown(data: bytes) -> str:
+    """
+    Markdown is kept as is, headings included, minus YAML front matter.
+    """
+    return _FRONT_MATTER_RE.sub("", extract_text(data), count=1)
+
+
+def extract_html(data: bytes) -> str:
+    return analyze_html(decode_text(data), "", []).text
+
+
+def extract_pdf(data: bytes) -> str:
+    """
+    Text of a PDF, with `pypdf`. Only registered when it is installed.
+    """
+    try:
+        reader = pypdf.PdfReader(io.BytesIO(data))
+        return "\n\n".join(page.extract_text() or "" for page in reader.pages)
+    except pypdf.errors.PdfReadError as e:
+        raise UnreadableContentError(f"Unreadable PDF: {e}") from e
+
+
+def timed(extractor: Extractor, data: bytes) -> tuple[str, float]:
+    """
+    Run `extractor`, timing it where it runs (e.g. in a pool process).
+    """
+    started = time.perf_counter()
+    text = extractor(data)
+    return text, time.perf_counter() - started
+
+
+def timed_file(extractor: Extractor, path: Path) -> tuple[str, float]:
+    """
+    `timed`, reading `path` where the extractor runs, so the file's bytes
+    are never sent to a pool process.
+    """
+    return timed(extractor, path.read_bytes())
+
+
+def default_extractors() -> MimeRegistry[Extractor]:
+    return MimeRegistry(
+        {
+            "text/*": extract_text,
+            "text/markdown": extract_markdown,
+            "text/x-markdown": extract_markdown,
+            "text/html": extract_html,
+            "application/xhtml+xml": extract_html,
+            "application/json": extract_text,
+            "application/xml": extract_text,
+            "application/x-ndjson": extract_text,
+            # Without pypdf, PDFs are not queued for ingestion at all.
+            **({"application/pdf": extract_pdf} if pypdf is not None else {}),
+        }
+    )
@@ -0,0 +1,52 @@
+from app.domain.ingestion.mime_registry import normalize_mime
+
+# Types that say nothing about the content; worth sniffing.
+GENERIC_MIME_TYPES = ("", "application/octet-stream", "binary/octet-stream", "application/unknown")
+
+# (offset, magic bytes, MIME type)
+_SIGNATURES = (
+    (0, b"%PDF-", "application/pdf"),
+    (0, b"PK\x03\x04", "application/zip"),
+    (0, b"PK\x05\x06", "application/zip"),
+    (0, b"\x1f\x8b", "application/gzip"),
+    (0, b"\x89PNG\r\n\x1a\n", "image/png"),
+    (0, b"\xff\xd8\xff", "image/jpeg"),
+    (0, b"GIF87a", "image/gif"),
+    (0, b"GIF89a", "image/gif"),
+    (257, b"ustar", "application/x-tar"),
+)
+
+_HTML_MARKERS = (b"<!doctype html", b"<html", b"<head", b"<body")
+_TEXT_BOMS = (b"\xef\xbb\xbf", b"\xff\xfe", b"\xfe\xff")
+
+
+def is_generic(mime_type: str | None) -> bool:
+    return normalize_mime(mime_type) in GENERIC_MIME_TYPES
+
+
+def sniff_mime(head: bytes) -> str | None:
+    """
+    MIME type of content starting with `head` (its first 512 bytes or
+    so), from magic bytes, or None if it cannot be told.
+    """
+    for offset, magic, mime_type in _SIGNATURES:
+        if head[offset:offset + len(magic)] == magic:
+            return mime_type
+
+    if head.startswith(_TEXT_BOMS):
+        return "text/plain"
+    if b"\x00" in head:
+        return None
+
+    start = head.lstrip().lower()
+    if start.startswith(_HTML_MARKERS) or any(m in start for m in _HTML_MARKERS[2:]):
+        return "text/html"
+    if start.startswith(b"<?xml"):
+        return "application/xml"
+    try:
+        head.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut off at the end of `head` is fine.
+        if e.start < len(head) - 3:
+            return None
+    return "text/plain"
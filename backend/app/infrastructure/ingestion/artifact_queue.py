@@ -0,0 +1,188 @@
+from typing import Any
+
+from psycopg.types.json import Json
+
+from app.domain.models.artifact import Artifact
+
+
+class ArtifactQueueRepository:
+    """
+    Ingestion queue over the `artifacts` table.
+
+    Status transitions:
+        created -> queued -> processing -> ready
+                     ^           |
+                     +-- retry --+--> failed
+
+    Artifacts are owned through leases, like crawl URLs: a worker that
+    dies leaves its artifacts to be reclaimed once the lease expires.
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    async def enqueue(self, artifact_id: int) -> bool:
+        """
+        Queue an artifact for (re-)ingestion. Returns False if it is
+        unknown or already queued or being processed.
+        """
+        count = await self._execute_rowcount(
+            """
+            UPDATE artifacts
+            SET status='queued', attempts=0, error=NULL,
+                available_at=NOW(), updated_at=NOW()
+            WHERE id=%(id)s AND status IN ('created', 'ready', 'failed')
+            """,
+            {"id": artifact_id},
+        )
+        return count > 0
+
+    async def enqueue_many(self, artifact_ids: list[int]) -> int:
+        """
+        `enqueue` for many artifacts in one statement. Returns how many
+        were queued.
+        """
+        if not artifact_ids:
+            return 0
+        return await self._execute_rowcount(
+            """
+            UPDATE artifacts
+            SET status='queued', attempts=0, error=NULL,
+                available_at=NOW(), updated_at=NOW()
+            WHERE id = ANY(%(ids)s) AND status IN ('created', 'ready', 'failed')
+            """,
+            {"ids": artifact_ids},
+        )
+
+    async def claim_batch(
+            self,
+            n: int,
+            *,
+            worker_id: str,
+            lease_seconds: int = 300,
+    ) -> list[Artifact]:
+        """
+        Atomically lease up to `n` due artifacts for `worker_id`.
+
+        Due artifacts are queued ones whose retry delay has passed and
+        processing ones whose lease expired, oldest first. `SKIP LOCKED`
+        lets any number of workers claim concurrently.
+        """
+        rows = await self._fetchall_commit(
+            """
+            UPDATE artifacts AS a
+            SET status='processing',
+                attempts=a.attempts + 1,
+                leased_by=%(worker_id)s,
+                lease_expires_at=NOW() + make_interval(secs => %(lease_seconds)s),
+                updated_at=NOW()
+            FROM (
+                SELECT id FROM artifacts
+                WHERE (status='queued' AND available_at <= NOW())
+                   OR (status='processing' AND lease_expires_at < NOW())
+                ORDER BY available_at ASC, id ASC
+                LIMIT %(n)s
+                FOR UPDATE SKIP LOCKED
+            ) AS claimed
+            WHERE a.id = claimed.id
+            RETURNING a.*
+            """,
+            {"n": n, "worker_id": worker_id, "lease_seconds": lease_seconds},
+        )
+        return sorted((Artifact(**row) for row in rows), key=lambda a: a.id)
+
+    async def complete(
+            self,
+            artifact_id: int,
+            metadata: dict[str, Any] | None = None,
+            *,
+            worker_id: str,
+    ) -> bool:
+        """
+        Mark an artifact leased by `worker_id` as ingested. Returns False
+        if the lease was lost, e.g. reclaimed by another worker after it
+        expired: the artifact is then left to its new owner.
+        """
+        count = await self._execute_rowcount(
+            """
+            UPDATE artifacts
+            SET status='ready', error=NULL,
+                metadata=metadata || %(metadata)s::jsonb,
+                leased_by=NULL, lease_expires_at=NULL, updated_at=NOW()
+            WHERE id=%(id)s AND status='processing' AND leased_by=%(worker_id)s
+            """,
+            {"id": artifact_id, "metadata": Json(metadata or {}), "worker_id": worker_id},
+        )
+        return count > 0
+
+    async def retry(self, artifact_id: int, error: str, delay: float, *, worker_id: str) -> bool:
+        """
+        Put a failed attempt back in the queue, due in `delay` seconds.
+        As with `complete`, only an artifact leased by `worker_id` changes.
+        """
+        count = await self._execute_rowcount(
+            """
+            UPDATE artifacts
+            SET status='queued', error=%(error)s,
+                available_at=NOW() + make_interval(secs => %(delay)s),
+                leased_by=NULL, lease_expires_at=NULL, updated_at=NOW()
+            WHERE id=%(id)s AND status='processing' AND leased_by=%(worker_id)s
+            """,
+            {"id": artifact_id, "error": error, "delay": delay, "worker_id": worker_id},
+        )
+        return count > 0
+
+    async def fail(self, artifact_id: int, error: str, *, worker_id: str) -> bool:
+        """
+        Give up on an artifact leased by `worker_id`, as with `complete`.
+        """
+        count = await self._execute_rowcount(
+            """
+            UPDATE artifacts
+            SET status='failed', error=%(error)s,
+                leased_by=NULL, lease_expires_at=NULL, updated_at=NOW()
+            WHERE id=%(id)s AND status='processing' AND leased_by=%(worker_id)s
+            """,
+            {"id": artifact_id, "error": error, "worker_id": worker_id},
+        )
+        return count > 0
+
+    async def heartbeat(self, worker_id: str, lease_seconds: int = 300) -> int:
+        """
+        Extend every lease held by `worker_id`.
+        """
+        return await self._execute_rowcount(
+            """
+            UPDATE artifacts
+            SET lease_expires_at=NOW() + make_interval(secs => %(lease_seconds)s)
+            WHERE leased_by=%(worker_id)s AND status='processing'
+            """,
+            {"worker_id": worker_id, "lease_seconds": lease_seconds},
+        )
+
+    async def release(self, worker_id: str) -> int:
+        """
+        Hand back every lease held by `worker_id`, e.g. on graceful
+        shutdown. The interrupted attempt does not count as a retry.
+        """
+        return await self._execute_rowcount(
+            """
+            UPDATE artifacts
+            SET status='queued', attempts=GREATEST(attempts - 1, 0),
+                leased_by=NULL, lease_expires_at=NULL, updated_at=NOW()
+            WHERE leased_by=%(worker_id)s AND status='processing'
+            """,
+            {"worker_id": worker_id},
+        )
+
+    async def _execute_rowcount(self, query: str, params: dict) -> int:
+        async with self.db.transaction() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(query, params)
+                return cur.rowcount
+
+    async def _fetchall_commit(self, query: str, params: dict) -> list:
+        async with self.db.transaction() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(query, params)
+                return await cur.fetchall()
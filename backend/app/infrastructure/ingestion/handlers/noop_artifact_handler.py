@@ -7,8 +7,8 @@ class NoOpArtifactHandler(ArtifactHandler):
     """
     No-op artifact handler.
 
-    Used as a placeholder until real parsing handlers are implemented.
-    Ensures artifact ingestion does not fail at runtime.
+    Registered for MIME types no extractor handles: such artifacts are
+    logged and left alone instead of failing in the ingest queue.
     """
 
     async def enqueue(self, artifact: Artifact) -> None:
@@ -0,0 +1,42 @@
+from typing import Callable
+
+from app.domain.ingestion.artifact_handler import ArtifactHandler
+from app.domain.models.artifact import Artifact
+from app.infrastructure.ingestion.artifact_queue import ArtifactQueueRepository
+from app.core.logging import logger
+
+
+class QueuedArtifactHandler(ArtifactHandler):
+    """
+    Queues artifacts for ingestion by the ingest workers.
+
+    The artifact must be committed before `enqueue` runs, since the queue
+    is the artifact row itself. `on_enqueued` lets a worker pool in the
+    same process pick the artifact up without waiting for its next poll.
+    """
+
+    def __init__(
+            self,
+            queue: ArtifactQueueRepository,
+            on_enqueued: Callable[[], None] | None = None,
+    ):
+        self.queue = queue
+        self.on_enqueued = on_enqueued
+
+    async def enqueue(self, artifact: Artifact) -> None:
+        queued = await self.queue.enqueue(artifact.id)
+        logger.info(
+            "Artifact queued for ingestion" if queued else "Artifact already queued",
+            extra={"artifact_id": artifact.id, "mime_type": artifact.mime_type},
+        )
+        if queued and self.on_enqueued is not None:
+            self.on_enqueued()
+
+    async def enqueue_many(self, artifacts: list[Artifact]) -> None:
+        queued = await self.queue.enqueue_many([artifact.id for artifact in artifacts])
+        logger.info(
+            "Artifacts queued for ingestion",
+            extra={"count": len(artifacts), "queued": queued},
+        )
+        if queued and self.on_enqueued is not None:
+            self.on_enqueued()
@@ -1,4 +1,6 @@
 import psycopg
+from psycopg.rows import dict_row
+from psycopg.types.json import Json
 from typing import Optional, Any
 
 from app.core.database import Database
@@ -41,6 +43,7 @@ class PostgresArtifactRepository(ArtifactRepository):
         mime_type: str,
         path: str,
         size_bytes: int,
+        content_hash: str | None = None,
         conn: psycopg.AsyncConnection,
     ) -> Artifact:
         query = """
@@ -49,15 +52,19 @@ class PostgresArtifactRepository(ArtifactRepository):
                 type,
                 mime_type,
                 path,
-                size_bytes
+                size_bytes,
+                content_hash
             )
             VALUES (
                 %(source_id)s,
                 %(type)s,
                 %(mime_type)s,
                 %(path)s,
-                %(size_bytes)s
+                %(size_bytes)s,
+                %(content_hash)s
             )
+            ON CONFLICT (source_id, content_hash) WHERE content_hash IS NOT NULL
+            DO NOTHING
             RETURNING *
         """
         params = {
@@ -66,15 +73,107 @@ class PostgresArtifactRepository(ArtifactRepository):
             "mime_type": mime_type,
             "path": path,
             "size_bytes": size_bytes,
+            "content_hash": content_hash,
         }
 
         row = await self._fetchone(query, params, conn=conn)
+        if not row and content_hash is not None:
+            # A concurrent upload of the same content won the race.
+            existing = await self.get_by_content_hash(source_id, content_hash, conn=conn)
+            if existing:
+                return existing
         if not row:
             raise RuntimeError("Artifact insert failed")
 
         logger.info("Created artifact", extra={"artifact_id": row["id"]})
         return Artifact(**row)
 
+    async def create_many(
+            self,
+            artifacts: list[dict[str, Any]],
+            *,
+            conn: psycopg.AsyncConnection,
+    ) -> list[Artifact]:
+        """
+        One COPY into a temporary table and one INSERT ... SELECT, however
+        many artifacts there are. COPY cannot skip conflicting rows, the
+        INSERT can.
+        """
+        if not artifacts:
+            return []
+
+        columns = ("source_id", "type", "mime_type", "path", "size_bytes", "content_hash", "metadata")
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(
+                """
+                CREATE TEMP TABLE IF NOT EXISTS artifact_import (
+                    source_id INTEGER,
+                    type TEXT,
+                    mime_type TEXT,
+                    path TEXT,
+                    size_bytes BIGINT,
+                    content_hash TEXT,
+                    metadata JSONB
+                ) ON COMMIT DELETE ROWS
+                """
+            )
+            await cur.execute("TRUNCATE artifact_import")
+            async with cur.copy(f"COPY artifact_import ({', '.join(columns)}) FROM STDIN") as copy:
+                for artifact in artifacts:
+                    await copy.write_row(
+                        (
+                            artifact["source_id"],
+                            artifact["type"],
+                            artifact["mime_type"],
+                            artifact["path"],
+                            artifact["size_bytes"],
+                            artifact.get("content_hash"),
+                            Json(artifact.get("metadata") or {}),
+                        )
+                    )
+            await cur.execute(
+                f"""
+                INSERT INTO artifacts ({', '.join(columns)})
+                SELECT {', '.join(columns)} FROM artifact_import
+                ON CONFLICT (source_id, content_hash) WHERE content_hash IS NOT NULL
+                DO NOTHING
+                RETURNING *
+                """
+            )
+            rows = await cur.fetchall()
+
+        logger.info(
+            "Created artifacts",
+            extra={"count": len(rows), "skipped": len(artifacts) - len(rows)},
+        )
+        return [Artifact(**row) for row in rows]
+
+    async def get_by_content_hash(
+            self,
+            source_id: int,
+            content_hash: str,
+            *,
+            conn: psycopg.AsyncConnection | None = None
+    ) -> Optional[Artifact]:
+        query = """
+            SELECT * FROM artifacts
+            WHERE source_id = %(source_id)s AND content_hash = %(content_hash)s
+        """
+        params = {"source_id": source_id, "content_hash": content_hash}
+
+        row = await self._fetchone(query, params, conn=conn)
+        return Artifact(**row) if row else None
+
+    async def referenced_hashes(self, content_hashes: list[str]) -> set[str]:
+        if not content_hashes:
+            return set()
+
+        query = """
+            SELECT DISTINCT content_hash FROM artifacts
+            WHERE content_hash = ANY(%(content_hashes)s)
+        """
+        rows = await self.db.fetchall(query, {"content_hashes": content_hashes})
+        return {row["content_hash"] for row in rows}
 
     async def delete(
             self,
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from typing import Optional, Any
+
+from app.domain.models.crawl_job import CrawlJob
+from app.domain.repositories.crawl_job_repository import CrawlJobRepository
+from app.core.database import Database
+from app.core.logging import logger
+
+# Constants
+ALLOWED_UPDATE_FIELDS = {
+    "pages_fetched",
+    "pages_failed",
+    "pages_unchanged",
+    "pages_per_sec",
+    "queue_depth",
+}
+FINISHED_STATUSES = {"completed", "failed", "cancelled"}
+# Interrupted jobs, and active jobs whose process stopped reporting.
+RESUMABLE_CONDITION = """
+    (status = 'interrupted'
+     OR (status IN ('running', 'paused')
+         AND updated_at < NOW() - make_interval(secs => %(stale_after)s)))
+"""
+
+
+class PostgresCrawlJobRepository(CrawlJobRepository):
+    """
+    Crawl job repository.
+
+    Jobs are written by the background runner outside of any request
+    transaction, so every method commits on its own.
+    """
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    async def create(
+            self,
+            *,
+            site_id: int,
+            source_id: int | None,
+            incremental: bool = False,
+            worker_id: str | None = None,
+    ) -> CrawlJob:
+        query = """
+            INSERT INTO crawl_jobs (
+                site_id, source_id, status, incremental, started_at, worker_id
+            )
+            VALUES (
+                %(site_id)s, %(source_id)s, 'running', %(incremental)s, NOW(), %(worker_id)s
+            )
+            RETURNING *
+            """
+        params = {
+            "site_id": site_id,
+            "source_id": source_id,
+            "incremental": incremental,
+            "worker_id": worker_id,
+        }
+        row = await self._fetchone(query, params)
+        logger.info("Created crawl job", extra={"job_id": row["id"], "site_id": site_id})
+        return CrawlJob(**row)
+
+    async def get(self, job_id: int) -> Optional[CrawlJob]:
+        query = "SELECT * FROM crawl_jobs WHERE id = %(id)s"
+        row = await self._fetchone(query, {"id": job_id})
+        return CrawlJob(**row) if row else None
+
+    async def update(self, job_id: int, updates: dict[str, Any]) -> Optional[CrawlJob]:
+        update_data = {
+            k: v for k, v in updates.items()
+            if k in ALLOWED_UPDATE_FIELDS
+        }
+        if not update_data:
+            return None
+
+        set_sql = ", ".join([f"{k} = %({k})s" for k in update_data.keys()])
+        params = {"id": job_id, **update_data}
+
+        query = f"""
+                    UPDATE crawl_jobs
+                    SET {set_sql}, updated_at = NOW()
+                    WHERE id = %(id)s
+                    RETURNING *
+                """
+
+        row = await self._fetchone(query, params)
+        return CrawlJob(**row) if row else None
+
+    async def transition(
+            self,
+            job_id: int,
+            from_statuses: list[str],
+            to_status: str,
+            *,
+            error: str | None = None,
+    ) -> Optional[CrawlJob]:
+        query = """
+            UPDATE crawl_jobs
+            SET status = %(to_status)s,
+                error = COALESCE(%(error)s, error),
+                finished_at = CASE WHEN %(finished)s THEN NOW() ELSE finished_at END,
+                updated_at = NOW()
+            WHERE id = %(id)s AND status = ANY(%(from_statuses)s)
+            RETURNING *
+            """
+        params = {
+            "id": job_id,
+            "from_statuses": from_statuses,
+            "to_status": to_status,
+            "error": error,
+            "finished": to_status in FINISHED_STATUSES,
+        }
+        row = await self._fetchone(query, params)
+        return CrawlJob(**row) if row else None
+
+    async def list_resumable(self, stale_after: float) -> list[CrawlJob]:
+        query = f"""
+            SELECT * FROM crawl_jobs
+            WHERE {RESUMABLE_CONDITION}
+            ORDER BY id
+            """
+        rows = await self._fetchall(query, {"stale_after": stale_after})
+        return [CrawlJob(**row) for row in rows]
+
+    async def claim(
+            self,
+            job_id: int,
+            worker_id: str,
+            stale_after: float,
+    ) -> Optional[CrawlJob]:
+        # Paused jobs stay paused; everything else runs again.
+        query = f"""
+            UPDATE crawl_jobs
+            SET status = CASE WHEN status = 'paused' THEN 'paused' ELSE 'running' END,
+                worker_id = %(worker_id)s,
+                error = NULL,
+                finished_at = NULL,
+                updated_at = NOW()
+            WHERE id = %(id)s AND {RESUMABLE_CONDITION}
+            RETURNING *
+            """
+        params = {"id": job_id, "worker_id": worker_id, "stale_after": stale_after}
+        row = await self._fetchone(query, params)
+        if row:
+            logger.info("Claimed crawl job", extra={"job_id": job_id, "worker_id": worker_id})
+        return CrawlJob(**row) if row else None
+
+    async def _fetchone(self, query: str, params: dict[str, Any]):
+        async with self.db.transaction() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(query, params)
+                return await cur.fetchone()
+
+    async def _fetchall(self, query: str, params: dict[str, Any]):
+        async with self.db.transaction() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(query, params)
+                return await cur.fetchall()
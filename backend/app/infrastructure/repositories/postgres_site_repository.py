@@ -134,6 +134,43 @@ class PostgresSiteRepository(SiteRepository):
         row = await self._fetchone(query, params, conn=conn)
         return SiteEntity(**row) if row else None
 
+    async def start_crawl(
+            self,
+            site_id: int,
+            *,
+            conn: psycopg.AsyncConnection | None = None,
+    ) -> Optional[SiteEntity]:
+        # Requests during a crawl keep its start: pages fetched since the
+        # earliest one may predate changes made in between.
+        query = """
+            UPDATE sites
+            SET crawl_started_at = COALESCE(crawl_started_at, NOW())
+            WHERE id = %(id)s
+            RETURNING *
+            """
+        row = await self._fetchone(query, {"id": site_id}, conn=conn)
+        return SiteEntity(**row) if row else None
+
+    async def finish_crawl(
+            self,
+            site_id: int,
+            *,
+            conn: psycopg.AsyncConnection | None = None,
+    ) -> Optional[SiteEntity]:
+        query = """
+            UPDATE sites
+            SET last_crawled_at = crawl_started_at,
+                crawl_started_at = NULL
+            WHERE id = %(id)s AND crawl_started_at IS NOT NULL
+              -- A crawl still to be seeded is not finished.
+              AND NOT EXISTS (SELECT 1 FROM crawl_seeds WHERE site_id = sites.id)
+            RETURNING *
+            """
+        row = await self._fetchone(query, {"id": site_id}, conn=conn)
+        if row:
+            logger.info("Finished site crawl", extra={"site_id": site_id})
+        return SiteEntity(**row) if row else None
+
     async def delete(
             self,
             site_id: int,
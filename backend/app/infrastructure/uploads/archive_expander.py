@@ -0,0 +1,179 @@
+import gzip
+import hashlib
+import mimetypes
+import tarfile
+import uuid
+import zipfile
+import zlib
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import IO, BinaryIO, Iterator
+
+from app.infrastructure.extraction.mime_sniffer import sniff_mime
+
+ZIP = "zip"
+TAR = "tar"
+
+ZIP_MIME_TYPES = ("application/zip", "application/x-zip-compressed")
+TAR_MIME_TYPES = (
+    "application/x-tar",
+    "application/gzip",
+    "application/x-gzip",
+    "application/x-gtar",
+    "application/x-compressed-tar",
+)
+TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+
+_PIECE_SIZE = 1024 * 1024
+
+# Raised while reading a damaged archive or member.
+_CORRUPT_ERRORS = (zipfile.BadZipFile, tarfile.TarError, EOFError, zlib.error, gzip.BadGzipFile)
+
+
+class ArchiveError(ValueError):
+    """
+    The archive is corrupt or over the configured limits.
+    """
+
+
+@dataclass
+class ArchiveMember:
+    # Path of the member inside the archive.
+    name: str
+    mime_type: str
+    # Where the member was written.
+    path: Path
+    size: int
+    content_hash: str
+
+
+def archive_format(head: bytes, filename: str | None, mime_type: str | None) -> str | None:
+    """
+    `ZIP` or `TAR` if an upload starting with `head` (its first 512 bytes)
+    is an archive to expand, None otherwise.
+
+    Zip containers that are documents in their own right (docx, epub, ...)
+    are only expanded when named or typed as zip archives.
+    """
+    name = (filename or "").lower()
+    mime_type = (mime_type or "").split(";")[0].strip().lower()
+
+    if head.startswith((b"PK\x03\x04", b"PK\x05\x06")):
+        if name.endswith(".zip") or mime_type in ZIP_MIME_TYPES:
+            return ZIP
+        return None
+    if head[257:262] == b"ustar":
+        return TAR
+    # Compressed tar: only the name or type tells it from a compressed file.
+    if head.startswith((b"\x1f\x8b", b"BZh", b"\xfd7zXZ")):
+        if name.endswith(TAR_SUFFIXES) or mime_type in TAR_MIME_TYPES:
+            return TAR
+    return None
+
+
+class ArchiveExpander:
+    """
+    Streams the regular files out of zip and (compressed) tar archives,
+    one member at a time and without extracting a directory tree.
+
+    Members are written flat, under generated names, so paths inside the
+    archive never reach the filesystem. Directories, links, hidden files
+    and macOS resource forks are skipped, as are members with the same
+    content as an earlier one.
+
+    `max_members` and `max_bytes` (uncompressed, counted as members are
+    read) bound what one archive may expand to.
+    """
+
+    def __init__(self, *, max_members: int = 50_000, max_bytes: int = 10 * 1024 ** 3):
+        self.max_members = max_members
+        self.max_bytes = max_bytes
+
+    def expand(self, src: BinaryIO, fmt: str, dest_dir: Path) -> list[ArchiveMember]:
+        """
+        Write every member of `src` to `dest_dir`. Blocking.
+
+        On failure, the members already written are removed.
+        """
+        members: list[ArchiveMember] = []
+        hashes: set[str] = set()
+        total = 0
+        src.seek(0)
+        try:
+            for name, stream in self._members(src, fmt):
+                if len(members) >= self.max_members:
+                    raise ArchiveError(f"Archive has more than {self.max_members} files")
+
+                path = dest_dir / f"{uuid.uuid4()}{PurePosixPath(name).suffix}"
+                size, content_hash, head = self._write(stream, path, self.max_bytes - total)
+                total += size
+                if content_hash in hashes:
+                    path.unlink()
+                    continue
+
+                hashes.add(content_hash)
+                members.append(
+                    ArchiveMember(
+                        name=name,
+                        mime_type=mimetypes.guess_type(name)[0]
+                        or sniff_mime(head)
+                        or "application/octet-stream",
+                        path=path,
+                        size=size,
+                        content_hash=content_hash,
+                    )
+                )
+        except BaseException as e:
+            for member in members:
+                member.path.unlink(missing_ok=True)
+            if isinstance(e, _CORRUPT_ERRORS):
+                raise ArchiveError(f"Corrupt archive: {e}") from e
+            raise
+        return members
+
+    def _members(self, src: BinaryIO, fmt: str) -> Iterator[tuple[str, IO[bytes]]]:
+        if fmt == ZIP:
+            with zipfile.ZipFile(src) as archive:
+                for info in archive.infolist():
+                    if not info.is_dir() and not self._skipped(info.filename):
+                        with archive.open(info) as stream:
+                            yield info.filename, stream
+        elif fmt == TAR:
+            # Stream mode: members are read in order, without seeking.
+            with tarfile.open(fileobj=src, mode="r|*") as archive:
+                for entry in archive:
+                    if not entry.isfile() or self._skipped(entry.name):
+                        continue
+                    extracted = archive.extractfile(entry)
+                    if extracted is not None:
+                        yield entry.name, extracted
+        else:
+            raise ArchiveError(f"Unknown archive format '{fmt}'")
+
+    @staticmethod
+    def _skipped(name: str) -> bool:
+        parts = PurePosixPath(name).parts
+        return not parts or parts[0] == "__MACOSX" or any(p.startswith(".") for p in parts)
+
+    @staticmethod
+    def _write(stream: IO[bytes], path: Path, budget: int) -> tuple[int, str, bytes]:
+        """
+        Size, sha256 and first bytes of the member written to `path`.
+        """
+        digest = hashlib.sha256()
+        size = 0
+        head = b""
+        try:
+            with open(path, "wb") as out:
+                while piece := stream.read(_PIECE_SIZE):
+                    if not size:
+                        head = piece[:512]
+                    size += len(piece)
+                    if size > budget:
+                        raise ArchiveError("Archive expands beyond the size limit")
+                    digest.update(piece)
+                    out.write(piece)
+        except BaseException:
+            path.unlink(missing_ok=True)
+            raise
+        return size, digest.hexdigest(), head
@@ -0,0 +1,144 @@
+import contextlib
+import fcntl
+import os
+import uuid
+from pathlib import Path
+from typing import Callable, Iterator
+
+
+class BlobStore:
+    """
+    Artifact content on disk, addressed by its sha256 under
+    `<root>/blobs/<h[:2]>/<h[2:4]>/<h>`, so identical content uploaded
+    to any number of sources is stored once.
+
+    Blobs are never removed when artifacts are deleted; `BlobSweeper`
+    collects the ones no artifact references any more. Storing content
+    refreshes the blob's mtime under a shared lock, and the sweeper only
+    removes blobs older than its grace period under the exclusive lock,
+    so a blob is never removed between being reused and being recorded.
+    """
+
+    def __init__(self, root: str):
+        self.root = Path(root) / "blobs"
+        # Same filesystem as the blobs, so files move in with a rename.
+        self.staging = self.root / "tmp"
+        self._lock_path = self.root / ".lock"
+
+    def path(self, content_hash: str) -> Path:
+        return self.root / content_hash[:2] / content_hash[2:4] / content_hash
+
+    def staging_dir(self) -> Path:
+        self.staging.mkdir(parents=True, exist_ok=True)
+        return self.staging
+
+    def put(self, content_hash: str, write: Callable[[Path], None]) -> tuple[Path, bool]:
+        """
+        Store content with `content_hash`, written by `write` to the path
+        it is given, unless the blob already exists. Blocking.
+
+        Returns the blob path and whether it was written.
+        """
+        with self.lock(exclusive=False):
+            path = self.path(content_hash)
+            if self._touch(path):
+                return path, False
+
+            tmp = self.staging_dir() / uuid.uuid4().hex
+            try:
+                write(tmp)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                # A concurrent put of the same content wrote the same bytes.
+                os.replace(tmp, path)
+            except BaseException:
+                tmp.unlink(missing_ok=True)
+                raise
+            return path, True
+
+    def adopt(self, content_hash: str, src: Path) -> tuple[Path, bool]:
+        """
+        `put` for a file already in the staging directory: it is moved
+        into place, or removed if the blob exists. Blocking.
+        """
+        try:
+            return self.put(content_hash, lambda tmp: os.replace(src, tmp))
+        finally:
+            src.unlink(missing_ok=True)
+
+    def iter_blobs(self) -> Iterator[tuple[str, float]]:
+        """
+        Content hash and mtime of every blob. Blocking.
+        """
+        for shard in self._dirs(self.root):
+            for subshard in self._dirs(shard):
+                with os.scandir(subshard) as entries:
+                    for entry in entries:
+                        with contextlib.suppress(FileNotFoundError):
+                            yield entry.name, entry.stat().st_mtime
+
+    def remove(self, content_hashes: list[str], *, older_than: float) -> int:
+        """
+        Remove the blobs among `content_hashes` last stored before
+        `older_than`, under the exclusive lock. Blocking.
+
+        Returns how many were removed.
+        """
+        removed = 0
+        with self.lock(exclusive=True):
+            for content_hash in content_hashes:
+                path = self.path(content_hash)
+                try:
+                    # Stored again since it was listed: keep it.
+                    if path.stat().st_mtime >= older_than:
+                        continue
+                    path.unlink()
+                except FileNotFoundError:
+                    continue
+                removed += 1
+        return removed
+
+    def remove_stale_staging(self, *, older_than: float) -> int:
+        """
+        Remove files left in the staging directory by crashed uploads.
+        Blocking.
+        """
+        removed = 0
+        if not self.staging.exists():
+            return removed
+        for entry in os.scandir(self.staging):
+            with contextlib.suppress(FileNotFoundError):
+                if entry.stat().st_mtime < older_than:
+                    os.unlink(entry.path)
+                    removed += 1
+        return removed
+
+    @contextlib.contextmanager
+    def lock(self, *, exclusive: bool) -> Iterator[None]:
+        """
+        `flock` shared by the processes using this store.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self._lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            yield
+        finally:
+            # Also releases the lock.
+            os.close(fd)
+
+    @staticmethod
+    def _touch(path: Path) -> bool:
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    @staticmethod
+    def _dirs(path: Path) -> Iterator[Path]:
+        # Shards are two hex characters; skips the staging dir and lock.
+        if not path.exists():
+            return
+        for entry in os.scandir(path):
+            if len(entry.name) == 2 and entry.is_dir():
+                yield Path(entry.path)
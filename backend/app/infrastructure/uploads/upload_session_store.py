@@ -0,0 +1,258 @@
+import asyncio
+import fcntl
+import json
+import os
+import shutil
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterable
+
+from app.core.logging import logger
+from app.domain.models.upload_session import UploadSession
+
+# Received bytes are buffered up to this size before each disk write.
+_WRITE_SIZE = 1024 * 1024
+
+
+class UploadSessionError(Exception):
+    pass
+
+
+class UploadSessionNotFound(UploadSessionError):
+    pass
+
+
+class UploadOffsetMismatch(UploadSessionError):
+    """
+    The client's offset is not where the upload stands; it should ask for
+    the current offset and resume from there.
+    """
+
+    def __init__(self, offset: int):
+        super().__init__(f"Upload is at offset {offset}")
+        self.offset = offset
+
+
+class UploadSessionBusy(UploadSessionError):
+    """
+    Another request is appending to the upload.
+    """
+
+
+class UploadSessionCompleting(UploadSessionError):
+    """
+    Another request is already completing the upload.
+    """
+
+
+class UploadTooLarge(UploadSessionError):
+    pass
+
+
+class UploadSessionStore:
+    """
+    Resumable uploads, kept on disk under `<root>/sessions/<id>/`:
+    - `info.json`: what the upload was created with
+    - `data`: the bytes received so far; its size is the upload offset
+
+    Clients append byte ranges at the current offset, in as many requests
+    as they like; a request that breaks off keeps every byte that reached
+    the disk. An exclusive `flock` on `data` keeps concurrent appends to
+    one upload, across processes, from interleaving.
+
+    Completing an upload first renames `data` to `completing`: only one
+    request, in any process, can, and the upload stops taking appends.
+
+    Sessions without activity for `ttl` seconds are removed when the next
+    session is created.
+    """
+
+    def __init__(self, root: str, *, ttl: float = 86400.0):
+        self.root = Path(root) / "sessions"
+        self.ttl = ttl
+
+    async def create(
+            self,
+            *,
+            source_id: int,
+            filename: str,
+            content_type: str,
+            size: int,
+    ) -> UploadSession:
+        session = UploadSession(
+            id=uuid.uuid4().hex,
+            source_id=source_id,
+            filename=filename,
+            content_type=content_type,
+            size=size,
+            offset=0,
+            created_at=datetime.now(timezone.utc),
+        )
+        await asyncio.to_thread(self._create, session)
+        logger.info(
+            "Created upload session",
+            extra={"upload_id": session.id, "source_id": source_id, "size": size},
+        )
+        return session
+
+    async def get(self, upload_id: str) -> UploadSession | None:
+        return await asyncio.to_thread(self._load, upload_id)
+
+    async def append(
+            self,
+            upload_id: str,
+            offset: int,
+            stream: AsyncIterable[bytes],
+    ) -> UploadSession:
+        """
+        Write `stream` at `offset`, which must be the current offset.
+
+        Bytes are kept as they arrive: if `stream` fails midway, the
+        upload can be resumed after the last byte written.
+        """
+        session = await self.get(upload_id)
+        if session is None:
+            raise UploadSessionNotFound(upload_id)
+
+        fd = await asyncio.to_thread(self._open_at, self.data_path(upload_id), offset)
+        written = offset
+        buffer = bytearray()
+        try:
+            async for piece in stream:
+                if written + len(buffer) + len(piece) > session.size:
+                    raise UploadTooLarge(f"Upload exceeds its size of {session.size} bytes")
+                buffer += piece
+                if len(buffer) >= _WRITE_SIZE:
+                    written += await asyncio.to_thread(self._write, fd, bytes(buffer))
+                    buffer.clear()
+        finally:
+            try:
+                if buffer:
+                    written += await asyncio.to_thread(self._write, fd, bytes(buffer))
+                await asyncio.to_thread(os.fsync, fd)
+            finally:
+                # Also releases the lock.
+                os.close(fd)
+
+        session.offset = written
+        return session
+
+    async def start_completion(self, upload_id: str) -> Path:
+        """
+        Set a received upload aside for completion and return the path
+        of its bytes. Raises `UploadSessionCompleting` if another request
+        got there first.
+        """
+        return await asyncio.to_thread(self._rename, upload_id, "data", "completing")
+
+    async def cancel_completion(self, upload_id: str) -> None:
+        """
+        Put an upload whose completion failed back, so it can be retried.
+        """
+        await asyncio.to_thread(self._rename, upload_id, "completing", "data")
+
+    async def delete(self, upload_id: str) -> None:
+        await asyncio.to_thread(shutil.rmtree, self._dir(upload_id), True)
+
+    def data_path(self, upload_id: str) -> Path:
+        return self._dir(upload_id) / "data"
+
+    def _dir(self, upload_id: str) -> Path:
+        # Ids are generated here; anything else cannot name a session.
+        if not upload_id.isalnum():
+            raise UploadSessionNotFound(upload_id)
+        return self.root / upload_id
+
+    def _create(self, session: UploadSession) -> None:
+        self._purge_expired()
+        directory = self._dir(session.id)
+        directory.mkdir(parents=True)
+        (directory / "data").touch()
+        info = {
+            "source_id": session.source_id,
+            "filename": session.filename,
+            "content_type": session.content_type,
+            "size": session.size,
+            "created_at": session.created_at.isoformat(),
+        }
+        (directory / "info.json").write_text(json.dumps(info))
+
+    def _load(self, upload_id: str) -> UploadSession | None:
+        try:
+            directory = self._dir(upload_id)
+            info = json.loads((directory / "info.json").read_text())
+            offset = self._received(directory)
+        except (UploadSessionNotFound, FileNotFoundError):
+            return None
+        return UploadSession(
+            id=upload_id,
+            source_id=info["source_id"],
+            filename=info["filename"],
+            content_type=info["content_type"],
+            size=info["size"],
+            offset=offset,
+            created_at=datetime.fromisoformat(info["created_at"]),
+        )
+
+    @staticmethod
+    def _received(directory: Path) -> int:
+        try:
+            return (directory / "data").stat().st_size
+        except FileNotFoundError:
+            # Being completed.
+            return (directory / "completing").stat().st_size
+
+    def _rename(self, upload_id: str, name: str, new_name: str) -> Path:
+        directory = self._dir(upload_id)
+        try:
+            os.rename(directory / name, directory / new_name)
+        except FileNotFoundError:
+            if not directory.exists():
+                raise UploadSessionNotFound(upload_id) from None
+            raise UploadSessionCompleting(upload_id) from None
+        return directory / new_name
+
+    @staticmethod
+    def _open_at(path: Path, offset: int) -> int:
+        """
+        Open `path` for writing at `offset` under an exclusive lock.
+        """
+        try:
+            fd = os.open(path, os.O_WRONLY)
+        except FileNotFoundError:
+            raise UploadSessionNotFound(path.parent.name) from None
+        try:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                raise UploadSessionBusy(path.parent.name) from None
+            current = os.fstat(fd).st_size
+            if offset != current:
+                raise UploadOffsetMismatch(current)
+            os.lseek(fd, offset, os.SEEK_SET)
+        except BaseException:
+            os.close(fd)
+            raise
+        return fd
+
+    @staticmethod
+    def _write(fd: int, data: bytes) -> int:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        return len(data)
+
+    def _purge_expired(self) -> None:
+        if not self.root.exists():
+            return
+        cutoff = time.time() - self.ttl
+        for directory in self.root.iterdir():
+            try:
+                last_active = (directory / "data").stat().st_mtime
+            except FileNotFoundError:
+                last_active = directory.stat().st_mtime
+            if last_active < cutoff:
+                shutil.rmtree(directory, ignore_errors=True)
+                logger.info("Expired upload session", extra={"upload_id": directory.name})
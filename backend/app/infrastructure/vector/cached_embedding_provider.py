@@ -0,0 +1,140 @@
+import asyncio
+import hashlib
+import unicodedata
+from collections import OrderedDict
+
+from app.core.logging import logger
+from app.domain.models.embedding_cache_stats import EmbeddingCacheStats
+from app.domain.services.embedding_provider import EmbeddingProvider
+from app.infrastructure.vector.sqlite_embedding_cache import SqliteEmbeddingCache
+
+# Approximate memory of one cached entry beyond its floats.
+_ENTRY_OVERHEAD = 200
+
+
+def cache_key(model: str, text: str) -> str:
+    """
+    sha256 of the model and the text, Unicode-normalized (NFC) with
+    whitespace collapsed, so trivially different texts share an entry.
+    """
+    normalized = " ".join(unicodedata.normalize("NFC", text).split())
+    return hashlib.sha256(f"{model}\0{normalized}".encode()).hexdigest()
+
+
+class CachedEmbeddingProvider(EmbeddingProvider):
+    """
+    Caches the embeddings of any `EmbeddingProvider`, keyed by
+    `cache_key(model, text)`.
+
+    Two tiers:
+    - an in-memory LRU bounded by `max_bytes` (float64 vectors plus a
+      per-entry overhead), evicting the least recently used entries
+    - an optional persistent tier, shared by processes and restarts;
+      its hits are promoted to memory
+
+    Batches only send the texts neither tier has to the provider, each
+    distinct text once. A failing persistent tier is logged and skipped,
+    never failing the embedding itself.
+    """
+
+    def __init__(
+            self,
+            provider: EmbeddingProvider,
+            *,
+            model: str,
+            max_bytes: int = 64 * 1024 ** 2,
+            store: SqliteEmbeddingCache | None = None,
+    ):
+        self.provider = provider
+        self.model = model
+        self.max_bytes = max_bytes
+        self.store = store
+        self._entries: OrderedDict[str, list[float]] = OrderedDict()
+        self._stats = EmbeddingCacheStats()
+
+    async def embed(self, text: str) -> list[float]:
+        return (await self.embed_batch([text]))[0]
+
+    async def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        keys = [cache_key(self.model, text) for text in texts]
+        found: dict[str, list[float]] = {}
+        missing: dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key in found or key in missing:
+                # Repeated within the batch: embedded once.
+                self._stats.hits += 1
+                continue
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+                self._stats.hits += 1
+                found[key] = vector
+            else:
+                missing[key] = text
+
+        if missing:
+            stored = await self._load(list(missing))
+            for key, vector in stored.items():
+                self._stats.disk_hits += 1
+                found[key] = vector
+                del missing[key]
+                self._remember(key, vector)
+
+        if missing:
+            vectors = await self.provider.embed_batch(list(missing.values()))
+            if len(vectors) != len(missing):
+                raise ValueError(
+                    f"Embedding provider returned {len(vectors)} vectors "
+                    f"for {len(missing)} texts"
+                )
+            embedded = dict(zip(missing, vectors))
+            self._stats.misses += len(embedded)
+            for key, vector in embedded.items():
+                found[key] = vector
+                self._remember(key, vector)
+            await self._save(embedded)
+
+        return [found[key] for key in keys]
+
+    def stats(self) -> dict:
+        self._stats.entries = len(self._entries)
+        return self._stats.as_dict()
+
+    def close(self) -> None:
+        if self.store is not None:
+            self.store.close()
+
+    def _remember(self, key: str, vector: list[float]) -> None:
+        size = self._size(vector)
+        if size > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._stats.bytes -= self._size(previous)
+        self._entries[key] = vector
+        self._stats.bytes += size
+        while self._stats.bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._stats.bytes -= self._size(evicted)
+            self._stats.evictions += 1
+
+    @staticmethod
+    def _size(vector: list[float]) -> int:
+        return 8 * len(vector) + _ENTRY_OVERHEAD
+
+    async def _load(self, keys: list[str]) -> dict[str, list[float]]:
+        if self.store is None:
+            return {}
+        try:
+            return await asyncio.to_thread(self.store.get_many, keys)
+        except Exception:
+            logger.exception("Embedding cache read failed", extra={"keys": len(keys)})
+            return {}
+
+    async def _save(self, entries: dict[str, list[float]]) -> None:
+        if self.store is None:
+            return
+        try:
+            await asyncio.to_thread(self.store.put_many, entries, model=self.model)
+        except Exception:
+            logger.exception("Embedding cache write failed", extra={"entries": len(entries)})
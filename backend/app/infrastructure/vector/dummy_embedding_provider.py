@@ -5,4 +5,4 @@ class DummyEmbeddingProvider(EmbeddingProvider):
         return [0.1, 0.2, 0.3]
 
     async def embed_batch(self, texts: list[str]) -> list[list[float]]:
-        return [[0.1, 0.2, 0.3]]
\ No newline at end of file
+        return [[0.1, 0.2, 0.3] for _ in texts]
@@ -0,0 +1,62 @@
+import math
+from typing import Iterable
+
+from app.domain.models.chunk import Chunk
+from app.domain.services.vector_store import VectorStore
+
+
+class InMemoryVectorStore(VectorStore):
+    """
+    Vector store kept in process memory, searched by brute-force cosine
+    similarity. For development and tests.
+    """
+
+    def __init__(self):
+        self._chunks: dict[str, Chunk] = {}
+        # document id -> ids of its chunks
+        self._documents: dict[str, set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._chunks)
+
+    async def upsert(self, chunks: Iterable[Chunk]) -> None:
+        for chunk in chunks:
+            self._chunks[chunk.id] = chunk
+            self._documents.setdefault(chunk.document_id, set()).add(chunk.id)
+
+    async def search(self, query_embedding: list[float], k: int = 5) -> list[Chunk]:
+        scored = [
+            (self._cosine(query_embedding, chunk.embedding), chunk)
+            for chunk in self._chunks.values()
+            if chunk.embedding
+        ]
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [chunk for _, chunk in scored[:k]]
+
+    async def delete_by_site(self, site_id: str) -> None:
+        await self.delete(
+            [chunk_id for chunk_id, chunk in self._chunks.items() if chunk.site_id == site_id]
+        )
+
+    async def get_by_documents(self, document_ids: list[str]) -> list[Chunk]:
+        return [
+            self._chunks[chunk_id]
+            for document_id in document_ids
+            for chunk_id in self._documents.get(document_id, ())
+        ]
+
+    async def delete(self, chunk_ids: Iterable[str]) -> None:
+        for chunk_id in chunk_ids:
+            chunk = self._chunks.pop(chunk_id, None)
+            if chunk is None:
+                continue
+            ids = self._documents[chunk.document_id]
+            ids.discard(chunk_id)
+            if not ids:
+                del self._documents[chunk.document_id]
+
+    @staticmethod
+    def _cosine(a: list[float], b: list[float]) -> float:
+        dot = sum(x * y for x, y in zip(a, b))
+        norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+        return dot / norm if norm else 0.0
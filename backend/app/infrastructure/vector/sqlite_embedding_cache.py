@@ -0,0 +1,118 @@
+import sqlite3
+import threading
+import time
+from array import array
+from pathlib import Path
+
+# Keys per SELECT, well under SQLite's bound parameter limit.
+_QUERY_SIZE = 500
+
+
+class SqliteEmbeddingCache:
+    """
+    Persistent tier of `CachedEmbeddingProvider`: embeddings by cache key
+    in a SQLite file, stored as packed float64 so they come back exactly
+    as they were embedded.
+
+    The database is opened on first use, in WAL mode so the API and
+    ingest worker processes on one host can share it. Methods block;
+    callers run them in a worker thread.
+
+    At most `max_rows` embeddings are kept: each write evicts the least
+    recently used ones beyond it.
+    """
+
+    def __init__(self, path: str, *, max_rows: int = 200_000):
+        self.path = Path(path)
+        self.max_rows = max_rows
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: list[str]) -> dict[str, list[float]]:
+        found: dict[str, list[float]] = {}
+        with self._lock:
+            conn = self._connect()
+            for start in range(0, len(keys), _QUERY_SIZE):
+                batch = keys[start:start + _QUERY_SIZE]
+                rows = conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({', '.join('?' * len(batch))})",
+                    batch,
+                )
+                for key, vector in rows:
+                    found[key] = array("d", vector).tolist()
+            if found:
+                with conn:
+                    self._touch(conn, list(found))
+        return found
+
+    def put_many(self, entries: dict[str, list[float]], *, model: str) -> None:
+        if not entries:
+            return
+        with self._lock:
+            conn = self._connect()
+            now = time.time()
+            with conn:
+                conn.executemany(
+                    """
+                    INSERT OR REPLACE INTO embeddings (key, model, vector, used_at)
+                    VALUES (?, ?, ?, ?)
+                    """,
+                    [
+                        (key, model, array("d", vector).tobytes(), now)
+                        for key, vector in entries.items()
+                    ],
+                )
+                self._evict(conn)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _touch(self, conn: sqlite3.Connection, keys: list[str]) -> None:
+        now = time.time()
+        for start in range(0, len(keys), _QUERY_SIZE):
+            batch = keys[start:start + _QUERY_SIZE]
+            conn.execute(
+                f"UPDATE embeddings SET used_at=? WHERE key IN ({', '.join('?' * len(batch))})",
+                [now, *batch],
+            )
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        (rows,) = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        if rows > self.max_rows:
+            conn.execute(
+                """
+                DELETE FROM embeddings WHERE key IN (
+                    SELECT key FROM embeddings ORDER BY used_at LIMIT ?
+                )
+                """,
+                (rows - self.max_rows,),
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    used_at REAL NOT NULL DEFAULT 0
+                )
+                """
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(embeddings)")}
+            if "used_at" not in columns:
+                # Files written before eviction: their entries go first.
+                conn.execute("ALTER TABLE embeddings ADD COLUMN used_at REAL NOT NULL DEFAULT 0")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS embeddings_used_at_idx ON embeddings (used_at)"
+            )
+            self._conn = conn
+        return self._conn
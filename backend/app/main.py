@@ -39,10 +39,24 @@ app = FastAPI(
 async def startup():
     container = get_container()
     await container.db.connect()
+    if settings.crawl_resume_jobs_on_startup:
+        await container.crawl_job_runner.resume_interrupted()
+    if settings.ingest_mode == "inline":
+        container.ingest_worker.start()
+    if settings.upload_gc_interval > 0:
+        container.blob_sweeper.start()
 
 @app.on_event("shutdown")
 async def shutdown():
     container = get_container()
+    await container.crawl_job_runner.shutdown()
+    await container.http_fetcher.aclose()
+    container.html_parser.close()
+    await container.ingest_worker.stop()
+    await container.blob_sweeper.stop()
+    container.extraction_service.shutdown()
+    if container.embedding_cache is not None:
+        container.embedding_cache.close()
     await container.db.close()
 
 # Register all API routes
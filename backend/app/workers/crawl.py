@@ -0,0 +1,61 @@
+# --------------------------------
+# Standalone crawl worker.
+#
+#   python -m app.workers.crawl
+#
+# Run as many of these as needed, on any number of hosts;
+# they coordinate through the crawl_state table.
+# --------------------------------
+
+import argparse
+import asyncio
+import signal
+
+from app.core.container import get_container
+from app.core.settings import settings
+from app.application.use_cases.crawl_worker import CrawlWorker
+
+
+async def _run(site_quantum: int, poll_interval: float) -> None:
+    container = get_container()
+    await container.db.connect()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    worker = CrawlWorker(
+        db=container.db,
+        crawler=container.crawl_orchestrator,
+        site_quantum=site_quantum,
+        poll_interval=poll_interval,
+    )
+    try:
+        await worker.run(stop)
+    finally:
+        await container.http_fetcher.aclose()
+        container.html_parser.close()
+        await container.db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Aurora RAG crawl worker")
+    parser.add_argument(
+        "--site-quantum",
+        type=int,
+        default=settings.crawl_site_quantum,
+        help="URLs to crawl from one site before moving to the next",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=settings.crawl_poll_interval,
+        help="Seconds to wait when no site has pending URLs",
+    )
+    args = parser.parse_args()
+    asyncio.run(_run(args.site_quantum, args.poll_interval))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# --------------------------------
+# Standalone artifact ingest worker.
+#
+#   python -m app.workers.ingest
+#
+# Run as many of these as needed, on any number of hosts;
+# they coordinate through the artifacts table.
+# --------------------------------
+
+import argparse
+import asyncio
+import contextlib
+import signal
+
+from app.application.ingestion.extraction_service import ExtractionService
+from app.core.container import get_container
+from app.core.logging import logger
+from app.core.settings import settings
+
+# Seconds between extraction throughput log lines.
+_REPORT_INTERVAL = 60.0
+
+
+async def _report_extraction(extraction: ExtractionService, stop: asyncio.Event) -> None:
+    """
+    Log per-extractor throughput whenever something was extracted since
+    the last report: this process's counters are not exposed by the API.
+    """
+    reported = 0
+    while not stop.is_set():
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(stop.wait(), _REPORT_INTERVAL)
+        stats = extraction.stats()
+        calls = sum(extractor["calls"] for extractor in stats.values())
+        if calls != reported:
+            reported = calls
+            logger.info("Extraction throughput", extra={"extractors": stats})
+
+
+async def _run(workers: int, poll_interval: float) -> None:
+    container = get_container()
+    await container.db.connect()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    worker = container.ingest_worker
+    worker.workers = workers
+    worker.poll_interval = poll_interval
+    reporter = asyncio.create_task(_report_extraction(container.extraction_service, stop))
+    try:
+        await worker.run(stop)
+    finally:
+        stop.set()
+        await reporter
+        container.extraction_service.shutdown()
+        if container.embedding_cache is not None:
+            container.embedding_cache.close()
+        await container.db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Aurora RAG artifact ingest worker")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.ingest_workers,
+        help="Artifacts to ingest concurrently",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=settings.ingest_poll_interval,
+        help="Seconds to wait when no artifact is due",
+    )
+    args = parser.parse_args()
+    asyncio.run(_run(args.workers, args.poll_interval))
+
+
+if __name__ == "__main__":
+    main()
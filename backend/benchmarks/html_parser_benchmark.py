@@ -0,0 +1,70 @@
+# --------------------------------
+# HtmlParser throughput benchmark.
+#
+#   poetry run python -m benchmarks.html_parser_benchmark
+#
+# Parses synthetic documentation pages with `analyze_html` in a
+# ProcessPoolExecutor and reports pages parsed per second for
+# each pool size.
+# --------------------------------
+
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from app.infrastructure.crawling.html_parser import analyze_html
+
+BASE_URL = "https://docs.example.com/guide/"
+
+
+def make_page(i: int, sections: int = 40, links: int = 150) -> str:
+    nav = "".join(f'<li><a href="/guide/page-{j}">Page {j}</a></li>' for j in range(links))
+    body = "".join(
+        f"<h2>Section {s}</h2><p>"
+        + " ".join(f"word{(i + s + w) % 997}" for w in range(120))
+        + f' <a href="../ref/{s}?utm_source=x#frag">ref {s}</a></p>'
+        for s in range(sections)
+    )
+    return (
+        f"<html lang='en'><head><title>Page {i}</title>"
+        f"<meta name='description' content='Page {i} of the guide'></head>"
+        f"<body><nav><ul>{nav}</ul></nav><main>{body}</main>"
+        f"<footer>Footer</footer><script>var x = {i};</script></body></html>"
+    )
+
+
+def _analyze(html: str):
+    return analyze_html(html, BASE_URL, ["docs.example.com"])
+
+
+def run(pages: list[str], processes: int) -> float:
+    with ProcessPoolExecutor(processes) as pool:
+        # Warm the workers up so start-up cost is not measured.
+        list(pool.map(_analyze, pages[:processes]))
+        started = time.perf_counter()
+        list(pool.map(_analyze, pages, chunksize=16))
+        elapsed = time.perf_counter() - started
+    return len(pages) / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="HtmlParser throughput benchmark")
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    pages = [make_page(i) for i in range(args.pages)]
+    size_kb = sum(len(p) for p in pages) / len(pages) / 1024
+    print(f"{args.pages} pages, {size_kb:.0f} KiB average")
+
+    started = time.perf_counter()
+    for html in pages:
+        _analyze(html)
+    print(f"inline      {len(pages) / (time.perf_counter() - started):8.0f} pages/s")
+
+    for processes in args.processes:
+        print(f"processes={processes:<2} {run(pages, processes):8.0f} pages/s")
+
+
+if __name__ == "__main__":
+    main()
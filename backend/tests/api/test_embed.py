@@ -8,4 +8,14 @@ def test_search_endpoint(client):
     assert response.status_code == 200
     data = response.json()
     assert data["query"] == "test"
-    assert len(data["results"]) == 3
\ No newline at end of file
+    assert len(data["results"]) == 3
+
+def test_embed_cache_counts_repeat_queries(client):
+    before = client.get("/v1/embed/cache").json()
+    client.get("/v1/embed?q=repeated query")
+    client.get("/v1/embed?q=repeated   query")
+
+    after = client.get("/v1/embed/cache").json()
+    assert after["enabled"]
+    assert after["misses"] == before["misses"] + 1
+    assert after["hits"] == before["hits"] + 1
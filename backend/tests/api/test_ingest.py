@@ -0,0 +1,18 @@
+import asyncio
+
+from app.core.container import get_container
+
+from ..conftest import client
+
+def test_extraction_stats_are_reported_per_extractor(client):
+    extraction = get_container().extraction_service
+    try:
+        asyncio.run(extraction.extract("text/plain", b"hello"))
+    finally:
+        extraction.shutdown()
+
+    response = client.get("/v1/ingest/extraction")
+
+    assert response.status_code == 200
+    stats = response.json()["extractors"]["extract_text"]
+    assert stats["calls"] >= 1 and stats["bytes"] >= 5
@@ -0,0 +1,97 @@
+import asyncio
+import io
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from app.application.artifacts.artifact_service import ArtifactService
+from app.infrastructure.uploads.archive_expander import (
+    TAR,
+    ZIP,
+    ArchiveError,
+    ArchiveExpander,
+    archive_format,
+)
+from tests.artifacts.test_artifact_service import FakeArtifactRepository
+
+FILES = {
+    "docs/index.md": b"# Index\n",
+    "docs/guide.html": b"<h1>Guide</h1>",
+    "docs/copy-of-index.md": b"# Index\n",
+    "docs/.DS_Store": b"junk",
+    "__MACOSX/docs/._index.md": b"junk",
+}
+
+
+def _zip(files: dict[str, bytes]) -> io.BytesIO:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("docs/", b"")
+        for name, data in files.items():
+            archive.writestr(name, data)
+    return buffer
+
+
+def _tar_gz(files: dict[str, bytes]) -> io.BytesIO:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return buffer
+
+
+def test_archive_format_detection():
+    assert archive_format(_zip(FILES).getvalue()[:512], "docs.zip", None) == ZIP
+    # A docx is a zip too, but a document.
+    assert archive_format(_zip(FILES).getvalue()[:512], "report.docx", None) is None
+    assert archive_format(_tar_gz(FILES).getvalue()[:512], "docs.tgz", None) == TAR
+    assert archive_format(_tar_gz(FILES).getvalue()[:512], "notes.gz", "text/plain") is None
+    assert archive_format(b"# plain markdown", "docs.zip", None) is None
+
+
+@pytest.mark.parametrize("fmt, build", [(ZIP, _zip), (TAR, _tar_gz)])
+def test_members_are_streamed_out_flat_and_deduplicated(tmp_path, fmt, build):
+    members = ArchiveExpander().expand(build(FILES), fmt, tmp_path)
+
+    assert sorted(m.name for m in members) == ["docs/guide.html", "docs/index.md"]
+    assert {m.mime_type for m in members} == {"text/html", "text/markdown"}
+    assert sorted(p.read_bytes() for p in tmp_path.iterdir()) == [b"# Index\n", b"<h1>Guide</h1>"]
+
+
+def test_limits_and_corruption_leave_nothing_behind(tmp_path):
+    with pytest.raises(ArchiveError):
+        ArchiveExpander(max_members=1).expand(_zip(FILES), ZIP, tmp_path)
+    with pytest.raises(ArchiveError):
+        ArchiveExpander(max_bytes=10).expand(_tar_gz(FILES), TAR, tmp_path)
+    truncated = io.BytesIO(_tar_gz(FILES).getvalue()[:60])
+    with pytest.raises(ArchiveError):
+        ArchiveExpander().expand(truncated, TAR, tmp_path)
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_store_archive_creates_member_artifacts(tmp_path):
+    repo = FakeArtifactRepository()
+    service = ArtifactService(artifact_repo=repo, upload_root=str(tmp_path))
+
+    async def upload(data: io.BytesIO):
+        fmt = await service.detect_archive(data, "docs.zip", "application/zip")
+        return await service.store_archive(
+            source_id=1, src=data, fmt=fmt, archive_name="docs.zip", conn=None
+        )
+
+    artifacts, duplicates = asyncio.run(upload(_zip(FILES)))
+    assert len(artifacts) == 2 and duplicates == 0
+    assert {a.metadata["member"] for a in artifacts} == {"docs/index.md", "docs/guide.html"}
+
+    # Re-uploading the bundle with one new page only adds that page.
+    artifacts, duplicates = asyncio.run(upload(_zip({**FILES, "docs/new.md": b"new"})))
+    assert [a.metadata["member"] for a in artifacts] == ["docs/new.md"]
+    assert duplicates == 2
+    assert len(list(tmp_path.glob("blobs/??/??/*"))) == 3
+    assert list((tmp_path / "blobs" / "tmp").iterdir()) == []
+    assert all(Path(a.path).exists() for a in repo.artifacts)
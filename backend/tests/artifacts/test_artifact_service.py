@@ -0,0 +1,104 @@
+import asyncio
+import io
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+from fastapi import UploadFile
+
+from app.application.artifacts.artifact_service import ArtifactService
+from app.domain.models.artifact import Artifact
+
+
+class FakeArtifactRepository:
+    def __init__(self):
+        self.artifacts: list[Artifact] = []
+
+    async def create(self, *, source_id, type, mime_type, path, size_bytes, content_hash=None, conn):
+        artifact = Artifact(
+            id=len(self.artifacts) + 1,
+            source_id=source_id,
+            type=type,
+            mime_type=mime_type,
+            path=path,
+            size_bytes=size_bytes,
+            created_at=datetime.now(timezone.utc),
+            content_hash=content_hash,
+        )
+        self.artifacts.append(artifact)
+        return artifact
+
+    async def create_many(self, artifacts, *, conn):
+        created = []
+        for artifact in artifacts:
+            if await self.get_by_content_hash(artifact["source_id"], artifact["content_hash"]):
+                continue
+            metadata = artifact.pop("metadata", {})
+            created.append(await self.create(**artifact, conn=conn))
+            created[-1].metadata = metadata
+        return created
+
+    async def get_by_content_hash(self, source_id, content_hash, *, conn=None):
+        for artifact in self.artifacts:
+            if artifact.source_id == source_id and artifact.content_hash == content_hash:
+                return artifact
+        return None
+
+    async def referenced_hashes(self, content_hashes):
+        return {a.content_hash for a in self.artifacts} & set(content_hashes)
+
+    async def delete(self, artifact_id, *, conn):
+        self.artifacts = [a for a in self.artifacts if a.id != artifact_id]
+
+
+def _upload(data: bytes) -> UploadFile:
+    return UploadFile(io.BytesIO(data), filename="manual.txt")
+
+
+def test_duplicate_upload_reuses_artifact(tmp_path):
+    repo = FakeArtifactRepository()
+    service = ArtifactService(artifact_repo=repo, upload_root=str(tmp_path))
+
+    async def upload(source_id: int, data: bytes):
+        return await service.store_upload(source_id=source_id, file=_upload(data), conn=None)
+
+    first, created = asyncio.run(upload(1, b"manual v1" * 100_000))
+    assert created
+    assert len(first.content_hash) == 64
+
+    again, created = asyncio.run(upload(1, b"manual v1" * 100_000))
+    assert not created
+    assert again.id == first.id
+
+    _, created = asyncio.run(upload(1, b"manual v2"))
+    assert created
+    # The same content for another source is another artifact.
+    _, created = asyncio.run(upload(2, b"manual v1" * 100_000))
+    assert created
+
+    assert len(repo.artifacts) == 3
+    # Both sources share one blob per distinct content.
+    blobs = sorted(p.name for p in tmp_path.glob("blobs/??/??/*"))
+    assert blobs == sorted({a.content_hash for a in repo.artifacts})
+    assert repo.artifacts[0].path == repo.artifacts[2].path
+    h = repo.artifacts[0].content_hash
+    assert repo.artifacts[0].path == str(tmp_path / "blobs" / h[:2] / h[2:4] / h)
+
+
+# Spooled to disk, or still held in memory.
+@pytest.mark.parametrize("max_size", [1024, 10_000_000])
+def test_spooled_upload_is_copied_into_place(tmp_path, max_size):
+    repo = FakeArtifactRepository()
+    service = ArtifactService(artifact_repo=repo, upload_root=str(tmp_path / "uploads"))
+    data = bytes(range(256)) * 20_000
+    spooled = tempfile.SpooledTemporaryFile(max_size=max_size, dir=tmp_path)
+    spooled.write(data)
+
+    artifact, created = asyncio.run(
+        service.store_upload(source_id=1, file=UploadFile(spooled, filename="a.bin"), conn=None)
+    )
+
+    assert created
+    assert artifact.size_bytes == len(data)
+    assert Path(artifact.path).read_bytes() == data
@@ -0,0 +1,76 @@
+import asyncio
+import io
+import os
+import time
+
+from fastapi import UploadFile
+
+from app.application.artifacts.artifact_service import ArtifactService
+from app.application.artifacts.blob_sweeper import BlobSweeper
+from app.infrastructure.uploads.blob_store import BlobStore
+from tests.artifacts.test_artifact_service import FakeArtifactRepository
+
+
+def _age(path: str, seconds: float) -> None:
+    then = time.time() - seconds
+    os.utime(path, (then, then))
+
+
+def test_sweeper_removes_only_old_unreferenced_blobs(tmp_path):
+    repo = FakeArtifactRepository()
+    store = BlobStore(str(tmp_path))
+    service = ArtifactService(artifact_repo=repo, upload_root=str(tmp_path), blob_store=store)
+    sweeper = BlobSweeper(blob_store=store, artifact_repo=repo, grace=60, batch_size=2)
+
+    async def upload(source_id: int, data: bytes):
+        file = UploadFile(io.BytesIO(data), filename="notes.txt")
+        artifact, _ = await service.store_upload(source_id=source_id, file=file, conn=None)
+        return artifact
+
+    async def scenario():
+        shared_1 = await upload(1, b"shared")
+        shared_2 = await upload(2, b"shared")
+        dropped = await upload(1, b"dropped")
+        fresh = await upload(1, b"fresh")
+        for artifact in (shared_1, dropped, fresh):
+            await service.remove_upload(artifact, conn=None)
+        for artifact in (shared_1, dropped):
+            _age(artifact.path, 3600)
+        # Left behind by a crashed upload.
+        stale = store.staging_dir() / "partial"
+        stale.write_bytes(b"x")
+        _age(str(stale), 3600)
+        return shared_2, dropped, fresh, await sweeper.sweep()
+
+    shared, dropped, fresh, removed = asyncio.run(scenario())
+
+    assert removed == 1
+    # Still referenced by source 2.
+    assert os.path.exists(shared.path)
+    assert not os.path.exists(dropped.path)
+    # Unreferenced, but within the grace period.
+    assert os.path.exists(fresh.path)
+    assert list(store.staging.iterdir()) == []
+
+
+def test_reused_blob_is_not_swept(tmp_path):
+    repo = FakeArtifactRepository()
+    store = BlobStore(str(tmp_path))
+    service = ArtifactService(artifact_repo=repo, upload_root=str(tmp_path), blob_store=store)
+
+    async def scenario():
+        file = UploadFile(io.BytesIO(b"manual"), filename="manual.txt")
+        artifact, _ = await service.store_upload(source_id=1, file=file, conn=None)
+        await service.remove_upload(artifact, conn=None)
+        _age(artifact.path, 3600)
+        listed = [h for h, _ in store.iter_blobs()]
+        # Uploaded again between the sweeper's listing and its removal.
+        file = UploadFile(io.BytesIO(b"manual"), filename="manual.txt")
+        await service.store_upload(source_id=1, file=file, conn=None)
+        removed = store.remove(listed, older_than=time.time() - 60)
+        return artifact, removed
+
+    artifact, removed = asyncio.run(scenario())
+
+    assert removed == 0
+    assert open(artifact.path, "rb").read() == b"manual"
@@ -0,0 +1,105 @@
+import asyncio
+import errno
+from pathlib import Path
+
+import pytest
+
+from app.application.artifacts import artifact_service
+from app.application.artifacts.artifact_service import ArtifactService
+from app.infrastructure.uploads.upload_session_store import (
+    UploadOffsetMismatch,
+    UploadSessionCompleting,
+    UploadSessionStore,
+    UploadTooLarge,
+)
+from tests.artifacts.test_artifact_service import FakeArtifactRepository
+
+
+async def _stream(*pieces: bytes, fail: bool = False):
+    for piece in pieces:
+        yield piece
+    if fail:
+        raise ConnectionResetError("client went away")
+
+
+def test_upload_resumes_after_interruption_and_completes(tmp_path):
+    store = UploadSessionStore(str(tmp_path))
+    service = ArtifactService(artifact_repo=FakeArtifactRepository(), upload_root=str(tmp_path))
+    data = bytes(range(256)) * 10_000
+
+    async def scenario():
+        session = await store.create(
+            source_id=1, filename="manual.pdf", content_type="application/pdf", size=len(data)
+        )
+
+        with pytest.raises(ConnectionResetError):
+            await store.append(session.id, 0, _stream(data[:1000], data[1000:700_000], fail=True))
+        assert (await store.get(session.id)).offset == 700_000
+
+        with pytest.raises(UploadOffsetMismatch) as mismatch:
+            await store.append(session.id, 0, _stream(data))
+        assert mismatch.value.offset == 700_000
+
+        with pytest.raises(UploadTooLarge):
+            await store.append(session.id, 700_000, _stream(data[700_000:], b"extra"))
+        session = await store.get(session.id)
+        assert session.complete
+
+        artifact, created = await service.store_file(
+            source_id=1,
+            path=store.data_path(session.id),
+            filename=session.filename,
+            content_type=session.content_type,
+            conn=None,
+        )
+        await store.delete(session.id)
+        return artifact, created, session
+
+    artifact, created, session = asyncio.run(scenario())
+
+    assert created
+    assert artifact.mime_type == "application/pdf"
+    assert Path(artifact.path).read_bytes() == data
+    assert asyncio.run(store.get(session.id)) is None
+
+
+def test_file_on_another_filesystem_is_copied_into_place(tmp_path, monkeypatch):
+    service = ArtifactService(artifact_repo=FakeArtifactRepository(), upload_root=str(tmp_path))
+    path = tmp_path / "upload.bin"
+    path.write_bytes(b"manual" * 1000)
+
+    def link(src, dest):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    monkeypatch.setattr(artifact_service.os, "link", link)
+    artifact, created = asyncio.run(
+        service.store_file(
+            source_id=1, path=path, filename="manual.txt", content_type="text/plain", conn=None
+        )
+    )
+
+    assert created
+    assert Path(artifact.path).read_bytes() == path.read_bytes()
+
+
+def test_only_one_request_completes_an_upload(tmp_path):
+    store = UploadSessionStore(str(tmp_path))
+
+    async def scenario():
+        session = await store.create(
+            source_id=1, filename="a.txt", content_type="text/plain", size=5
+        )
+        await store.append(session.id, 0, _stream(b"hello"))
+
+        path = await store.start_completion(session.id)
+        with pytest.raises(UploadSessionCompleting):
+            await store.start_completion(session.id)
+        # Still visible while it is completed.
+        assert (await store.get(session.id)).complete
+
+        # A failed completion can be retried.
+        await store.cancel_completion(session.id)
+        assert await store.start_completion(session.id) == path
+        return path
+
+    assert asyncio.run(scenario()).read_bytes() == b"hello"
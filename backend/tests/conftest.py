@@ -1,5 +1,10 @@
+import os
+
 import pytest
 
+# Keep the app's embedding cache in memory, out of the working tree.
+os.environ.setdefault("EMBEDDING_CACHE_PATH", "")
+
 from tests.test_utils import create_test_app
 
 @pytest.fixture(scope="session")
@@ -0,0 +1,180 @@
+import contextlib
+from datetime import datetime, timezone
+
+import pytest
+
+from app.domain.models.crawl_state import CrawlState
+from app.domain.models.site import Site
+
+
+class FakeCursor:
+    def __init__(self, db: "FakeDatabase"):
+        self.db = db
+        self.rowcount = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, query, params):
+        self.db.queries.append((query, params))
+        self.rowcount = self.db.rowcounts.pop(0) if self.db.rowcounts else 1
+
+    async def fetchall(self):
+        return self.db.rows
+
+
+class FakeConnection:
+    def __init__(self, db: "FakeDatabase"):
+        self.db = db
+
+    def cursor(self):
+        return FakeCursor(self.db)
+
+
+class FakeDatabase:
+    """
+    Records queries and their parameters; statements return `rows` (or
+    `row`, read one at a time) and affect the next of `rowcounts` rows,
+    else 1.
+    """
+
+    def __init__(
+            self,
+            *,
+            rows: list[dict] | None = None,
+            row: dict | None = None,
+            rowcounts: list[int] | None = None,
+    ):
+        self.rows = list(rows or [])
+        self.row = row
+        self.rowcounts = list(rowcounts or [])
+        self.queries: list[tuple[str, dict]] = []
+
+    @property
+    def statements(self) -> list[str]:
+        return [query for query, _ in self.queries]
+
+    @contextlib.asynccontextmanager
+    async def transaction(self):
+        yield FakeConnection(self)
+
+    async def execute(self, query, params):
+        self.queries.append((query, params))
+
+    async def fetchone(self, query, params):
+        self.queries.append((query, params))
+        return self.row
+
+
+class FakeUrlQueue:
+    """
+    The frontier in memory, with the status rules of `UrlQueueRepository`.
+    """
+
+    def __init__(self):
+        self.states: dict[str, CrawlState] = {}
+        # Workers whose leases were all handed back.
+        self.released: list[str] = []
+
+    def add(self, url: str, **fields) -> CrawlState:
+        state = CrawlState(
+            id=url,
+            site_id=1,
+            url=url,
+            status="pending",
+            discovered_at=datetime.now(timezone.utc),
+            fetched_at=None,
+            last_error=None,
+            **fields,
+        )
+        self.states[url] = state
+        return state
+
+    def status(self, url: str) -> str:
+        return self.states[url].status
+
+    async def claim_batch(self, site_id, n, *, worker_id=None, lease_seconds=300):
+        claimed = [s for s in self.states.values() if s.status == "pending"][:n]
+        for state in claimed:
+            state.status, state.leased_by = "in_progress", worker_id
+        return claimed
+
+    async def complete_batch(self, completions, *, worker_id):
+        for c in completions:
+            state = self.states[c.state_id]
+            if state.status == "in_progress" and state.leased_by == worker_id:
+                state.status, state.checksum = "success", c.checksum or state.checksum
+
+    async def fail_batch(self, failures, *, worker_id):
+        for state_id, error in failures:
+            state = self.states[state_id]
+            if state.status == "in_progress" and state.leased_by == worker_id:
+                state.status, state.last_error = "error", error
+
+    async def release(self, worker_id):
+        self.released.append(worker_id)
+        leased = [s.id for s in self.states.values() if s.leased_by == worker_id]
+        return await self.release_batch(leased)
+
+    async def release_batch(self, state_ids):
+        released = 0
+        for state_id in state_ids:
+            state = self.states[state_id]
+            if state.status == "in_progress":
+                state.status, state.leased_by = "pending", None
+                released += 1
+        return released
+
+    async def add_url(self, site_id, url, *, depth=0, parent_url=None, priority=0):
+        await self.add_urls(site_id, [url], depth=depth, parent_url=parent_url, priority=priority)
+
+    async def add_urls(self, site_id, urls, *, depth=0, parent_url=None, priority=0):
+        new = [url for url in dict.fromkeys(urls) if url not in self.states]
+        for url in new:
+            self.add(url, depth=depth, parent_url=parent_url)
+        return len(new)
+
+    async def count_pending(self, site_id):
+        return sum(s.status in ("pending", "in_progress") for s in self.states.values())
+
+    async def heartbeat(self, worker_id, lease_seconds=300):
+        return 0
+
+
+class FakeSiteRepository:
+    """
+    One site, https://example.com, with `fields` on top.
+    """
+
+    def __init__(self, **fields):
+        self.fields = fields
+        self.updates: list[dict] = []
+        self.finished: list[int] = []
+
+    async def get(self, site_id, *, conn=None):
+        return Site(
+            id=site_id,
+            created_at=datetime.now(timezone.utc),
+            url="https://example.com",
+            start_url="https://example.com/docs/",
+            allowed_domains=["example.com"],
+            **self.fields,
+        )
+
+    async def update(self, site_id, updates, *, conn=None):
+        self.updates.append(updates)
+
+    async def finish_crawl(self, site_id, *, conn=None):
+        self.finished.append(site_id)
+        return True
+
+
+@pytest.fixture
+def fake_db():
+    """
+    Builds a `FakeDatabase`: `fake_db(rows=..., row=..., rowcounts=...)`.
+    """
+    return FakeDatabase
@@ -0,0 +1,37 @@
+import pytest
+
+from app.infrastructure.crawling import blob_codec
+
+BODY = b"<html><body>" + b"<p>Repeated paragraph.</p>" * 200 + b"</body></html>"
+
+
+def test_zlib_round_trip(monkeypatch):
+    monkeypatch.setattr(blob_codec, "zstandard", None)
+
+    codec, data = blob_codec.compress(BODY)
+
+    assert codec == blob_codec.ZLIB
+    assert len(data) < len(BODY)
+    assert blob_codec.decompress(codec, data) == BODY
+
+
+def test_zstd_round_trip():
+    pytest.importorskip("zstandard")
+
+    codec, data = blob_codec.compress(BODY)
+
+    assert codec == blob_codec.ZSTD
+    assert len(data) < len(BODY)
+    assert blob_codec.decompress(codec, data) == BODY
+
+
+def test_zstd_blob_without_zstandard_is_an_error(monkeypatch):
+    monkeypatch.setattr(blob_codec, "zstandard", None)
+
+    with pytest.raises(RuntimeError):
+        blob_codec.decompress(blob_codec.ZSTD, b"\x28\xb5\x2f\xfd")
+
+
+def test_unknown_codec_is_rejected():
+    with pytest.raises(ValueError):
+        blob_codec.decompress("lz4", b"")
@@ -0,0 +1,256 @@
+import asyncio
+import dataclasses
+from datetime import datetime, timezone
+
+from app.application.use_cases import crawl_job_runner
+from app.application.use_cases.crawl_job_runner import CrawlJobRunner
+from app.domain.models.crawl_job import CrawlJob
+
+from .conftest import FakeSiteRepository, FakeUrlQueue
+
+
+class FakeJobRepository:
+    """
+    `crawl_jobs` in memory. Jobs are handed out as copies, like rows.
+    """
+
+    def __init__(self):
+        self.jobs: dict[int, CrawlJob] = {}
+        # Active jobs whose process stopped reporting.
+        self.stale: set[int] = set()
+
+    def add(self, **fields) -> CrawlJob:
+        job = CrawlJob(id=len(self.jobs) + 1, started_at=datetime.now(timezone.utc), **fields)
+        self.jobs[job.id] = job
+        return dataclasses.replace(job)
+
+    def status(self, job_id: int) -> str:
+        return self.jobs[job_id].status
+
+    async def create(self, *, site_id, source_id, incremental=False, worker_id=None):
+        return self.add(
+            site_id=site_id,
+            source_id=source_id,
+            status="running",
+            incremental=incremental,
+            worker_id=worker_id,
+        )
+
+    async def get(self, job_id):
+        job = self.jobs.get(job_id)
+        return dataclasses.replace(job) if job else None
+
+    async def update(self, job_id, updates):
+        job = self.jobs.get(job_id)
+        if job is None:
+            return None
+        for key, value in updates.items():
+            setattr(job, key, value)
+        return dataclasses.replace(job)
+
+    async def transition(self, job_id, from_statuses, to_status, *, error=None):
+        job = self.jobs.get(job_id)
+        if job is None or job.status not in from_statuses:
+            return None
+        job.status, job.error = to_status, error
+        return dataclasses.replace(job)
+
+    async def list_resumable(self, stale_after):
+        return [job for job in self.jobs.values() if self._resumable(job)]
+
+    async def claim(self, job_id, worker_id, stale_after):
+        job = self.jobs.get(job_id)
+        if job is None or not self._resumable(job):
+            return None
+        self.stale.discard(job_id)
+        job.status = "paused" if job.status == "paused" else "running"
+        job.worker_id, job.error = worker_id, None
+        return dataclasses.replace(job)
+
+    def _resumable(self, job: CrawlJob) -> bool:
+        return job.status == "interrupted" or (
+            job.status in ("running", "paused") and job.id in self.stale
+        )
+
+
+class FakeOrchestrator:
+    """
+    Crawls `pages` pages, one per `CrawlControl.checkpoint`.
+    """
+
+    worker_id = "api-1"
+
+    def __init__(self, pages: int = 1000):
+        self.pages = pages
+        self.calls: list[dict] = []
+
+    async def crawl_site(self, site_id, *, incremental=False, control=None, resume=False):
+        self.calls.append({"site_id": site_id, "resume": resume, "control": control})
+        while control.stats.pages_fetched < self.pages:
+            if not await control.checkpoint():
+                return control.stats
+            control.stats.pages_fetched += 1
+            await asyncio.sleep(0.001)
+        return control.stats
+
+
+def _runner(monkeypatch, jobs: FakeJobRepository, orchestrator: FakeOrchestrator, **kwargs):
+    queue = FakeUrlQueue()
+    monkeypatch.setattr(crawl_job_runner, "UrlQueueRepository", lambda db: queue)
+    runner = CrawlJobRunner(
+        db=None,
+        orchestrator=orchestrator,
+        job_repository=jobs,
+        site_repository=FakeSiteRepository(source_id=7),
+        **kwargs,
+    )
+    return runner, queue
+
+
+async def _wait_for(predicate, timeout: float = 2.0) -> None:
+    async def poll():
+        while not predicate():
+            await asyncio.sleep(0.001)
+
+    await asyncio.wait_for(poll(), timeout)
+
+
+async def _finished(runner: CrawlJobRunner, job_id: int) -> None:
+    task = runner._tasks.get(job_id)
+    if task is not None:
+        await asyncio.wait_for(task, 2.0)
+
+
+def test_paused_job_takes_no_urls_until_resumed(monkeypatch):
+    jobs, orchestrator = FakeJobRepository(), FakeOrchestrator(pages=30)
+    runner, _ = _runner(monkeypatch, jobs, orchestrator)
+
+    async def scenario():
+        job = await runner.start(1)
+        control = runner._controls[job.id]
+        await _wait_for(lambda: control.stats.pages_fetched >= 5)
+
+        assert (await runner.pause(job.id)).status == "paused"
+        fetched = control.stats.pages_fetched
+        await asyncio.sleep(0.02)
+        assert control.stats.pages_fetched == fetched
+
+        assert (await runner.resume(job.id)).status == "running"
+        await _finished(runner, job.id)
+        return job
+
+    job = asyncio.run(scenario())
+
+    assert jobs.status(job.id) == "completed"
+    assert jobs.jobs[job.id].source_id == 7
+    # The final progress is written before the job is closed.
+    assert jobs.jobs[job.id].pages_fetched == 30
+
+
+def test_cancel_wakes_a_paused_job_and_the_job_stays_cancelled(monkeypatch):
+    jobs, orchestrator = FakeJobRepository(), FakeOrchestrator()
+    runner, _ = _runner(monkeypatch, jobs, orchestrator)
+
+    async def scenario():
+        job = await runner.start(1)
+        await runner.pause(job.id)
+        assert (await runner.cancel(job.id)).status == "cancelled"
+        await _finished(runner, job.id)
+        # Nothing left to pause or resume.
+        return job, await runner.pause(job.id)
+
+    job, paused = asyncio.run(scenario())
+
+    assert paused is None
+    assert jobs.status(job.id) == "cancelled"
+    assert runner._tasks == {} and runner._controls == {}
+    assert orchestrator.calls[0]["control"].cancelled
+
+
+def test_status_changes_made_by_another_process_are_applied(monkeypatch):
+    jobs, orchestrator = FakeJobRepository(), FakeOrchestrator()
+    runner, _ = _runner(monkeypatch, jobs, orchestrator, progress_interval=0.005)
+
+    async def scenario():
+        job = await runner.start(1)
+        control = runner._controls[job.id]
+
+        # Another API process only changes the row.
+        await jobs.transition(job.id, ["running"], "paused")
+        await _wait_for(lambda: control.paused)
+        await jobs.transition(job.id, ["paused"], "running")
+        await _wait_for(lambda: not control.paused)
+        await jobs.transition(job.id, ["running"], "cancelled")
+        await _finished(runner, job.id)
+        return job
+
+    job = asyncio.run(scenario())
+
+    assert jobs.status(job.id) == "cancelled"
+    assert orchestrator.calls[0]["control"].cancelled
+
+
+def test_shutdown_checkpoints_jobs_as_interrupted(monkeypatch):
+    jobs, orchestrator = FakeJobRepository(), FakeOrchestrator()
+    runner, _ = _runner(monkeypatch, jobs, orchestrator)
+
+    async def scenario():
+        job = await runner.start(1)
+        control = runner._controls[job.id]
+        await _wait_for(lambda: control.stats.pages_fetched >= 5)
+        await runner.shutdown()
+        return job, control.stats.pages_fetched
+
+    job, fetched = asyncio.run(scenario())
+
+    assert jobs.status(job.id) == "interrupted"
+    assert jobs.jobs[job.id].pages_fetched == fetched
+
+
+def test_interrupted_job_resumes_from_its_checkpoint(monkeypatch):
+    jobs, orchestrator = FakeJobRepository(), FakeOrchestrator(pages=12)
+    runner, queue = _runner(monkeypatch, jobs, orchestrator)
+    job = jobs.add(
+        site_id=1, status="interrupted", worker_id="api-old", pages_fetched=10, pages_failed=2
+    )
+
+    async def scenario():
+        resumed = await runner.resume_interrupted()
+        await _finished(runner, job.id)
+        return resumed
+
+    [resumed] = asyncio.run(scenario())
+
+    assert resumed.worker_id == "api-1"
+    # The old process's leases are handed back, and the frontier is
+    # drained without seeding it again.
+    assert queue.released == ["api-old"]
+    call = orchestrator.calls[0]
+    assert call["resume"]
+    stats = call["control"].stats
+    assert (stats.resumed_from, stats.pages_failed) == (10, 2)
+    assert call["control"].started_at == job.started_at
+    assert jobs.status(job.id) == "completed"
+    assert jobs.jobs[job.id].pages_fetched == 12
+
+
+def test_abandoned_paused_job_is_restarted_paused(monkeypatch):
+    jobs, orchestrator = FakeJobRepository(), FakeOrchestrator()
+    runner, _ = _runner(monkeypatch, jobs, orchestrator)
+    job = jobs.add(site_id=1, status="paused", worker_id="api-old")
+    # Still active and not stale: its process is alive.
+    running = jobs.add(site_id=2, status="running", worker_id="api-2")
+    jobs.stale.add(job.id)
+
+    async def scenario():
+        [resumed] = await runner.resume_interrupted()
+        paused = runner._controls[job.id].paused
+        await runner.cancel(job.id)
+        await _finished(runner, job.id)
+        return resumed, paused
+
+    resumed, paused = asyncio.run(scenario())
+
+    assert resumed.id == job.id and paused
+    assert jobs.status(running.id) == "running"
+    assert [call["site_id"] for call in orchestrator.calls] == [1]
@@ -0,0 +1,299 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.application.use_cases import crawl_orchestrator
+from app.application.use_cases.crawl_orchestrator import CrawlOrchestrator
+from app.infrastructure.crawling.html_parser import HtmlParser
+from app.infrastructure.crawling.http_fetcher import FetchResult
+from app.infrastructure.crawling.page_repository import PageRepository
+
+from .conftest import FakeSiteRepository, FakeUrlQueue
+
+PAGE = '<html><body><main>Docs</main><a href="/guide">Guide</a></body></html>'
+
+
+class FakePageRepository:
+    compute_checksum = staticmethod(PageRepository.compute_checksum)
+
+    def __init__(self, *, fail: bool = False):
+        self.fail = fail
+        self.stored: list[str] = []
+
+    async def upsert_page(self, site_id, url, raw_html, checksum=None, **kwargs):
+        if self.fail:
+            raise RuntimeError("database is gone")
+        self.stored.append(url)
+
+    async def get_simhashes(self, site_id):
+        return []
+
+    async def delete_orphan_blobs(self, grace_seconds=3600.0):
+        return 0
+
+
+class FakeFetcher:
+    """
+    Serves `result` for every URL, or `result[url]` given a dict.
+    """
+
+    def __init__(self, result: FetchResult | dict[str, FetchResult]):
+        self.result = result
+        self.requests: list[tuple[str, str | None]] = []
+
+    async def fetch(self, url, *, etag=None, last_modified=None):
+        self.requests.append((url, etag))
+        return self.result[url] if isinstance(self.result, dict) else self.result
+
+
+class CountingParser(HtmlParser):
+    def __init__(self):
+        super().__init__()
+        self.parsed = 0
+
+    async def analyze_async(self, html, base_url, allowed_domains):
+        self.parsed += 1
+        return await super().analyze_async(html, base_url, allowed_domains)
+
+
+def _orchestrator(monkeypatch, queue, pages, fetcher, parser, **kwargs) -> CrawlOrchestrator:
+    monkeypatch.setattr(crawl_orchestrator, "UrlQueueRepository", lambda db: queue)
+    monkeypatch.setattr(crawl_orchestrator, "PageRepository", lambda db: pages)
+    options = dict(workers=2, respect_robots=False, use_sitemaps=False, near_duplicate_distance=None)
+    return CrawlOrchestrator(
+        None,
+        FakeSiteRepository(),
+        fetcher=fetcher,
+        parser=parser,
+        **{**options, **kwargs},
+    )
+
+
+def _crawl(monkeypatch, queue: FakeUrlQueue, pages: FakePageRepository, result: FetchResult):
+    fetcher, parser = FakeFetcher(result), CountingParser()
+    orchestrator = _orchestrator(monkeypatch, queue, pages, fetcher, parser)
+    stats = asyncio.run(orchestrator.drain_site(1))
+    return stats, fetcher, parser
+
+
+def test_not_modified_page_is_neither_stored_nor_parsed(monkeypatch):
+    queue, pages = FakeUrlQueue(), FakePageRepository()
+    queue.add("https://example.com/docs/", etag='"v1"', checksum="abc")
+
+    stats, fetcher, parser = _crawl(monkeypatch, queue, pages, FetchResult(status=304))
+
+    assert fetcher.requests == [("https://example.com/docs/", '"v1"')]
+    assert stats.pages_unchanged == 1
+    assert pages.stored == [] and parser.parsed == 0
+    assert list(queue.states) == ["https://example.com/docs/"]
+    assert queue.status("https://example.com/docs/") == "success"
+
+
+def test_unchanged_checksum_skips_store_and_links(monkeypatch):
+    queue, pages = FakeUrlQueue(), FakePageRepository()
+    queue.add("https://example.com/docs/", checksum=PageRepository.compute_checksum(PAGE))
+
+    stats, _, parser = _crawl(monkeypatch, queue, pages, FetchResult(status=200, text=PAGE))
+
+    assert stats.pages_unchanged == 1
+    assert pages.stored == [] and parser.parsed == 0
+    assert list(queue.states) == ["https://example.com/docs/"]
+
+
+def test_changed_page_is_stored_and_its_links_queued(monkeypatch):
+    queue, pages = FakeUrlQueue(), FakePageRepository()
+    queue.add("https://example.com/docs/", checksum="stale")
+
+    stats, _, _ = _crawl(monkeypatch, queue, pages, FetchResult(status=200, text=PAGE))
+
+    assert pages.stored[0] == "https://example.com/docs/"
+    assert "https://example.com/guide" in queue.states
+    assert queue.status("https://example.com/docs/") == "success"
+    assert queue.states["https://example.com/docs/"].checksum == PageRepository.compute_checksum(PAGE)
+
+
+@pytest.mark.parametrize("checksum", [None, "stale"])
+def test_failed_upsert_leaves_url_in_error(monkeypatch, checksum):
+    queue, pages = FakeUrlQueue(), FakePageRepository(fail=True)
+    queue.add("https://example.com/docs/", checksum=checksum)
+
+    stats, _, _ = _crawl(monkeypatch, queue, pages, FetchResult(status=200, text=PAGE))
+
+    state = queue.states["https://example.com/docs/"]
+    assert state.status == "error"
+    assert state.last_error == "database is gone"
+    # The next recrawl must not take the page for unchanged.
+    assert state.checksum == checksum
+    assert stats.pages_failed == 1
+
+
+def test_relative_links_resolve_against_the_final_url(monkeypatch):
+    queue, pages = FakeUrlQueue(), FakePageRepository()
+    queue.add("https://example.com/docs")
+    page = '<html><body><a href="intro">Intro</a></body></html>'
+    # /docs redirected to the /docs/ directory page.
+    result = FetchResult(status=200, text=page, url="https://example.com/docs/")
+
+    _crawl(monkeypatch, queue, pages, result)
+
+    assert "https://example.com/docs/intro" in queue.states
+    assert "https://example.com/intro" not in queue.states
+
+
+def test_finished_crawl_drops_the_site_simhash_index(monkeypatch):
+    queue, pages = FakeUrlQueue(), FakePageRepository()
+    page = f"<html><body><main>{'Words of a long enough documentation page. ' * 20}</main></body></html>"
+    result = FetchResult(status=200, text=page)
+    orchestrator = _orchestrator(
+        monkeypatch, queue, pages, FakeFetcher(result), CountingParser(), near_duplicate_distance=3
+    )
+
+    async def crawl():
+        await orchestrator.drain_site(1)
+        kept = 1 in orchestrator._simhash_indexes
+        await orchestrator.crawl_site(1, resume=True)
+        return kept
+
+    queue.add("https://example.com/docs/")
+    # Between drains of the same crawl, the index is kept.
+    assert asyncio.run(crawl())
+    assert orchestrator._simhash_indexes == {}
+    assert orchestrator.site_repo.updates
+
+
+def test_links_beyond_the_site_max_depth_are_not_queued(monkeypatch):
+    queue, pages = FakeUrlQueue(), FakePageRepository()
+    queue.add("https://example.com/docs/", depth=0)
+    queue.add("https://example.com/docs/deep", depth=1)
+    fetcher = FakeFetcher({
+        "https://example.com/docs/": FetchResult(status=200, text=PAGE),
+        "https://example.com/docs/deep": FetchResult(
+            status=200, text='<html><body><a href="/faq">FAQ</a></body></html>'
+        ),
+        "https://example.com/guide": FetchResult(status=200, text=PAGE),
+    })
+    orchestrator = _orchestrator(monkeypatch, queue, pages, fetcher, CountingParser())
+    orchestrator.site_repo = FakeSiteRepository(max_depth=1)
+
+    asyncio.run(orchestrator.drain_site(1))
+
+    guide = queue.states["https://example.com/guide"]
+    assert (guide.depth, guide.parent_url) == (1, "https://example.com/docs/")
+    # The deep page is stored, but not followed.
+    assert "https://example.com/docs/deep" in pages.stored
+    assert "https://example.com/faq" not in queue.states
+
+
+class SlowFetcher(FakeFetcher):
+    """
+    Takes a moment per page, recording how many fetches overlap.
+    """
+
+    def __init__(self, result: FetchResult):
+        super().__init__(result)
+        self.active = self.most_active = 0
+
+    async def fetch(self, url, *, etag=None, last_modified=None):
+        self.active += 1
+        self.most_active = max(self.most_active, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        return await super().fetch(url, etag=etag, last_modified=last_modified)
+
+
+def test_workers_fetch_the_frontier_concurrently_and_each_url_once(monkeypatch):
+    queue, pages = FakeUrlQueue(), FakePageRepository()
+    urls = [f"https://example.com/docs/{i}" for i in range(20)]
+    for url in urls:
+        queue.add(url)
+    fetcher = SlowFetcher(FetchResult(status=200, text="<html><body>Docs</body></html>"))
+    orchestrator = _orchestrator(
+        monkeypatch,
+        queue,
+        pages,
+        fetcher,
+        CountingParser(),
+        workers=4,
+        claim_batch_size=3,
+        max_per_host=8,
+        host_rate=1000.0,
+        host_burst=20,
+    )
+
+    stats = asyncio.run(orchestrator.drain_site(1))
+
+    assert sorted(url for url, _ in fetcher.requests) == sorted(urls)
+    assert fetcher.most_active == 4
+    assert stats.pages_fetched == 20
+    assert all(queue.status(url) == "success" for url in urls)
+
+
+class InterruptedSitemaps:
+    """
+    A sitemap walk the crawl is interrupted in, after one entry.
+    """
+
+    async def discover(self, start_url):
+        return ["https://example.com/sitemap.xml"]
+
+    async def entries(self, sitemap_urls):
+        yield SimpleNamespace(url="https://example.com/docs/a", lastmod=None)
+        raise asyncio.CancelledError
+
+
+def test_start_url_is_queued_before_a_sitemap_walk_that_gets_interrupted(monkeypatch):
+    queue, pages = FakeUrlQueue(), FakePageRepository()
+    orchestrator = _orchestrator(
+        monkeypatch, queue, pages, FakeFetcher(FetchResult(status=304)), CountingParser()
+    )
+    orchestrator.sitemaps = InterruptedSitemaps()
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(orchestrator.seed_site(1))
+
+    # What a resumed crawl, which does not seed again, will drain.
+    assert "https://example.com/docs/" in queue.states
+
+
+class LockCheckingRobots:
+    """
+    Allows everything, recording whether URLs were leased meanwhile.
+    """
+
+    def __init__(self, runs: list):
+        self.runs = runs
+        self.locked_while_fetching: list[bool] = []
+
+    async def prefetch(self, urls):
+        self.locked_while_fetching.append(self.runs[0].claim_lock.locked())
+        await asyncio.sleep(0.01)
+
+    async def allowed(self, url):
+        return True
+
+    async def crawl_delay(self, url):
+        return None
+
+
+def test_robots_txt_is_fetched_outside_the_claim_lock(monkeypatch):
+    runs = []
+
+    class RecordedRun(crawl_orchestrator._CrawlRun):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            runs.append(self)
+
+    monkeypatch.setattr(crawl_orchestrator, "_CrawlRun", RecordedRun)
+    queue, pages = FakeUrlQueue(), FakePageRepository()
+    for n in range(3):
+        queue.add(f"https://example.com/docs/{n}")
+    orchestrator = _orchestrator(
+        monkeypatch, queue, pages, FakeFetcher(FetchResult(status=304)), CountingParser()
+    )
+    orchestrator.robots = robots = LockCheckingRobots(runs)
+
+    asyncio.run(orchestrator.drain_site(1))
+
+    assert robots.locked_while_fetching == [False]
+    assert all(state.status == "success" for state in queue.states.values())
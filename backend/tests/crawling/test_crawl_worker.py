@@ -0,0 +1,114 @@
+import asyncio
+
+from app.application.use_cases.crawl_worker import CrawlWorker
+
+from .conftest import FakeSiteRepository
+
+
+class FakeQueue:
+    def __init__(self, pending: int, seeds: list[tuple[int, bool]] | None = None):
+        self.pending = pending
+        self.seeds = list(seeds or [])
+        self.finished_seeds: list[int] = []
+        self.released_sites: list[int] = []
+
+    async def claim_seed(self, worker_id, lease_seconds=300):
+        return self.seeds.pop(0) if self.seeds else None
+
+    async def finish_seed(self, site_id, worker_id):
+        self.finished_seeds.append(site_id)
+        return True
+
+    async def sites_with_work(self):
+        return [1]
+
+    async def count_pending(self, site_id):
+        return self.pending
+
+    async def heartbeat_seeds(self, worker_id, lease_seconds=300):
+        return 0
+
+    async def reclaim_expired(self):
+        return 0
+
+    async def release(self, worker_id):
+        return 0
+
+    async def release_site(self, site_id, worker_id):
+        self.released_sites.append(site_id)
+        return 2
+
+
+class FakeCrawler:
+    worker_id = "test-worker"
+    lease_seconds = 300
+
+    def __init__(self, stop: asyncio.Event, failures: int = 0):
+        self.stop = stop
+        self.failures = failures
+        self.drains = 0
+        self.site_repo = FakeSiteRepository()
+        self.seeded: list[tuple[int, bool]] = []
+        self.forgotten: list[int] = []
+        self.sweeps = 0
+
+    async def seed_site(self, site_id, *, recrawl=False):
+        self.seeded.append((site_id, recrawl))
+
+    async def drain_site(self, site_id, *, max_pages=None):
+        self.drains += 1
+        if self.drains <= self.failures:
+            raise ConnectionError("database went away")
+        self.stop.set()
+
+    def forget_site(self, site_id):
+        self.forgotten.append(site_id)
+
+    async def sweep_page_blobs(self):
+        self.sweeps += 1
+        return 0
+
+
+def _run(queue: FakeQueue, *, failures: int = 0) -> FakeCrawler:
+    async def run() -> FakeCrawler:
+        stop = asyncio.Event()
+        crawler = FakeCrawler(stop, failures)
+        worker = CrawlWorker(db=None, crawler=crawler, poll_interval=0.01)
+        worker.queue = queue
+        await worker.run(stop)
+        return crawler
+
+    return asyncio.run(run())
+
+
+def test_drained_site_records_its_crawl_as_finished():
+    crawler = _run(FakeQueue(pending=0))
+    assert crawler.site_repo.finished == [1]
+    assert crawler.forgotten == [1]
+    assert crawler.sweeps == 1
+
+
+def test_site_with_urls_left_is_not_finished():
+    crawler = _run(FakeQueue(pending=3))
+    assert crawler.site_repo.finished == []
+    assert crawler.forgotten == []
+    assert crawler.sweeps == 0
+
+
+def test_queued_crawls_are_seeded_before_draining():
+    queue = FakeQueue(pending=0, seeds=[(2, True), (3, False)])
+
+    crawler = _run(queue)
+
+    assert crawler.seeded == [(2, True), (3, False)]
+    assert queue.finished_seeds == [2, 3]
+
+
+def test_failed_site_is_released_and_the_worker_carries_on():
+    queue = FakeQueue(pending=0)
+
+    crawler = _run(queue, failures=2)
+
+    assert crawler.drains == 3
+    assert queue.released_sites == [1, 1]
+    assert crawler.site_repo.finished == [1]
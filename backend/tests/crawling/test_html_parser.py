@@ -0,0 +1,81 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from app.infrastructure.crawling.html_parser import HtmlParser, analyze_html
+
+PAGE = """
+<html lang="en">
+<head>
+  <title> Install guide </title>
+  <meta name="Description" content="How to install Aurora">
+  <meta property="og:type" content="article">
+  <meta name="empty" content="">
+  <link rel="canonical" href="https://example.com/docs/install">
+  <script>var tracking = "not text";</script>
+</head>
+<body>
+  <nav><a href="/docs/">Docs</a> <a href="https://other.org/">Elsewhere</a></nav>
+  <main>
+    <h1>Install</h1>
+    <p>Run the installer, then <a href="setup#step-2">set it up</a>.</p>
+  </main>
+  <footer>Copyright <a href="mailto:team@example.com">team</a></footer>
+</body>
+</html>
+"""
+
+
+def test_one_parse_yields_links_title_text_and_metadata():
+    analysis = analyze_html(PAGE, "https://example.com/docs/install", ["example.com"])
+
+    # Navigation links count for the link graph; other domains and
+    # non-HTTP links do not.
+    assert analysis.links == ["https://example.com/docs/", "https://example.com/docs/setup"]
+    assert analysis.title == "Install guide"
+    # The main content only: no script, navigation or footer.
+    assert analysis.text.split() == "Install Run the installer, then set it up .".split()
+    assert analysis.metadata == {
+        "lang": "en",
+        "description": "How to install Aurora",
+        "og:type": "article",
+        "canonical": "https://example.com/docs/install",
+    }
+
+
+def test_text_falls_back_to_the_body_without_boilerplate():
+    page = "<html><body><header>Menu</header><p>Plain page</p><style>p {}</style></body></html>"
+
+    analysis = analyze_html(page, "https://example.com/", ["example.com"])
+
+    assert analysis.text == "Plain page"
+    assert analysis.title == "" and analysis.metadata == {}
+    # Too short to fingerprint.
+    assert analysis.simhash is None
+
+
+def test_same_text_same_simhash_whatever_the_markup():
+    words = "Aurora indexes documentation sites and answers questions about them. " * 10
+    first = analyze_html(f"<main><p>{words}</p></main>", "https://example.com/", [])
+    second = analyze_html(
+        f"<article><div>{words}</div></article><nav>Other</nav>", "https://example.com/", []
+    )
+
+    assert first.simhash is not None
+    assert first.simhash == second.simhash
+
+
+def test_analysis_in_a_process_pool_matches_inline():
+    executor = ProcessPoolExecutor(max_workers=1)
+    parser = HtmlParser(executor)
+    pooled = asyncio.run(
+        parser.analyze_async(PAGE, "https://example.com/docs/install", ["example.com"])
+    )
+    parser.close()
+
+    assert pooled == analyze_html(PAGE, "https://example.com/docs/install", ["example.com"])
+    # The pool is gone; parsing carries on inline.
+    with pytest.raises(RuntimeError):
+        executor.submit(analyze_html, PAGE, "https://example.com/", [])
+    assert parser.executor is None
@@ -0,0 +1,68 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.infrastructure.crawling.http_fetcher import HttpFetcher
+
+
+def _fetch(path: str, handler, **kwargs):
+    async def scenario():
+        fetcher = HttpFetcher(**kwargs)
+        fetcher.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return await fetcher.fetch(f"https://example.com{path}")
+
+    return asyncio.run(scenario())
+
+
+def test_skips_body_of_unsupported_content_type():
+    result = _fetch(
+        "/manual.pdf",
+        lambda request: httpx.Response(
+            200, headers={"Content-Type": "application/pdf"}, content=b"%PDF-1.7"
+        ),
+    )
+    assert result.text is None
+    assert result.error == "Unsupported content type: application/pdf"
+
+
+def test_aborts_bodies_over_the_size_cap():
+    result = _fetch(
+        "/huge",
+        lambda request: httpx.Response(
+            200, headers={"Content-Type": "text/html"}, content=b"x" * 2048
+        ),
+        max_body_bytes=1024,
+    )
+    assert result.text is None
+    assert result.error is not None
+
+
+def test_decodes_declared_charset():
+    result = _fetch(
+        "/",
+        lambda request: httpx.Response(
+            200,
+            headers={"Content-Type": "text/html; charset=iso-8859-1"},
+            content="café".encode("latin-1"),
+        ),
+    )
+    assert result.status == 200
+    assert result.text == "café"
+
+
+def test_transport_errors_are_reported_with_the_result():
+    def handler(request):
+        raise httpx.ConnectError("Connection refused", request=request)
+
+    result = _fetch("/down", handler)
+
+    assert (result.status, result.error) == (0, "Connection refused")
+
+
+def test_unexpected_errors_are_not_swallowed():
+    def handler(request):
+        raise KeyError("bug")
+
+    with pytest.raises(KeyError):
+        _fetch("/", handler)
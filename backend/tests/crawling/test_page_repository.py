@@ -0,0 +1,65 @@
+import asyncio
+
+from app.infrastructure.crawling import blob_codec
+from app.infrastructure.crawling.page_repository import PageRepository
+
+PAGE = "<html><body>Docs</body></html>"
+
+
+def _blob_writes(db) -> int:
+    return sum("INSERT INTO page_blobs" in query for query in db.statements)
+
+
+def test_known_blob_is_reused_without_writing_it_again(fake_db):
+    db = fake_db()
+    pages = PageRepository(db)
+
+    async def store():
+        await pages.upsert_page(1, "https://a.com/1", PAGE)
+        await pages.upsert_page(1, "https://a.com/2", PAGE)
+
+    asyncio.run(store())
+
+    assert _blob_writes(db) == 1
+    assert "UPDATE page_blobs SET referenced_at" in db.statements[1]
+
+
+def test_blob_deleted_as_orphan_is_written_again(fake_db):
+    # The reuse finds no blob and writes no page.
+    db = fake_db(rowcounts=[1, 0, 1])
+    pages = PageRepository(db)
+
+    async def store():
+        await pages.upsert_page(1, "https://a.com/1", PAGE)
+        await pages.upsert_page(1, "https://a.com/2", PAGE)
+
+    asyncio.run(store())
+
+    assert len(db.queries) == 3
+    assert _blob_writes(db) == 2
+
+
+def test_orphan_blobs_are_those_no_page_references(fake_db):
+    db = fake_db(rowcounts=[4])
+
+    deleted = asyncio.run(PageRepository(db).delete_orphan_blobs(grace_seconds=60))
+
+    assert deleted == 4
+    assert "NOT EXISTS (SELECT 1 FROM pages p WHERE p.checksum = b.checksum)" in db.statements[0]
+
+
+def test_page_body_is_read_back_from_its_blob(fake_db):
+    codec, data = blob_codec.compress(PAGE.encode())
+    db = fake_db(row={"codec": codec, "data": data, "inline_html": None})
+
+    html = asyncio.run(PageRepository(db).get_html(1, "https://a.com/1"))
+
+    assert html == PAGE
+    assert "LEFT JOIN page_blobs b ON b.checksum = p.checksum" in db.statements[0]
+
+
+def test_pages_stored_inline_before_blobs_are_still_read(fake_db):
+    db = fake_db(row={"codec": None, "data": None, "inline_html": PAGE})
+
+    assert asyncio.run(PageRepository(db).get_html(1, "https://a.com/1")) == PAGE
+    assert asyncio.run(PageRepository(fake_db()).get_html(1, "https://a.com/2")) is None
@@ -0,0 +1,152 @@
+import asyncio
+
+import httpx
+
+from app.domain.models.crawl_state import CrawlState
+from app.infrastructure.crawling.politeness import (
+    PolitenessScheduler,
+    RobotsCache,
+    TokenBucket,
+)
+
+
+def _state(url: str) -> CrawlState:
+    return CrawlState(
+        id=url,
+        site_id="1",
+        url=url,
+        status="in_progress",
+        discovered_at=None,
+        fetched_at=None,
+        last_error=None,
+    )
+
+
+def test_token_bucket_refills_over_time():
+    bucket = TokenBucket(rate=2.0, capacity=1)
+    assert bucket.try_acquire(now=bucket.updated)
+    assert not bucket.try_acquire(now=bucket.updated)
+    assert bucket.delay(now=bucket.updated) == 0.5
+    assert bucket.try_acquire(now=bucket.updated + 0.5)
+
+
+def test_scheduler_moves_on_to_ready_hosts():
+    async def scenario():
+        scheduler = PolitenessScheduler(
+            robots=None, buckets={}, rate=1.0, burst=1, max_per_host=4
+        )
+        for url in ("https://a.com/1", "https://a.com/2", "https://b.com/1"):
+            await scheduler.submit(_state(url))
+
+        first = scheduler.pop_ready()
+        second = scheduler.pop_ready()
+        # a.com is out of tokens, so nothing else is ready yet.
+        third = scheduler.pop_ready()
+        return first, second, third, scheduler.pending
+
+    first, second, third, pending = asyncio.run(scenario())
+    assert {first.url, second.url} == {"https://a.com/1", "https://b.com/1"}
+    assert third is None
+    assert pending == 1
+
+
+def test_scheduler_caps_concurrency_per_host():
+    async def scenario():
+        scheduler = PolitenessScheduler(
+            robots=None, buckets={}, rate=100.0, burst=10, max_per_host=1
+        )
+        await scheduler.submit(_state("https://a.com/1"))
+        await scheduler.submit(_state("https://a.com/2"))
+
+        first = scheduler.pop_ready()
+        blocked = scheduler.pop_ready()
+        scheduler.release(first.url)
+        return blocked, scheduler.pop_ready()
+
+    blocked, after_release = asyncio.run(scenario())
+    assert blocked is None
+    assert after_release.url == "https://a.com/2"
+
+
+def test_robots_cache_honors_disallow_and_crawl_delay():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(
+            200,
+            text="User-agent: *\nDisallow: /private\nCrawl-delay: 2\n",
+        )
+
+    async def scenario():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        robots = RobotsCache(client, user_agent="AuroraRAG")
+        return (
+            await robots.allowed("https://a.com/docs"),
+            await robots.allowed("https://a.com/private/x"),
+            await robots.crawl_delay("https://a.com/"),
+        )
+
+    allowed, disallowed, delay = asyncio.run(scenario())
+    assert allowed and not disallowed
+    assert delay == 2.0
+    assert calls == ["/robots.txt"]
+
+
+def test_robots_cache_falls_back_on_error_statuses():
+    statuses = {"a.com": 404, "b.com": 403, "c.com": 503}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(statuses[request.url.host])
+
+    async def scenario():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        robots = RobotsCache(client, user_agent="AuroraRAG")
+        return [await robots.allowed(f"https://{host}/docs") for host in statuses]
+
+    assert asyncio.run(scenario()) == [True, False, True]
+
+
+def test_host_bucket_follows_a_refetched_crawl_delay():
+    robots_txt = {"delay": 2}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, text=f"User-agent: *\nCrawl-delay: {robots_txt['delay']}\n")
+
+    async def scenario():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        # Expired at once: every URL refetches robots.txt.
+        robots = RobotsCache(client, user_agent="AuroraRAG", ttl=0)
+        buckets: dict[str, TokenBucket] = {}
+        scheduler = PolitenessScheduler(
+            robots=robots, buckets=buckets, rate=10.0, burst=4, max_per_host=4
+        )
+        await scheduler.submit(_state("https://a.com/1"))
+        first = buckets["a.com"].rate
+        robots_txt["delay"] = 4
+        await scheduler.submit(_state("https://a.com/2"))
+        return first, buckets["a.com"].rate
+
+    assert asyncio.run(scenario()) == (0.5, 0.25)
+
+
+def test_robots_cache_keeps_the_most_recently_used_origins():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.host)
+        return httpx.Response(404)
+
+    async def scenario():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        robots = RobotsCache(client, user_agent="AuroraRAG", max_entries=2)
+        await robots.prefetch(["https://a.com/1", "https://b.com/1", "https://a.com/2"])
+        # a.com is used again, so b.com is dropped for c.com.
+        await robots.allowed("https://a.com/3")
+        await robots.allowed("https://c.com/1")
+        await robots.prefetch(["https://a.com/4", "https://b.com/2"])
+
+    asyncio.run(scenario())
+
+    assert sorted(calls[:2]) == ["a.com", "b.com"]
+    assert calls[2:] == ["c.com", "b.com"]
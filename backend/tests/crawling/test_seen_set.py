@@ -0,0 +1,38 @@
+from app.infrastructure.crawling.seen_set import BloomFilter, SeenUrlSet
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=1e-3)
+    urls = [f"https://example.com/{i}" for i in range(1000)]
+    for url in urls:
+        bloom.add(url)
+
+    assert all(url in bloom for url in urls)
+
+
+def test_bloom_filter_false_positive_rate_is_bounded():
+    bloom = BloomFilter(capacity=5000, error_rate=1e-2)
+    for i in range(5000):
+        bloom.add(f"https://example.com/{i}")
+
+    false_positives = sum(
+        f"https://other.com/{i}" in bloom for i in range(10_000)
+    )
+    assert false_positives < 300
+
+
+def test_seen_set_rejects_repeats():
+    seen = SeenUrlSet(initial_capacity=10)
+    assert seen.add("https://example.com/a")
+    assert not seen.add("https://example.com/a")
+    assert len(seen) == 1
+
+
+def test_seen_set_grows_past_initial_capacity():
+    seen = SeenUrlSet(initial_capacity=100)
+    small = seen.memory_bytes
+    urls = [f"https://example.com/{i}" for i in range(1000)]
+    assert all(seen.add(url) for url in urls)
+    assert all(url in seen for url in urls)
+    assert len(seen) == 1000
+    assert seen.memory_bytes > small
@@ -0,0 +1,54 @@
+import random
+
+from app.infrastructure.crawling.simhash import (
+    SimHashIndex,
+    hamming_distance,
+    simhash,
+    to_signed,
+    to_unsigned,
+)
+
+ARTICLE = " ".join(
+    f"paragraph {i} explains how the ingestion pipeline handles source number {i * 7}"
+    for i in range(40)
+)
+
+
+def test_small_edits_keep_fingerprints_close():
+    original = simhash(ARTICLE + " Last updated 2024-05-01")
+    edited = simhash(ARTICLE + " Last updated 2024-06-17")
+    unrelated = simhash(" ".join(f"recipe step {i} adds {i} grams of flour" for i in range(60)))
+
+    assert hamming_distance(original, edited) <= 3
+    assert hamming_distance(original, unrelated) > 10
+
+
+def test_short_text_has_no_fingerprint():
+    assert simhash("Loading...") is None
+
+
+def test_signed_round_trip():
+    for value in (0, 1, (1 << 63) - 1, 1 << 63, (1 << 64) - 1):
+        signed = to_signed(value)
+        assert -(1 << 63) <= signed < 1 << 63
+        assert to_unsigned(signed) == value
+
+
+def test_index_finds_fingerprints_within_distance():
+    rng = random.Random(7)
+    index = SimHashIndex(max_distance=3)
+    fingerprints = {f"https://a.test/{i}": rng.getrandbits(64) for i in range(500)}
+    for url, fingerprint in fingerprints.items():
+        index.add(url, fingerprint)
+
+    target = fingerprints["https://a.test/42"]
+    near = target ^ (1 << 3) ^ (1 << 40) ^ (1 << 63)
+    far = target ^ 0b11111
+
+    assert index.find(near) == "https://a.test/42"
+    assert index.find(far) is None
+    assert index.find(target, exclude="https://a.test/42") is None
+
+    index.remove("https://a.test/42")
+    assert index.find(near) is None
+    assert len(index) == 499
@@ -0,0 +1,87 @@
+import asyncio
+import gzip
+from datetime import datetime, timezone
+
+import httpx
+
+from app.infrastructure.crawling.politeness import RobotsCache
+from app.infrastructure.crawling.sitemap import SitemapReader, parse_lastmod
+
+INDEX = b"""<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>https://docs.test/sitemap-a.xml</loc></sitemap>
+  <sitemap><loc>https://docs.test/sitemap-b.xml.gz</loc></sitemap>
+</sitemapindex>"""
+
+URLSET_A = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>https://docs.test/a</loc><lastmod>2024-05-01</lastmod></url>
+  <url><loc> https://docs.test/b </loc></url>
+</urlset>"""
+
+URLSET_B = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>https://docs.test/c</loc><lastmod>2024-05-01T10:30:00+02:00</lastmod></url>
+</urlset>"""
+
+
+def _client() -> httpx.AsyncClient:
+    responses = {
+        "/robots.txt": b"User-agent: *\nSitemap: https://docs.test/sitemap-index.xml\n",
+        "/sitemap-index.xml": INDEX,
+        "/sitemap-a.xml": URLSET_A,
+        "/sitemap-b.xml.gz": gzip.compress(URLSET_B),
+    }
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = responses.get(request.url.path)
+        return httpx.Response(200, content=body) if body else httpx.Response(404)
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+async def _collect(reader: SitemapReader, start_url: str, sitemap_urls=None):
+    sitemap_urls = sitemap_urls or await reader.discover(start_url)
+    return [entry async for entry in reader.entries(sitemap_urls)]
+
+
+def test_parse_lastmod():
+    assert parse_lastmod("2024-05-01") == datetime(2024, 5, 1, tzinfo=timezone.utc)
+    assert parse_lastmod("2024-05-01T08:30:00Z") == datetime(2024, 5, 1, 8, 30, tzinfo=timezone.utc)
+    assert parse_lastmod("yesterday") is None
+    assert parse_lastmod(None) is None
+
+
+def test_reader_follows_index_and_gzipped_sitemaps():
+    client = _client()
+    reader = SitemapReader(client, robots=RobotsCache(client, user_agent="test"))
+
+    entries = asyncio.run(_collect(reader, "https://docs.test/start"))
+
+    assert [e.url for e in entries] == [
+        "https://docs.test/a",
+        "https://docs.test/b",
+        "https://docs.test/c",
+    ]
+    assert entries[0].lastmod == datetime(2024, 5, 1, tzinfo=timezone.utc)
+    assert entries[1].lastmod is None
+    assert entries[2].lastmod == datetime(2024, 5, 1, 8, 30, tzinfo=timezone.utc)
+
+
+def test_reader_falls_back_to_sitemap_xml_and_tolerates_missing():
+    reader = SitemapReader(_client())
+
+    assert asyncio.run(reader.discover("https://docs.test/start")) == [
+        "https://docs.test/sitemap.xml"
+    ]
+    assert asyncio.run(_collect(reader, "https://docs.test/start")) == []
+
+
+def test_reader_stops_at_max_bytes():
+    reader = SitemapReader(_client(), max_bytes=200)
+
+    entries = asyncio.run(
+        _collect(reader, "https://docs.test/start", ["https://docs.test/sitemap-a.xml"])
+    )
+
+    assert len(entries) < 2
@@ -0,0 +1,48 @@
+from app.infrastructure.crawling.url_canonicalizer import canonicalize_url
+
+
+def test_drops_fragment_and_keeps_trailing_slash():
+    assert canonicalize_url("https://example.com/docs/#intro") == "https://example.com/docs/"
+    assert canonicalize_url("https://example.com/docs#intro") == "https://example.com/docs"
+
+
+def test_lowercases_scheme_and_host_and_drops_default_port():
+    assert canonicalize_url("HTTPS://Example.COM:443/Docs") == "https://example.com/Docs"
+
+
+def test_keeps_non_default_port():
+    assert canonicalize_url("http://example.com:8080/a") == "http://example.com:8080/a"
+
+
+def test_strips_tracking_params_and_sorts_query():
+    url = "https://example.com/a?utm_source=x&b=2&a=1&fbclid=abc"
+    assert canonicalize_url(url) == "https://example.com/a?a=1&b=2"
+
+
+def test_query_parameters_keep_their_encoding():
+    url = "https://example.com/search?q=a+b&path=docs%2Fapi&flag&&UTM_Source=x"
+    assert canonicalize_url(url) == "https://example.com/search?flag&path=docs%2Fapi&q=a+b"
+
+
+def test_resolves_dot_segments_and_duplicate_slashes():
+    assert canonicalize_url("https://example.com//a/./b/../c/") == "https://example.com/a/c/"
+    assert canonicalize_url("https://example.com/a/b/..") == "https://example.com/a/"
+
+
+def test_root_path():
+    assert canonicalize_url("https://example.com") == "https://example.com/"
+    assert canonicalize_url("https://example.com/") == "https://example.com/"
+
+
+def test_normalizes_percent_escapes():
+    assert canonicalize_url("https://example.com/%7euser/a%2fb") == "https://example.com/~user/a%2Fb"
+
+
+def test_rejects_non_http_urls():
+    assert canonicalize_url("mailto:someone@example.com") is None
+    assert canonicalize_url("javascript:void(0)") is None
+
+
+def test_keeps_brackets_of_ipv6_hosts():
+    assert canonicalize_url("http://[::1]:8080/a") == "http://[::1]:8080/a"
+    assert canonicalize_url("https://[2001:DB8::1]:443/") == "https://[2001:db8::1]/"
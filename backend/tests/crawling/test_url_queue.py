@@ -0,0 +1,117 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from app.infrastructure.crawling.url_queue import Completion, UrlQueueRepository
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _row(state_id: str, *, priority: int = 0, depth: int = 0, age: int = 0) -> dict:
+    return {
+        "id": state_id,
+        "site_id": 1,
+        "url": f"https://example.com/{state_id}",
+        "status": "in_progress",
+        "discovered_at": NOW - timedelta(seconds=age),
+        "fetched_at": None,
+        "last_error": None,
+        "leased_by": "worker-1",
+        "priority": priority,
+        "depth": depth,
+    }
+
+
+def test_claim_batch_leases_for_the_worker_in_frontier_order(fake_db):
+    # RETURNING gives no order: rows come back as updated.
+    db = fake_db(rows=[
+        _row("deep", depth=2),
+        _row("newer", depth=1),
+        _row("sitemap", priority=10, depth=3),
+        _row("older", depth=1, age=60),
+    ])
+    queue = UrlQueueRepository(db)
+
+    states = asyncio.run(queue.claim_batch(1, 4, worker_id="worker-1", lease_seconds=30))
+
+    assert [s.id for s in states] == ["sitemap", "older", "newer", "deep"]
+    query, params = db.queries[0]
+    assert "FOR UPDATE SKIP LOCKED" in query
+    assert params == {"site_id": 1, "n": 4, "worker_id": "worker-1", "lease_seconds": 30}
+
+
+def test_outcomes_are_recorded_in_one_statement_for_the_lease_owner(fake_db):
+    db = fake_db()
+    queue = UrlQueueRepository(db)
+
+    async def record():
+        await queue.complete_batch(
+            [Completion("a", etag='"v1"'), Completion("b", checksum="abc")],
+            worker_id="worker-1",
+        )
+        await queue.fail_batch([("c", "timeout"), ("d", "HTTP 500")], worker_id="worker-1")
+
+    asyncio.run(record())
+
+    (completed, completions), (failed, failures) = db.queries
+    assert "c.leased_by=%(worker_id)s" in completed
+    assert completions == {
+        "worker_id": "worker-1",
+        "ids": ["a", "b"],
+        "etags": ['"v1"', None],
+        "last_modifieds": [None, None],
+        "checksums": [None, "abc"],
+    }
+    assert "c.leased_by=%(worker_id)s" in failed
+    assert failures == {"worker_id": "worker-1", "ids": ["c", "d"], "errors": ["timeout", "HTTP 500"]}
+
+
+def test_empty_batches_do_not_reach_the_database(fake_db):
+    db = fake_db()
+    queue = UrlQueueRepository(db)
+
+    async def record():
+        await queue.complete_batch([], worker_id="worker-1")
+        await queue.fail_batch([], worker_id="worker-1")
+        return await queue.release_batch([]), await queue.requeue_urls(1, [])
+
+    assert asyncio.run(record()) == (0, 0)
+    assert db.queries == []
+
+
+def test_requeue_returns_the_finished_urls_put_back(fake_db):
+    db = fake_db(rowcounts=[7, 2])
+    queue = UrlQueueRepository(db)
+
+    async def requeue():
+        site = await queue.requeue_site(1)
+        urls = await queue.requeue_urls(
+            1, ["https://example.com/a", "https://example.com/a", "https://example.com/b"]
+        )
+        return site, urls
+
+    assert asyncio.run(requeue()) == (7, 2)
+    query, params = db.queries[1]
+    assert "WHERE crawl_state.status IN ('success', 'error')" in query
+    assert params["urls"] == ["https://example.com/a", "https://example.com/b"]
+
+
+def test_links_of_a_page_are_queued_in_one_statement(fake_db):
+    # Two of the three distinct links were already in the frontier.
+    db = fake_db(rowcounts=[1])
+    queue = UrlQueueRepository(db)
+    links = [
+        "https://example.com/a",
+        "https://example.com/b",
+        "https://example.com/a",
+        "https://example.com/c",
+    ]
+
+    async def add():
+        added = await queue.add_urls(1, links, depth=2, parent_url="https://example.com/", priority=1)
+        return added, await queue.add_urls(1, [])
+
+    assert asyncio.run(add()) == (1, 0)
+    [(query, params)] = db.queries
+    assert "ON CONFLICT (site_id, url) DO NOTHING" in query
+    assert params["urls"] == ["https://example.com/a", "https://example.com/b", "https://example.com/c"]
+    assert (params["depth"], params["parent_url"], params["priority"]) == (2, "https://example.com/", 1)
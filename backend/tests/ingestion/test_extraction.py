@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+
+from app.application.ingestion.extraction_service import (
+    ExtractionService,
+    UnsupportedArtifactError,
+)
+from app.domain.ingestion.mime_registry import MimeRegistry
+from app.infrastructure.extraction import extractors
+from app.infrastructure.extraction.mime_sniffer import sniff_mime
+
+
+def _pdf(*lines: str) -> bytes:
+    """
+    A one-page PDF showing `lines` in Helvetica.
+    """
+    ops = b"BT /F1 12 Tf 14 TL 72 720 Td " + b" T* ".join(
+        b"(" + line.replace("(", "\\(").replace(")", "\\)").encode() + b") Tj" for line in lines
+    ) + b" ET"
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792]"
+        b" /Resources << /Font << /F1 5 0 R >> >> /Contents 4 0 R >>",
+        f"<< /Length {len(ops)} >>\nstream\n".encode() + ops + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+def test_registry_prefers_the_most_specific_pattern():
+    registry = MimeRegistry({"*": "any", "text/*": "text", "text/html": "html"})
+
+    assert registry.resolve("Text/HTML; charset=utf-8") == "html"
+    assert registry.resolve("text/csv") == "text"
+    assert registry.resolve("image/png") == "any"
+    assert MimeRegistry({"text/*": "text"}).resolve("image/png") is None
+
+
+def test_sniffs_magic_bytes():
+    assert sniff_mime(b"%PDF-1.7\n...") == "application/pdf"
+    assert sniff_mime(b"PK\x03\x04rest") == "application/zip"
+    assert sniff_mime(b"  <!DOCTYPE html><html>") == "text/html"
+    assert sniff_mime("plain words, déjà vu".encode()) == "text/plain"
+    assert sniff_mime(b"\x00\x01\x02\x03") is None
+
+
+def test_pdf_text_is_extracted_with_pypdf():
+    pytest.importorskip("pypdf")
+
+    text = extractors.extract_pdf(_pdf("Aurora manual", "Chapter (1)"))
+
+    assert text.splitlines() == ["Aurora manual", "Chapter (1)"]
+
+
+def test_unreadable_pdf_is_unsupported():
+    pytest.importorskip("pypdf")
+    service = ExtractionService(max_workers=0)
+
+    with pytest.raises(UnsupportedArtifactError):
+        asyncio.run(service.extract("application/pdf", b"%PDF-1.4\nnot really a PDF"))
+
+
+def test_pdfs_are_unsupported_without_pypdf(monkeypatch):
+    monkeypatch.setattr(extractors, "pypdf", None)
+
+    assert extractors.default_extractors().resolve("application/pdf") is None
+
+
+def test_extracts_in_a_process_pool_and_tracks_throughput():
+    service = ExtractionService(max_workers=1)
+
+    async def scenario():
+        html = await service.extract("text/html", b"<html><body><p>Hello pool</p></body></html>")
+        # Generic types are resolved from the content.
+        sniffed = await service.extract(
+            "application/octet-stream", b"<!DOCTYPE html><html><body>Sniffed</body></html>"
+        )
+        with pytest.raises(UnsupportedArtifactError):
+            await service.extract("image/png", b"\x89PNG\r\n\x1a\n")
+        return html, sniffed
+
+    try:
+        html, sniffed = asyncio.run(scenario())
+    finally:
+        service.shutdown()
+
+    assert html.strip() == "Hello pool"
+    assert sniffed.strip() == "Sniffed"
+    stats = service.stats()
+    assert stats["extract_html"]["calls"] == 2
+    assert stats["extract_html"]["bytes_per_sec"] > 0
+
+
+def test_extracts_files_in_the_pool_up_to_the_size_limit(tmp_path):
+    service = ExtractionService(max_workers=1, max_bytes=1024)
+    small, large = tmp_path / "small.md", tmp_path / "large.txt"
+    small.write_text("---\ntitle: x\n---\nFrom disk")
+    large.write_text("word " * 1000)
+
+    async def scenario():
+        text = await service.extract_file("text/markdown", small)
+        with pytest.raises(UnsupportedArtifactError):
+            await service.extract_file("text/plain", large)
+        return text
+
+    try:
+        text = asyncio.run(scenario())
+    finally:
+        service.shutdown()
+
+    assert text == "From disk"
+    assert service.stats()["extract_markdown"]["bytes"] == small.stat().st_size
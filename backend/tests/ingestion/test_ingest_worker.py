@@ -0,0 +1,194 @@
+import asyncio
+from datetime import datetime, timezone
+
+from app.application.ingestion.artifact_ingestor import (
+    ArtifactIngestor,
+    UnsupportedArtifactError,
+)
+from app.application.ingestion.pipeline import IngestionPipeline
+from app.application.use_cases.ingest_worker import IngestWorker
+from app.domain.models.artifact import Artifact
+from app.infrastructure.chunking.character_chunker import CharacterChunker
+from app.infrastructure.vector.dummy_embedding_provider import DummyEmbeddingProvider
+from app.infrastructure.vector.in_memory_vector_store import InMemoryVectorStore
+
+
+class FakeQueue:
+    """
+    In-memory stand-in for ArtifactQueueRepository.
+    """
+
+    def __init__(self, artifacts: list[Artifact]):
+        self.artifacts = {a.id: a for a in artifacts}
+        self.retries: list[tuple[int, float]] = []
+
+    async def claim_batch(self, n, *, worker_id, lease_seconds=300):
+        due = [a for a in self.artifacts.values() if a.status == "queued"][:n]
+        for artifact in due:
+            artifact.status = "processing"
+            artifact.attempts += 1
+            artifact.leased_by = worker_id
+        return due
+
+    def _owned(self, artifact_id, worker_id) -> bool:
+        artifact = self.artifacts[artifact_id]
+        return artifact.status == "processing" and artifact.leased_by == worker_id
+
+    async def complete(self, artifact_id, metadata=None, *, worker_id):
+        if not self._owned(artifact_id, worker_id):
+            return False
+        self.artifacts[artifact_id].status = "ready"
+        self.artifacts[artifact_id].metadata = metadata
+        return True
+
+    async def retry(self, artifact_id, error, delay, *, worker_id):
+        if not self._owned(artifact_id, worker_id):
+            return False
+        self.retries.append((artifact_id, delay))
+        self.artifacts[artifact_id].status = "queued"
+        self.artifacts[artifact_id].error = error
+        return True
+
+    async def fail(self, artifact_id, error, *, worker_id):
+        if not self._owned(artifact_id, worker_id):
+            return False
+        self.artifacts[artifact_id].status = "failed"
+        self.artifacts[artifact_id].error = error
+        return True
+
+    async def heartbeat(self, worker_id, lease_seconds=300):
+        return 0
+
+    async def release(self, worker_id):
+        return 0
+
+
+class FlakyIngestor:
+    def __init__(self, failures: int):
+        self.failures = failures
+
+    async def ingest(self, artifact):
+        if artifact.mime_type == "application/octet-stream":
+            raise UnsupportedArtifactError("Unsupported mime type")
+        if artifact.attempts <= self.failures:
+            raise ConnectionError("embedding service unavailable")
+        return {"chunks": 1}
+
+
+def _artifact(artifact_id: int, mime_type: str = "text/plain", path: str = "") -> Artifact:
+    return Artifact(
+        id=artifact_id,
+        source_id=1,
+        type="upload",
+        mime_type=mime_type,
+        path=path,
+        size_bytes=0,
+        created_at=datetime.now(timezone.utc),
+        status="queued",
+    )
+
+
+async def _drain(worker: IngestWorker, queue: FakeQueue) -> None:
+    stop = asyncio.Event()
+    task = asyncio.create_task(worker.run(stop))
+    while any(a.status in ("queued", "processing") for a in queue.artifacts.values()):
+        await asyncio.sleep(0.01)
+    stop.set()
+    worker.notify()
+    await task
+
+
+def test_worker_retries_with_backoff_then_gives_up():
+    queue = FakeQueue([_artifact(1), _artifact(2), _artifact(3, "application/octet-stream")])
+    worker = IngestWorker(
+        queue=queue,
+        ingestor=FlakyIngestor(failures=2),
+        workers=2,
+        max_attempts=3,
+        retry_base=1.0,
+        poll_interval=0.01,
+    )
+
+    asyncio.run(_drain(worker, queue))
+
+    assert queue.artifacts[1].status == "ready"
+    assert queue.artifacts[1].attempts == 3
+    assert queue.artifacts[3].status == "failed"
+    assert queue.artifacts[3].attempts == 1
+    delays = sorted(d for artifact_id, d in queue.retries if artifact_id == 1)
+    assert 0.5 <= delays[0] <= 1.0
+    assert 1.0 <= delays[1] <= 2.0
+
+
+def test_only_unsupported_artifacts_fail_without_a_retry():
+    class BuggyIngestor:
+        async def ingest(self, artifact):
+            if artifact.attempts == 1:
+                raise UnicodeDecodeError("utf-8", b"\xff", 0, 1, "invalid start byte")
+            return {"chunks": 1}
+
+    queue = FakeQueue([_artifact(1)])
+    worker = IngestWorker(queue=queue, ingestor=BuggyIngestor(), retry_base=0.01, poll_interval=0.01)
+
+    asyncio.run(_drain(worker, queue))
+
+    assert queue.artifacts[1].status == "ready"
+    assert queue.artifacts[1].attempts == 2
+
+
+def test_worker_fails_after_max_attempts():
+    queue = FakeQueue([_artifact(1)])
+    worker = IngestWorker(
+        queue=queue,
+        ingestor=FlakyIngestor(failures=10),
+        max_attempts=2,
+        poll_interval=0.01,
+    )
+
+    asyncio.run(_drain(worker, queue))
+
+    assert queue.artifacts[1].status == "failed"
+    assert queue.artifacts[1].error == "embedding service unavailable"
+
+
+class SlowIngestor:
+    """
+    Outlives its lease: another worker reclaims the artifact and has
+    already finished it when this one does.
+    """
+
+    def __init__(self, queue: FakeQueue):
+        self.queue = queue
+
+    async def ingest(self, artifact):
+        stored = self.queue.artifacts[artifact.id]
+        stored.leased_by, stored.status, stored.metadata = "other-worker", "ready", {"chunks": 2}
+        return {"chunks": 1}
+
+
+def test_worker_that_lost_its_lease_leaves_the_outcome_alone():
+    queue = FakeQueue([_artifact(1)])
+    worker = IngestWorker(queue=queue, ingestor=SlowIngestor(queue), poll_interval=0.01)
+
+    asyncio.run(_drain(worker, queue))
+
+    assert queue.artifacts[1].status == "ready"
+    assert queue.artifacts[1].metadata == {"chunks": 2}
+
+
+def test_ingestor_chunks_and_embeds_text(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("word " * 500)
+    store = InMemoryVectorStore()
+    ingestor = ArtifactIngestor(
+        pipeline=IngestionPipeline(
+            chunker=CharacterChunker(size=1000, overlap=100),
+            embedding_provider=DummyEmbeddingProvider(),
+            vector_store=store,
+        )
+    )
+
+    metadata = asyncio.run(ingestor.ingest(_artifact(1, path=str(path))))
+
+    assert metadata == {"chunks": 3, "embedded": 3, "characters": 2500}
+    assert len(store) == 3
@@ -0,0 +1,78 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from app.application.ingestion.pipeline import IngestionPipeline
+from app.domain.models.document import Document
+from app.domain.services.embedding_provider import EmbeddingProvider
+from app.infrastructure.chunking.character_chunker import CharacterChunker
+from app.infrastructure.vector.in_memory_vector_store import InMemoryVectorStore
+
+
+class SlowEmbeddingProvider(EmbeddingProvider):
+    def __init__(self, delay: float = 0.002, fail_after: int | None = None):
+        self.delay = delay
+        self.fail_after = fail_after
+        self.batch_sizes: list[int] = []
+
+    async def embed(self, text: str) -> list[float]:
+        return (await self.embed_batch([text]))[0]
+
+    async def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        if self.fail_after is not None and len(self.batch_sizes) >= self.fail_after:
+            raise ConnectionError("embedding service unavailable")
+        self.batch_sizes.append(len(texts))
+        await asyncio.sleep(self.delay)
+        return [[float(len(t)), 1.0] for t in texts]
+
+
+def _documents(n: int):
+    now = datetime.now(timezone.utc)
+    for i in range(n):
+        yield Document(
+            id=f"doc-{i}",
+            site_id="1",
+            url=f"https://a.test/{i}",
+            title="",
+            raw_html="",
+            text="lorem ipsum " * 100,
+            created_at=now,
+            updated_at=now,
+        )
+
+
+def _pipeline(provider: EmbeddingProvider, store: InMemoryVectorStore, **kwargs) -> IngestionPipeline:
+    return IngestionPipeline(
+        chunker=CharacterChunker(size=200, overlap=0),
+        embedding_provider=provider,
+        vector_store=store,
+        embed_batch_size=8,
+        upsert_batch_size=50,
+        queue_size=4,
+        **kwargs,
+    )
+
+
+def test_pipeline_streams_every_chunk_with_bounded_queues():
+    provider = SlowEmbeddingProvider()
+    store = InMemoryVectorStore()
+
+    stats = asyncio.run(_pipeline(provider, store, embed_workers=2).run(_documents(50)))
+
+    # 1200 characters per document -> 6 chunks each.
+    assert len(store) == 300
+    assert all(chunk.embedding for chunk in store._chunks.values())
+    assert max(provider.batch_sizes) == 8
+    assert stats.stages["upsert"].items_out == 300
+    for stage in stats.stages.values():
+        assert stage.queue_peak <= stage.capacity
+    assert stats.bottleneck == "embed"
+    assert stats.stages["chunk"].blocked_seconds > 0
+
+
+def test_pipeline_failure_stops_every_stage():
+    provider = SlowEmbeddingProvider(fail_after=3)
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(_pipeline(provider, InMemoryVectorStore()).run(_documents(50)))
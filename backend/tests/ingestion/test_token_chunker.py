@@ -0,0 +1,119 @@
+import asyncio
+from datetime import datetime, timezone
+
+from app.application.ingestion.pipeline import IngestionPipeline
+from app.domain.models.document import Document
+from app.infrastructure.chunking import token_chunker
+from app.infrastructure.chunking.token_chunker import TokenChunker
+from app.infrastructure.vector.dummy_embedding_provider import DummyEmbeddingProvider
+from app.infrastructure.vector.in_memory_vector_store import InMemoryVectorStore
+
+
+def _document(text: str, document_id: str = "doc") -> Document:
+    now = datetime.now(timezone.utc)
+    return Document(
+        id=document_id,
+        site_id="1",
+        url="https://a.test/",
+        title="",
+        raw_html="",
+        text=text,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def _section(title: str, paragraphs: int) -> str:
+    body = "\n\n".join(f"{title} paragraph {i} " + "word " * 20 for i in range(paragraphs))
+    return f"## {title}\n\n{body}"
+
+
+class CountingEmbeddingProvider(DummyEmbeddingProvider):
+    def __init__(self):
+        self.texts: list[str] = []
+
+    async def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        self.texts.extend(texts)
+        return await super().embed_batch(texts)
+
+
+def test_chunks_follow_headings_and_paragraphs(monkeypatch):
+    monkeypatch.setattr(token_chunker, "tiktoken", None)
+    chunker = TokenChunker(max_tokens=40, overlap=5)
+    text = "Intro line.\n\n" + _section("Alpha", 4) + "\n" + _section("Beta", 1)
+
+    chunks = list(chunker.chunk(_document(text)))
+
+    assert [c.chunk_index for c in chunks] == list(range(len(chunks)))
+    assert chunks[0].text == "Intro line."
+    alpha = [c for c in chunks if c.text.startswith("## Alpha")]
+    beta = [c for c in chunks if c.text.startswith("## Beta")]
+    # A 23-token paragraph and the heading fill a chunk; two do not fit.
+    assert len(alpha) == 4
+    assert len(beta) == 1
+    assert all(len(token_chunker._TOKEN_RE.findall(c.text)) <= 40 for c in chunks)
+    # Consecutive chunks of a section overlap.
+    assert alpha[1].text.split("\n\n")[1].startswith("word word")
+    assert len({c.content_hash for c in chunks}) == len(chunks)
+
+
+def test_long_paragraph_is_windowed_and_batches_match_single_calls(monkeypatch):
+    monkeypatch.setattr(token_chunker, "tiktoken", None)
+    chunker = TokenChunker(max_tokens=50, overlap=10)
+    documents = [
+        _document("word " * 120, "long"),
+        _document(_section("Alpha", 3), "short"),
+    ]
+
+    batched = chunker.chunk_batch(documents)
+
+    assert [len(token_chunker._TOKEN_RE.findall(c.text)) for c in batched[0]] == [50, 50, 40]
+    for document, chunks in zip(documents, batched):
+        assert [c.text for c in chunks] == [c.text for c in chunker.chunk(document)]
+
+
+def test_reingestion_embeds_only_changed_chunks(monkeypatch):
+    monkeypatch.setattr(token_chunker, "tiktoken", None)
+    provider = CountingEmbeddingProvider()
+    store = InMemoryVectorStore()
+    pipeline = IngestionPipeline(
+        chunker=TokenChunker(max_tokens=40, overlap=0),
+        embedding_provider=provider,
+        vector_store=store,
+    )
+    sections = [_section(title, 3) for title in ("Alpha", "Beta", "Gamma", "Delta")]
+
+    first = asyncio.run(pipeline.run([_document("\n".join(sections))]))
+    assert first.stages["embed"].items_out == len(store) == 12
+
+    provider.texts.clear()
+    sections[1] = sections[1].replace("Beta paragraph 2", "Beta paragraph two, edited")
+    second = asyncio.run(pipeline.run([_document("\n".join(sections))]))
+
+    assert len(provider.texts) == 1
+    assert provider.texts[0].startswith("## Beta\n\nBeta paragraph two, edited")
+    assert second.stages["chunk"].items_skipped == 11
+    assert len(store) == 12
+
+    provider.texts.clear()
+    del sections[0]
+    third = asyncio.run(pipeline.run([_document("\n".join(sections))]))
+
+    # Later sections moved up: their embeddings are reused, not recomputed.
+    assert provider.texts == []
+    assert third.stages["upsert"].items_out == 9
+    assert len(store) == 9
+    assert sorted(c.chunk_index for c in store._chunks.values()) == list(range(9))
+
+
+def test_unavailable_encoding_falls_back_to_counting_words(monkeypatch):
+    class OfflineTiktoken:
+        @staticmethod
+        def get_encoding(name):
+            raise ConnectionError("cannot download the encoding")
+
+    monkeypatch.setattr(token_chunker, "tiktoken", OfflineTiktoken)
+
+    chunker = TokenChunker(max_tokens=64, overlap=8)
+
+    assert chunker.chunk_batch([_document("## Title\n\nSome words.")])[0]
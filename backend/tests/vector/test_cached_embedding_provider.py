@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from app.domain.services.embedding_provider import EmbeddingProvider
+from app.infrastructure.vector.cached_embedding_provider import CachedEmbeddingProvider
+from app.infrastructure.vector.sqlite_embedding_cache import SqliteEmbeddingCache
+
+
+class CountingEmbeddingProvider(EmbeddingProvider):
+    def __init__(self):
+        self.embedded: list[str] = []
+
+    async def embed(self, text: str) -> list[float]:
+        return (await self.embed_batch([text]))[0]
+
+    async def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        self.embedded.extend(texts)
+        return [[float(len(text)), 0.5, -1 / 3] for text in texts]
+
+
+def test_batches_embed_each_uncached_text_once():
+    provider = CountingEmbeddingProvider()
+    cache = CachedEmbeddingProvider(provider, model="m")
+
+    async def scenario():
+        first = await cache.embed_batch(["alpha", "beta", "alpha"])
+        second = await cache.embed_batch(["beta", " beta\n", "gamma"])
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert provider.embedded == ["alpha", "beta", "gamma"]
+    assert first[0] == first[2] == [5.0, 0.5, -1 / 3]
+    assert second[0] == second[1] == first[1]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (3, 3, 3)
+
+
+def test_lru_evicts_by_size_and_falls_back_to_disk(tmp_path):
+    provider = CountingEmbeddingProvider()
+    store = SqliteEmbeddingCache(str(tmp_path / "cache.sqlite3"))
+    # Room for two 3-float entries.
+    cache = CachedEmbeddingProvider(provider, model="m", max_bytes=2 * (24 + 200), store=store)
+
+    async def scenario():
+        for text in ("a", "b", "c"):
+            await cache.embed(text)
+        # "a" was evicted from memory but is still on disk.
+        return await cache.embed("a")
+
+    vector = asyncio.run(scenario())
+
+    assert vector == [1.0, 0.5, -1 / 3]
+    assert provider.embedded == ["a", "b", "c"]
+    stats = cache.stats()
+    assert (stats["disk_hits"], stats["evictions"], stats["entries"]) == (1, 2, 2)
+
+    # A new process, or another model, starts from the persistent tier.
+    store.close()
+    restarted = CachedEmbeddingProvider(
+        provider, model="m", store=SqliteEmbeddingCache(str(tmp_path / "cache.sqlite3"))
+    )
+    other_model = CachedEmbeddingProvider(
+        provider, model="other", store=SqliteEmbeddingCache(str(tmp_path / "cache.sqlite3"))
+    )
+    asyncio.run(restarted.embed_batch(["b", "c"]))
+    asyncio.run(other_model.embed("b"))
+    assert provider.embedded == ["a", "b", "c", "b"]
+    assert restarted.stats()["disk_hits"] == 2
+
+
+def test_persistent_tier_evicts_the_least_recently_used(tmp_path):
+    store = SqliteEmbeddingCache(str(tmp_path / "cache.sqlite3"), max_rows=2)
+
+    store.put_many({"a": [1.0]}, model="m")
+    store.put_many({"b": [2.0]}, model="m")
+    # Reading "a" makes "b" the oldest.
+    store.get_many(["a"])
+    store.put_many({"c": [3.0]}, model="m")
+
+    assert store.get_many(["a", "b", "c"]) == {"a": [1.0], "c": [3.0]}
+    store.close()
+
+
+class ShortEmbeddingProvider(CountingEmbeddingProvider):
+    async def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        return (await super().embed_batch(texts))[:-1]
+
+
+def test_provider_returning_too_few_vectors_is_an_error():
+    cache = CachedEmbeddingProvider(ShortEmbeddingProvider(), model="m")
+
+    with pytest.raises(ValueError, match="1 vectors for 2 texts"):
+        asyncio.run(cache.embed_batch(["alpha", "beta"]))
+    # Nothing was cached under the wrong text.
+    assert cache.stats()["entries"] == 0